@@ -0,0 +1,54 @@
+import os
+import sys
+import logging
+import argparse
+import datetime
+from sqlalchemy import text
+from dotenv import load_dotenv
+
+# Add etl/ to path so `src` is importable when running this script directly
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.load.load_sql import DataLoader
+from src.load.rollups import update_daily_rollups
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def backfill_rollups(since: datetime.date = None) -> bool:
+    """
+    Build the daily rollups for every snapshot date already in fact_video_daily, oldest first.
+    """
+    load_dotenv()
+
+    try:
+        loader = DataLoader()
+        with loader.engine.connect() as conn:
+            dates = conn.execute(
+                text("SELECT DISTINCT date_id FROM fact_video_daily WHERE date_id >= :since ORDER BY date_id"),
+                {"since": since or datetime.date.min}
+            ).scalars().all()
+
+        print(f"Backfilling rollups for {len(dates)} dates...")
+        for date_id in dates:
+            # One transaction per day so a failure keeps the days already done
+            with loader.transaction() as conn:
+                counts = update_daily_rollups(conn, date_id)
+            print(f"  {date_id}: {counts['agg_video_daily']} videos, {counts['agg_channel_daily']} channels")
+        return True
+
+    except Exception as e:
+        logger.error(f"Rollup backfill failed: {e}")
+        return False
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill the daily rollup tables from existing fact snapshots.")
+    parser.add_argument("--since", type=datetime.date.fromisoformat, default=None,
+                        help="First date to rebuild (YYYY-MM-DD); defaults to all dates")
+    args = parser.parse_args()
+
+    if backfill_rollups(args.since):
+        sys.exit(0)
+    else:
+        sys.exit(1)
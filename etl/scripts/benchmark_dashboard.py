@@ -0,0 +1,427 @@
+import os
+import re
+import sys
+import json
+import time
+import argparse
+import datetime
+import statistics
+from typing import Any, Dict, List, Optional
+from dotenv import load_dotenv
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+# Add etl/ to path so `src` is importable when running this script directly
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.load.load_sql import ANALYTICS_MATVIEWS, DataLoader
+from src.load.partitions import ensure_partitions, migrate_to_partitioned
+from src.load.rollups import update_daily_rollups
+
+ETL_DIR = os.path.join(os.path.dirname(__file__), '..')
+SQL_DIR = os.path.join(ETL_DIR, 'sql')
+DASHBOARD_QUERIES_PATH = os.path.join(ETL_DIR, '..', 'metabase', 'dashboard_queries.sql')
+DEFAULT_BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'dashboard_baseline.json')
+
+# The synthetic dataset lives in its own database, so it never mixes with real data
+DEFAULT_BENCH_DB = "youtube_dashboard_bench"
+
+# Dataset sizes: channels, days of daily snapshots and videos per channel.
+# Video snapshots only start on a video's publish date, so fact_video_daily holds
+# somewhat fewer than channels x videos x days rows.
+SCALES = {
+    "smoke": {"channels": 100, "days": 90, "videos": 10},
+    "small": {"channels": 1_000, "days": 365, "videos": 20},
+    "large": {"channels": 10_000, "days": 3 * 365, "videos": 10},
+}
+
+# A check only fails when the change is both relative and absolute, so
+# sub-millisecond queries don't flap on timer noise
+MIN_SLOWDOWN_MS = 5.0
+MIN_BUFFER_GROWTH = 100
+
+SAMPLE_CHANNEL_ID = "UCsynth00000001"
+
+# Views read with the filters dashboards put on them, and the defining queries of the
+# materialized views (what each REFRESH after a load runs)
+VIEW_QUERIES = {
+    "view: channel_growth, one channel": (
+        f"SELECT * FROM analytics.channel_growth WHERE channel_id = '{SAMPLE_CHANNEL_ID}'"
+    ),
+    "view: channel_growth, last 30 days": (
+        "SELECT * FROM analytics.channel_growth WHERE date_id >= CURRENT_DATE - 30"
+    ),
+    "view: video_performance, one channel": (
+        "SELECT * FROM analytics.video_performance WHERE channel_name = 'Synthetic channel 1'"
+    ),
+}
+
+# Deterministic pseudo-random number in [0, 1) per key, so every build (and every
+# plan shape) of a scale is identical regardless of the order rows are generated in
+UNIT_HASH = "((hashtext({key}) & 2147483647)::FLOAT / 2147483648)"
+
+CHANNELS_SQL = f"""
+INSERT INTO dim_channel (channel_id, channel_name, description, published_at, country, custom_url)
+SELECT
+    'UCsynth' || lpad(c::TEXT, 8, '0'),
+    'Synthetic channel ' || c,
+    'Synthetic channel for dashboard benchmarks',
+    CAST(:start_date AS DATE) - (365 + c % 3000) * INTERVAL '1 day',
+    (ARRAY['US', 'IN', 'GB', 'BR', 'DE', 'JP', 'MX', 'KR'])[1 + c % 8],
+    '@synth' || c
+FROM generate_series(1, :channels) AS c
+"""
+
+# Publish dates are spread from a year before the first snapshot to the last one
+VIDEOS_SQL = f"""
+INSERT INTO dim_video (video_id, channel_id, title, description, published_at, duration_seconds, category, tags)
+SELECT
+    'vsynth' || lpad(c::TEXT, 8, '0') || '_' || lpad(v::TEXT, 4, '0'),
+    'UCsynth' || lpad(c::TEXT, 8, '0'),
+    'Synthetic video ' || v || ' of channel ' || c,
+    'Synthetic video for dashboard benchmarks',
+    (CAST(:start_date AS DATE) - 365)::TIMESTAMPTZ
+        + {UNIT_HASH.format(key="c || '_' || v")} * (:days + 365) * INTERVAL '1 day',
+    60 + (c * 31 + v * 17) % 3600,
+    (ARRAY['10', '20', '22', '24', '27', '28'])[1 + v % 6],
+    ARRAY['synthetic', 'tag' || v % 50]
+FROM generate_series(1, :channels) AS c, generate_series(1, :videos) AS v
+"""
+
+# One day of cumulative snapshots: counters grow with each channel's/video's age
+CHANNEL_SNAPSHOTS_SQL = f"""
+INSERT INTO fact_channel_daily (channel_id, date_id, subscribers, total_views, total_videos)
+SELECT
+    channel_id,
+    :date_id,
+    (exp(4 + 10 * u) * (1 + age / 365.0))::BIGINT,
+    (exp(8 + 12 * u) * (1 + age / 365.0))::BIGINT,
+    :videos
+FROM (
+    SELECT channel_id, {UNIT_HASH.format(key="channel_id")} AS u, CAST(:date_id AS DATE) - published_at::DATE AS age
+    FROM dim_channel
+) AS c
+"""
+
+VIDEO_SNAPSHOTS_SQL = f"""
+INSERT INTO fact_video_daily (video_id, date_id, views, likes, comments, snapshot_at)
+SELECT
+    video_id,
+    :date_id,
+    views,
+    (views * (0.01 + 0.05 * u))::BIGINT,
+    (views * 0.004 * u)::BIGINT,
+    CAST(:date_id AS DATE) + TIME '06:00'
+FROM (
+    SELECT
+        video_id,
+        {UNIT_HASH.format(key="video_id")} AS u,
+        (exp(2 + 9 * {UNIT_HASH.format(key="video_id")}) * power(CAST(:date_id AS DATE) - published_at::DATE + 1, 0.6))::BIGINT AS views
+    FROM dim_video
+    WHERE published_at::DATE <= :date_id
+) AS v
+"""
+
+
+def load_dashboard_queries(path: str = DASHBOARD_QUERIES_PATH) -> Dict[str, str]:
+    """
+    Split dashboard_queries.sql into named statements.
+
+    A statement is named after its numbered section ("-- 6. Top Performing Videos");
+    sections holding several statements append the first comment above each one.
+    """
+    section = None
+    statements = []
+    comments: List[str] = []
+    body: List[str] = []
+    for line in open(path).read().splitlines():
+        stripped = line.strip()
+        heading = re.match(r"--\s*(\d+\.\s+.+)$", stripped)
+        if not body and heading:
+            section, comments = heading.group(1), []
+        elif not body and stripped.startswith("--"):
+            comments.append(stripped.lstrip("- "))
+        elif stripped:
+            body.append(line)
+            if stripped.endswith(";"):
+                statements.append((section, comments[0] if comments else "", "\n".join(body).rstrip(";")))
+                comments, body = [], []
+
+    per_section: Dict[Optional[str], int] = {}
+    for section, _, _ in statements:
+        per_section[section] = per_section.get(section, 0) + 1
+    return {
+        section if per_section[section] == 1 else f"{section} - {comment}": sql
+        for section, comment, sql in statements
+    }
+
+
+def benchmark_queries(conn: Connection) -> Dict[str, str]:
+    """
+    Every query measured: the dashboard queries, filtered view reads and the matview definitions.
+    """
+    queries = {f"dashboard {name}": sql for name, sql in load_dashboard_queries().items()}
+    queries.update(VIEW_QUERIES)
+    for view in ANALYTICS_MATVIEWS:
+        definition = conn.execute(text("SELECT pg_get_viewdef(CAST(:view AS REGCLASS))"), {"view": view}).scalar()
+        queries[f"refresh: {view}"] = definition.strip().rstrip(";")
+    return queries
+
+
+def bench_loader(database: str) -> DataLoader:
+    """
+    Create `database` if needed and return a loader connected to it.
+    """
+    loader = DataLoader()
+    if database == loader.engine.url.database:
+        raise ValueError(f"Refusing to build the synthetic dataset in the pipeline's database ({database})")
+    with loader.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        exists = conn.execute(text("SELECT 1 FROM pg_database WHERE datname = :db"), {"db": database}).scalar()
+        if not exists:
+            conn.execute(text(f'CREATE DATABASE "{database}"'))
+    loader.engine.dispose()
+    return DataLoader(loader.engine.url.set(database=database).render_as_string(hide_password=False))
+
+
+def apply_schema(conn: Connection, partitioned: bool, start_date: datetime.date, end_date: datetime.date) -> None:
+    """
+    Apply schema.sql the way init_db.py does (optionally with the partitioned fact tables).
+    """
+    schema_sql = open(os.path.join(SQL_DIR, 'schema.sql')).read()
+    conn.execute(text(schema_sql))
+    if partitioned:
+        migrate_to_partitioned(conn, open(os.path.join(SQL_DIR, 'partitioned_facts.sql')).read())
+        conn.execute(text(schema_sql))
+        conn.execute(text("DROP INDEX IF EXISTS idx_fact_channel_date, idx_fact_video_date;"))
+        ensure_partitions(conn, start_date, end_date)
+
+
+def build_dataset(loader: DataLoader, dataset: Dict[str, Any]) -> None:
+    """
+    Recreate the schema and fill it with `dataset`'s synthetic channels, videos and
+    daily snapshots, then build the rollups and materialized views from them.
+    """
+    end_date = datetime.date.fromisoformat(dataset["end_date"])
+    start_date = end_date - datetime.timedelta(days=dataset["days"] - 1)
+    params = {"channels": dataset["channels"], "videos": dataset["videos"],
+              "days": dataset["days"], "start_date": start_date}
+
+    started = time.perf_counter()
+    with loader.transaction() as conn:
+        conn.execute(text("DROP SCHEMA IF EXISTS analytics CASCADE"))
+        conn.execute(text("DROP SCHEMA public CASCADE"))
+        conn.execute(text("CREATE SCHEMA public"))
+        apply_schema(conn, dataset["partitioned"], start_date, end_date)
+        conn.execute(text(CHANNELS_SQL), params)
+        conn.execute(text(VIDEOS_SQL), params)
+        conn.execute(text("CREATE TABLE bench_dataset (dataset JSONB)"))
+        conn.execute(text("INSERT INTO bench_dataset VALUES (CAST(:dataset AS JSONB))"), {"dataset": json.dumps(dataset)})
+
+    # Snapshots and rollups are written day by day, oldest first, like daily runs would
+    for offset in range(dataset["days"]):
+        date_id = start_date + datetime.timedelta(days=offset)
+        with loader.transaction() as conn:
+            conn.execute(text(CHANNEL_SNAPSHOTS_SQL), {"date_id": date_id, "videos": dataset["videos"]})
+            conn.execute(text(VIDEO_SNAPSHOTS_SQL), {"date_id": date_id})
+            update_daily_rollups(conn, date_id)
+        if (offset + 1) % 30 == 0 or offset + 1 == dataset["days"]:
+            print(f"  snapshots up to {date_id} ({time.perf_counter() - started:.0f}s)")
+
+    loader.refresh_materialized_views()
+    with loader.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("VACUUM ANALYZE"))
+    print(f"  built in {time.perf_counter() - started:.0f}s")
+
+
+def stored_dataset(loader: DataLoader) -> Optional[Dict[str, Any]]:
+    with loader.engine.connect() as conn:
+        if not conn.execute(text("SELECT to_regclass('bench_dataset') IS NOT NULL")).scalar():
+            return None
+        return conn.execute(text("SELECT dataset FROM bench_dataset")).scalar()
+
+
+def _normalise(name: str) -> str:
+    # Monthly partitions (and their indexes) come and go with the date range; report the parent
+    return re.sub(r"_y\d{4}m\d{2}", "", name)
+
+
+def plan_shape(node: Dict[str, Any]) -> str:
+    """
+    Render a plan tree as node types with the relations and indexes they read.
+
+    The children of Append nodes are deduplicated, so the shape doesn't change when
+    another monthly partition is added.
+    """
+    label = node["Node Type"]
+    if "Relation Name" in node:
+        label += f" on {_normalise(node['Relation Name'])}"
+    if "Index Name" in node:
+        label += f" using {_normalise(node['Index Name'])}"
+    children = [plan_shape(child) for child in node.get("Plans", [])]
+    if node["Node Type"] in ("Append", "Merge Append"):
+        children = list(dict.fromkeys(children))
+    return label + (f" ({', '.join(children)})" if children else "")
+
+
+def plan_scans(node: Dict[str, Any], scans: Optional[Dict[str, set]] = None) -> Dict[str, set]:
+    """
+    Map each relation read by the plan to the scan node types used on it.
+    """
+    scans = {} if scans is None else scans
+    if "Relation Name" in node:
+        scans.setdefault(_normalise(node["Relation Name"]), set()).add(node["Node Type"])
+    for child in node.get("Plans", []):
+        plan_scans(child, scans)
+    return scans
+
+
+def measure(conn: Connection, sql: str, repeats: int) -> Dict[str, Any]:
+    """
+    EXPLAIN (ANALYZE, BUFFERS) `sql` once to warm the cache, then `repeats` times.
+
+    Returns:
+        Median planning and execution time, shared buffers touched, rows, plan shape and scans.
+    """
+    explained = []
+    for _ in range(repeats + 1):
+        explained.append(conn.execute(text("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + sql)).scalar()[0])
+    runs = explained[1:]
+    plan = runs[-1]["Plan"]
+    return {
+        "planning_ms": round(statistics.median(run["Planning Time"] for run in runs), 3),
+        "execution_ms": round(statistics.median(run["Execution Time"] for run in runs), 3),
+        "buffers": plan.get("Shared Hit Blocks", 0) + plan.get("Shared Read Blocks", 0),
+        "rows": plan["Actual Rows"],
+        "shape": plan_shape(plan),
+        "scans": {relation: sorted(types) for relation, types in sorted(plan_scans(plan).items())},
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Optional[Dict[str, Any]],
+            max_slowdown: float, max_buffer_growth: float) -> List[str]:
+    """
+    List the regressions of one query against its baseline (empty when it passes).
+
+    A relation that the baseline read only through indexes and that is now read with
+    a sequential scan always fails, whatever the timings.
+    """
+    if baseline is None:
+        return []
+    problems = []
+    for relation, types in current["scans"].items():
+        before = baseline["scans"].get(relation)
+        if before and "Seq Scan" in types and "Seq Scan" not in before:
+            problems.append(f"{relation}: {'/'.join(before)} became a Seq Scan")
+    slower = current["execution_ms"] - baseline["execution_ms"]
+    if current["execution_ms"] > baseline["execution_ms"] * max_slowdown and slower > MIN_SLOWDOWN_MS:
+        problems.append(f"execution {baseline['execution_ms']:.1f} ms -> {current['execution_ms']:.1f} ms")
+    grown = current["buffers"] - baseline["buffers"]
+    if current["buffers"] > baseline["buffers"] * max_buffer_growth and grown > MIN_BUFFER_GROWTH:
+        problems.append(f"buffers {baseline['buffers']:,} -> {current['buffers']:,}")
+    return problems
+
+
+def run(scale: str, database: str, partitioned: bool, reuse: bool, repeats: int, baseline_path: str,
+        update_baseline: bool, max_slowdown: float, max_buffer_growth: float) -> bool:
+    load_dotenv()
+    key = f"{scale}-partitioned" if partitioned else scale
+    dataset = dict(SCALES[scale], partitioned=partitioned, end_date=datetime.date.today().isoformat())
+    loader = bench_loader(database)
+
+    print(f"--- Dashboard Query Benchmark ({key}: {dataset['channels']:,} channels x "
+          f"{dataset['days']} days x {dataset['videos']} videos, database {database}) ---")
+    stored = stored_dataset(loader)
+    if reuse and stored and {k: v for k, v in stored.items() if k != "end_date"} == \
+            {k: v for k, v in dataset.items() if k != "end_date"}:
+        # Pick up schema.sql changes (new indexes, view definitions) without regenerating data
+        end_date = datetime.date.fromisoformat(stored["end_date"])
+        with loader.transaction() as conn:
+            apply_schema(conn, partitioned, end_date - datetime.timedelta(days=stored["days"] - 1), end_date)
+        with loader.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text("ANALYZE"))
+        print(f"Reusing the dataset built for {stored['end_date']}")
+    else:
+        print("Building synthetic dataset...")
+        build_dataset(loader, dataset)
+
+    with loader.engine.connect() as conn:
+        counts = {table: conn.execute(text(f"SELECT COUNT(*) FROM {table}")).scalar()
+                  for table in ("dim_channel", "dim_video", "fact_channel_daily", "fact_video_daily", "agg_video_daily")}
+        print("  " + ", ".join(f"{table}: {count:,}" for table, count in counts.items()))
+        server_version = conn.execute(text("SHOW server_version")).scalar()
+        results = {name: measure(conn, sql, repeats) for name, sql in benchmark_queries(conn).items()}
+
+    baselines = json.load(open(baseline_path)) if os.path.exists(baseline_path) else {}
+    baseline = baselines.get(key, {}).get("queries", {})
+    if baselines.get(key) and baselines[key]["postgres"].split(".")[0] != server_version.split(".")[0]:
+        print(f"Note: baseline was recorded on PostgreSQL {baselines[key]['postgres']}, this is {server_version}")
+
+    failures = {}
+    print(f"\n{'query':<58} {'exec ms':>10} {'baseline':>10} {'buffers':>10} {'baseline':>10}  status")
+    for name, result in results.items():
+        before = baseline.get(name)
+        problems = compare(result, before, max_slowdown, max_buffer_growth)
+        if before is None:
+            status = "new"
+        elif problems:
+            status, failures[name] = "REGRESSED", problems
+        else:
+            status = "plan changed" if result["shape"] != before["shape"] else "ok"
+        before_ms = f"{before['execution_ms']:,.1f}" if before else "-"
+        before_buffers = f"{before['buffers']:,}" if before else "-"
+        print(f"{name[:58]:<58} {result['execution_ms']:>10,.1f} {before_ms:>10} "
+              f"{result['buffers']:>10,} {before_buffers:>10}  {status}")
+    for name in sorted(set(baseline) - set(results)):
+        print(f"{name[:58]:<58} {'':>43}  missing (in baseline only)")
+
+    for name, problems in failures.items():
+        print(f"\n{name}:")
+        for problem in problems:
+            print(f"  - {problem}")
+        print(f"  baseline plan: {baseline[name]['shape']}")
+        print(f"  current plan:  {results[name]['shape']}")
+
+    if update_baseline:
+        baselines[key] = {
+            "postgres": server_version,
+            "recorded_at": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "dataset": counts,
+            "queries": results,
+        }
+        with open(baseline_path, "w") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"\nBaseline for {key} written to {baseline_path}")
+        return True
+
+    if failures:
+        print(f"\n{len(failures)} of {len(results)} queries regressed against the {key} baseline.")
+        return False
+    print(f"\nAll {len(results)} queries within the {key} baseline." if baseline else
+          f"\nNo {key} baseline yet; record one with --update-baseline.")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run the dashboard queries on a synthetic star schema and check their plans against a baseline"
+    )
+    parser.add_argument("--scale", choices=SCALES, default="small", help="Dataset size")
+    parser.add_argument("--database", default=os.getenv("BENCH_DB_NAME", DEFAULT_BENCH_DB),
+                        help="Database to build the dataset in (created if missing, its contents are replaced)")
+    parser.add_argument("--partitioned", action="store_true", help="Use the monthly-partitioned fact tables")
+    parser.add_argument("--reuse", action="store_true",
+                        help="Keep an already-built dataset of the same scale; only re-apply schema.sql")
+    parser.add_argument("--repeats", type=int, default=3, help="Measured runs per query (median reported)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE_PATH, help="Baseline JSON file")
+    parser.add_argument("--update-baseline", action="store_true", help="Record this run as the baseline")
+    parser.add_argument("--max-slowdown", type=float, default=2.0, help="Allowed execution time ratio to the baseline")
+    parser.add_argument("--max-buffer-growth", type=float, default=2.0, help="Allowed buffers ratio to the baseline")
+    args = parser.parse_args()
+
+    ok = run(args.scale, args.database, args.partitioned, args.reuse, args.repeats, args.baseline,
+             args.update_baseline, args.max_slowdown, args.max_buffer_growth)
+    sys.exit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import os
+import sys
+import time
+import argparse
+import datetime
+import numpy as np
+import pandas as pd
+from dotenv import load_dotenv
+from sqlalchemy import text
+
+# Add etl/ to path so `src` is importable when running this script directly
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.load.load_sql import DataLoader
+
+BENCH_TABLE = "bench_fact_video_daily"
+
+
+def make_fact_rows(n: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Build `n` synthetic rows shaped like fact_video_daily.
+    """
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "video_id": [f"vid{i:010d}" for i in range(n)],
+        "date_id": [datetime.date.today()] * n,
+        "views": rng.integers(0, 10**9, n),
+        "likes": rng.integers(0, 10**6, n),
+        "comments": rng.integers(0, 10**4, n),
+    })
+
+
+def reset_table(loader: DataLoader) -> None:
+    """
+    (Re)create a constraint-equivalent copy of fact_video_daily without foreign keys.
+    """
+    with loader.engine.begin() as conn:
+        conn.execute(text(f"DROP TABLE IF EXISTS {BENCH_TABLE}"))
+        conn.execute(text(f"""
+            CREATE TABLE {BENCH_TABLE} (
+                id SERIAL PRIMARY KEY,
+                video_id TEXT,
+                date_id DATE,
+                views BIGINT,
+                likes BIGINT,
+                comments BIGINT,
+                created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE(video_id, date_id)
+            )
+        """))
+
+
+def time_load(loader: DataLoader, df: pd.DataFrame, method: str) -> str:
+    start = time.perf_counter()
+    try:
+        loader.load_data(df, BENCH_TABLE, ["video_id", "date_id"], method=method)
+    except Exception as e:
+        return f"failed ({type(e).__name__})"
+    secs = time.perf_counter() - start
+    return f"{secs:8.2f}s {len(df) / secs:>10,.0f} rows/s"
+
+
+def run(row_counts: list, methods: list) -> None:
+    load_dotenv()
+    loader = DataLoader()
+
+    print("--- Load Benchmark (fact_video_daily shape) ---")
+    print(f"{'rows':>10} {'method':<7} {'fresh insert':<30} {'upsert over existing':<30}")
+    for rows in row_counts:
+        df = make_fact_rows(rows)
+        for method in methods:
+            reset_table(loader)
+            fresh = time_load(loader, df, method)
+            update = time_load(loader, df, method)
+            print(f"{rows:>10,} {method:<7} {fresh:<30} {update:<30}")
+
+    with loader.engine.begin() as conn:
+        conn.execute(text(f"DROP TABLE IF EXISTS {BENCH_TABLE}"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare multi-VALUES INSERT and COPY upserts in a local Postgres.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000], help="Row counts to load")
+    parser.add_argument("--methods", nargs="+", default=["insert", "copy"], choices=["insert", "copy"])
+    args = parser.parse_args()
+
+    run(args.rows, args.methods)
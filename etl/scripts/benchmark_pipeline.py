@@ -0,0 +1,216 @@
+import os
+import sys
+import json
+import time
+import socket
+import resource
+import tempfile
+import argparse
+import multiprocessing
+import requests
+from typing import Any, Dict, List
+from dotenv import load_dotenv
+from sqlalchemy import text
+
+# Add etl/ to path so `src` and `scripts` are importable when running this script directly
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from scripts.fake_youtube_api import CHANNEL_PREFIX, channel_ids, serve
+
+# Synthetic rows are removed in foreign-key order before each scale and at the end
+CLEANUP_STATEMENTS = [
+    "DELETE FROM youtube_comments WHERE video_id IN (SELECT video_id FROM dim_video WHERE channel_id LIKE :prefix)",
+    "DELETE FROM agg_video_daily WHERE channel_id LIKE :prefix",
+    "DELETE FROM agg_channel_daily WHERE channel_id LIKE :prefix",
+    "DELETE FROM fact_video_daily WHERE video_id IN (SELECT video_id FROM dim_video WHERE channel_id LIKE :prefix)",
+    "DELETE FROM fact_video_intraday WHERE video_id IN (SELECT video_id FROM dim_video WHERE channel_id LIKE :prefix)",
+    "DELETE FROM fact_channel_daily WHERE channel_id LIKE :prefix",
+    "DELETE FROM channel_watermarks WHERE channel_id LIKE :prefix",
+    "DELETE FROM pipeline_checkpoints WHERE channel_id LIKE :prefix",
+    "DELETE FROM comment_cursors WHERE video_id IN (SELECT video_id FROM dim_video WHERE channel_id LIKE :prefix)",
+    "DELETE FROM dim_video WHERE channel_id LIKE :prefix",
+    "DELETE FROM dim_channel WHERE channel_id LIKE :prefix",
+]
+
+# Reported stage groups (prefixes of the recorder's stage names), in pipeline order
+STAGES = ["api", "transform", "load", "rollups", "refresh"]
+
+
+def run_scale(channels: int, base_url: str, options: Dict[str, Any], results: multiprocessing.Queue) -> None:
+    """
+    Run main() once against the stand-in server (in a fresh process, so peak RSS is per scale).
+    """
+    import logging
+
+    # Set here rather than inherited: 10k channel IDs exceed the exec() limit for one env var.
+    # The key pool gets a throwaway store, so bench calls never count against the real keys' usage.
+    state_dir = tempfile.TemporaryDirectory(prefix="benchmark-pipeline-")
+    os.environ.update({
+        "YOUTUBE_API_BASE_URL": base_url,
+        "YOUTUBE_API_KEYS": "",
+        "YOUTUBE_API_KEY": "bench",
+        "YOUTUBE_KEY_POOL_PATH": os.path.join(state_dir.name, "key_pool.db"),
+        "CHANNEL_IDS": ",".join(channel_ids(channels)),
+        "YOUTUBE_DAILY_QUOTA": str(10**9),
+        "YOUTUBE_LOW_PRIORITY_RESERVE": "0",
+        "YOUTUBE_REQUESTS_PER_SECOND": str(options["requests_per_second"]),
+        "YOUTUBE_MAX_WORKERS": str(options["max_workers"]),
+        "YOUTUBE_CACHE_PATH": "",
+        "RAW_LANDING_PATH": "",
+        "YOUTUBE_BACKOFF_BASE": "0.05",
+        "YOUTUBE_BACKOFF_MAX": "1",
+        "YOUTUBE_MAX_RETRIES": "8",
+        "VIDEO_DISCOVERY_MODE": options["discovery_mode"],
+    })
+
+    from src.main import main
+    from src.metrics import recorder
+
+    logging.getLogger().setLevel(logging.INFO if options["verbose"] else logging.ERROR)
+
+    status = 0
+    start = time.perf_counter()
+    try:
+        main([])
+    except SystemExit as e:
+        status = e.code or 0
+    wall = time.perf_counter() - start
+    state_dir.cleanup()
+
+    stages = recorder.snapshot()
+    results.put({
+        "channels": channels,
+        "status": status,
+        "wall_seconds": wall,
+        "stage_seconds": {group: recorder.totals(f"{group}.").seconds for group in STAGES},
+        "rows": {stage[len("load."):]: stats.rows_upserted for stage, stats in stages.items() if stage.startswith("load.")},
+        # ru_maxrss is in kilobytes on Linux
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    })
+
+
+def cleanup() -> None:
+    from src.load.load_sql import DataLoader
+
+    loader = DataLoader()
+    with loader.transaction() as conn:
+        for statement in CLEANUP_STATEMENTS:
+            conn.execute(text(statement), {"prefix": f"{CHANNEL_PREFIX}%"})
+    loader.refresh_materialized_views()
+    loader.engine.dispose()
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_server(base_url: str, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            requests.get(f"{base_url}/_stats", timeout=1).raise_for_status()
+            return
+        except requests.exceptions.RequestException:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.1)
+
+
+def print_result(result: Dict[str, Any], server_stats: Dict[str, Any]) -> None:
+    calls = server_stats["calls"]
+    total_rows = sum(result["rows"].values())
+    wall = result["wall_seconds"]
+    stages = "  ".join(f"{stage} {result['stage_seconds'][stage]:.2f}s" for stage in STAGES)
+
+    print(f"\n{result['channels']:,} channels{'' if result['status'] == 0 else '  (FAILED, exit ' + str(result['status']) + ')'}")
+    print(f"  wall {wall:.2f}s  peak RSS {result['peak_rss_mb']:.0f} MB  {total_rows:,} rows  {total_rows / wall:,.0f} rows/s")
+    print(f"  API calls {sum(calls.values()):,} {calls}  injected errors {sum(server_stats['errors'].values()):,}")
+    print(f"  stage time: {stages}  (api is summed over concurrent workers)")
+    print(f"  rows: {result['rows']}")
+
+
+def run(scales: List[int], options: Dict[str, Any], output: str = None) -> bool:
+    load_dotenv()
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+
+    # Separate processes, so the server's CPU use neither shares the pipeline's GIL nor its RSS
+    context = multiprocessing.get_context("spawn")
+    server = context.Process(
+        target=serve,
+        args=(port, max(scales), options["videos_per_channel"], options["comments_per_video"],
+              options["seed"], options["latency_ms"], options["error_rate"]),
+        daemon=True
+    )
+    server.start()
+
+    print("--- End-to-end Pipeline Benchmark ---")
+    print(f"{options['videos_per_channel']} videos/channel, {options['comments_per_video']} comments/video, "
+          f"latency {options['latency_ms']}ms, error rate {options['error_rate']:.1%}, "
+          f"{options['max_workers']} workers, mode {options['discovery_mode']}")
+
+    ok = True
+    reports = []
+    try:
+        wait_for_server(base_url)
+        for channels in scales:
+            cleanup()
+            requests.get(f"{base_url}/_reset", timeout=5)
+
+            results = context.Queue()
+            worker = context.Process(target=run_scale, args=(channels, base_url, options, results))
+            worker.start()
+            result = results.get()
+            worker.join()
+
+            result["api"] = requests.get(f"{base_url}/_stats", timeout=5).json()
+            print_result(result, result["api"])
+            reports.append(result)
+            ok = ok and result["status"] == 0
+    finally:
+        if not options["keep"]:
+            cleanup()
+        server.terminate()
+        server.join()
+
+    if output:
+        with open(output, "w") as f:
+            json.dump({"options": options, "results": reports}, f, indent=2)
+        print(f"\nResults written to {output}")
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Run the full pipeline against a local fake YouTube API and a local Postgres. "
+                    "Writes synthetic UCbench* rows into the configured database (use a scratch database)."
+    )
+    parser.add_argument("--scales", type=int, nargs="+", default=[10, 1000, 10000], help="Channel counts to run")
+    parser.add_argument("--videos-per-channel", type=int, default=20)
+    parser.add_argument("--comments-per-video", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Mean added latency per API request")
+    parser.add_argument("--error-rate", type=float, default=0.01, help="Fraction of API requests answered with 429/500/503")
+    parser.add_argument("--max-workers", type=int, default=8, help="YOUTUBE_MAX_WORKERS for the client")
+    parser.add_argument("--requests-per-second", type=float, default=0, help="Client rate cap (0 disables it)")
+    parser.add_argument("--discovery-mode", choices=["latest", "incremental"], default="latest")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--keep", action="store_true", help="Leave the synthetic rows in the database")
+    parser.add_argument("--verbose", action="store_true", help="Show the pipeline's INFO logs")
+    parser.add_argument("--output", help="Write the results as JSON to this path")
+    args = parser.parse_args()
+
+    options = {
+        "videos_per_channel": args.videos_per_channel,
+        "comments_per_video": args.comments_per_video,
+        "latency_ms": args.latency_ms,
+        "error_rate": args.error_rate,
+        "max_workers": args.max_workers,
+        "requests_per_second": args.requests_per_second,
+        "discovery_mode": args.discovery_mode,
+        "seed": args.seed,
+        "keep": args.keep,
+        "verbose": args.verbose,
+    }
+    sys.exit(0 if run(args.scales, options, args.output) else 1)
@@ -0,0 +1,156 @@
+import os
+import sys
+import time
+import argparse
+import statistics
+from dotenv import load_dotenv
+from sqlalchemy import text
+
+# Add etl/ to path so `src` is importable when running this script directly
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.load.load_sql import DataLoader
+from src.search import TS_CONFIG
+
+BENCH_TABLE = "bench_youtube_comments"
+
+# Comment vocabulary; words are drawn with a skew towards the start of the list, so
+# early words are common and late ones rare, roughly like real comments
+VOCABULARY = (
+    "great video love this thanks really nice good best song music part watch time first "
+    "amazing awesome channel content like subscribe funny lol wow cool more please make "
+    "tutorial helpful explained learned finally someone perfect beautiful voice edit "
+    "camera quality audio background sound intro ending minute second game play level "
+    "boss strategy build recipe cooking delicious review product price worth bought "
+    "travel city beautiful view drone footage history science space physics chemistry "
+    "math lecture professor student exam university course beginner advanced guitar "
+    "piano drums cover original remix lyrics chorus verse bridge dance choreography "
+    "workout fitness training muscle diet healthy running marathon football goal "
+    "keeper referee championship tournament highlights analysis prediction election "
+    "interview podcast episode guest host debate opinion argument evidence conspiracy "
+    "algorithm recommended nostalgia childhood memories underrated overrated legendary "
+    "masterpiece cinematography soundtrack villain plot twist sequel trailer premiere"
+).split()
+
+# Substring/keyword pairs timed against each other: (label, ILIKE substring, full-text query)
+QUERIES = (
+    ("common word", "video", "video"),
+    ("mid-frequency word", "tutorial", "tutorial"),
+    ("rare word", "cinematography", "cinematography"),
+    ("two words", "plot twist", '"plot twist"'),
+)
+
+
+def populate(loader: DataLoader, rows: int, videos: int) -> float:
+    """
+    (Re)create the benchmark table (same columns and generated search vector as
+    youtube_comments, no foreign keys) and fill it with `rows` synthetic comments.
+    """
+    start = time.perf_counter()
+    with loader.engine.begin() as conn:
+        conn.execute(text(f"DROP TABLE IF EXISTS {BENCH_TABLE}"))
+        conn.execute(text(f"CREATE TABLE {BENCH_TABLE} (LIKE youtube_comments INCLUDING DEFAULTS INCLUDING GENERATED)"))
+        conn.execute(text(f"""
+            INSERT INTO {BENCH_TABLE} (comment_id, video_id, author_name, text, like_count, published_at)
+            SELECT
+                'bench' || g,
+                'benchvid' || (g % :videos),
+                'user' || (g % 100000),
+                (
+                    SELECT string_agg(word, ' ') FROM (
+                        SELECT words[1 + floor(power(random(), 3) * array_length(words, 1))::INT] AS word
+                        FROM generate_series(1, 4 + (g % 25))
+                    ) AS picks
+                ),
+                (random() * 1000)::INT,
+                now() - (g || ' seconds')::INTERVAL
+            FROM generate_series(1, :rows) AS g, (SELECT CAST(:words AS TEXT[]) AS words) AS vocabulary
+        """), {"rows": rows, "videos": videos, "words": list(VOCABULARY)})
+    return time.perf_counter() - start
+
+
+def build_indexes(loader: DataLoader, trigram: bool) -> dict:
+    """
+    Create the search indexes of youtube_comments on the benchmark table, timing each.
+    """
+    statements = {"gin tsvector": f"CREATE INDEX ON {BENCH_TABLE} USING GIN (search_vector)"}
+    if trigram:
+        statements["gin trigram"] = f"CREATE INDEX ON {BENCH_TABLE} USING GIN (text gin_trgm_ops)"
+    timings = {}
+    with loader.engine.begin() as conn:
+        for name, statement in statements.items():
+            start = time.perf_counter()
+            conn.execute(text(statement))
+            timings[name] = time.perf_counter() - start
+        conn.execute(text(f"ANALYZE {BENCH_TABLE}"))
+    return timings
+
+
+def time_query(loader: DataLoader, sql: str, params: dict, repeats: int) -> tuple:
+    """
+    Run `sql` `repeats` times; return the median seconds, the row count and whether an index was used.
+    """
+    seconds = []
+    with loader.engine.connect() as conn:
+        plan = "\n".join(conn.execute(text("EXPLAIN " + sql), params).scalars().all())
+        for _ in range(repeats):
+            start = time.perf_counter()
+            count = len(conn.execute(text(sql), params).all())
+            seconds.append(time.perf_counter() - start)
+    return statistics.median(seconds), count, "Seq Scan" not in plan
+
+
+def run(rows: int, videos: int, limit: int, repeats: int, keep: bool) -> None:
+    load_dotenv()
+    loader = DataLoader()
+    with loader.engine.connect() as conn:
+        trigram = conn.execute(text("SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm')")).scalar()
+
+    print("--- Search Benchmark (youtube_comments shape) ---")
+    print(f"Generating {rows:,} comments over {videos:,} videos...")
+    print(f"  populate (incl. search_vector): {populate(loader, rows, videos):.1f}s")
+    for name, seconds in build_indexes(loader, trigram).items():
+        print(f"  index {name}: {seconds:.1f}s")
+    if not trigram:
+        print("  (pg_trgm not installed: ILIKE runs without a trigram index)")
+
+    ilike_sql = f"SELECT comment_id FROM {BENCH_TABLE} WHERE text ILIKE :pattern LIMIT :limit"
+    ilike_all_sql = f"SELECT comment_id FROM {BENCH_TABLE} WHERE text ILIKE :pattern"
+    fts_sql = (
+        f"SELECT comment_id, ts_rank_cd(search_vector, q) AS rank "
+        f"FROM {BENCH_TABLE}, websearch_to_tsquery('{TS_CONFIG}', :query) q "
+        f"WHERE search_vector @@ q ORDER BY rank DESC LIMIT :limit"
+    )
+    fts_all_sql = (
+        f"SELECT comment_id FROM {BENCH_TABLE} "
+        f"WHERE search_vector @@ websearch_to_tsquery('{TS_CONFIG}', :query)"
+    )
+
+    print(f"\n{'query':<20} {'ILIKE top ' + str(limit):>18} {'FTS ranked top ' + str(limit):>20} "
+          f"{'ILIKE all':>18} {'FTS all':>18} {'matches':>10}")
+    for label, substring, query in QUERIES:
+        pattern = {"pattern": f"%{substring}%", "limit": limit}
+        keyword = {"query": query, "limit": limit}
+        cells = []
+        for sql, params in ((ilike_sql, pattern), (fts_sql, keyword), (ilike_all_sql, pattern), (fts_all_sql, keyword)):
+            seconds, count, indexed = time_query(loader, sql, params, repeats)
+            cells.append((f"{seconds * 1000:,.1f} ms" + (" (idx)" if indexed else " (seq)"), count))
+        print(f"{label:<20} {cells[0][0]:>18} {cells[1][0]:>20} {cells[2][0]:>18} {cells[3][0]:>18} {cells[3][1]:>10,}")
+
+    if not keep:
+        with loader.engine.begin() as conn:
+            conn.execute(text(f"DROP TABLE IF EXISTS {BENCH_TABLE}"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark full-text search against ILIKE on synthetic comments")
+    parser.add_argument("--rows", type=int, default=2_000_000, help="Synthetic comments to generate")
+    parser.add_argument("--videos", type=int, default=20_000, help="Videos the comments are spread over")
+    parser.add_argument("--limit", type=int, default=20, help="Rows returned by the top-N queries")
+    parser.add_argument("--repeats", type=int, default=3, help="Runs per query (median reported)")
+    parser.add_argument("--keep", action="store_true", help=f"Keep {BENCH_TABLE} for manual EXPLAINs")
+    args = parser.parse_args()
+    run(args.rows, args.videos, args.limit, args.repeats, args.keep)
+
+if __name__ == "__main__":
+    main()
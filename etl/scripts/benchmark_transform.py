@@ -0,0 +1,148 @@
+import os
+import sys
+import time
+import random
+import argparse
+import pandas as pd
+
+# Add etl/ to path so `src` is importable when running this script directly
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.transform.clean_data import (
+    process_channels, process_videos, process_comments,
+    process_channels_columnar, process_videos_columnar, process_comments_columnar
+)
+
+
+def make_raw_videos(n: int, seed: int = 0) -> list:
+    """
+    Build `n` synthetic video resources shaped like the YouTube `videos` endpoint output.
+    """
+    rng = random.Random(seed)
+    durations = ["PT{}M{}S", "PT{}H{}M", "PT{}S", "P0D", "P1DT{}H", ""]
+    items = []
+    for i in range(n):
+        template = rng.choice(durations)
+        item = {
+            "id": f"vid{i:08d}",
+            "snippet": {
+                "channelId": f"UC{i % 300:05d}",
+                "title": f"Video {i}",
+                "description": "Lorem ipsum " * rng.randint(0, 20),
+                "publishedAt": f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T12:00:00Z",
+                "categoryId": str(rng.randint(1, 30)),
+                "thumbnails": {"high": {"url": f"https://i.ytimg.com/vi/vid{i}/hq.jpg"}}
+            },
+            "statistics": {
+                "viewCount": str(rng.randint(0, 10**9)),
+                "likeCount": str(rng.randint(0, 10**6)),
+                "commentCount": str(rng.randint(0, 10**4))
+            },
+            "contentDetails": {"duration": template.format(rng.randint(0, 59), rng.randint(0, 59))}
+        }
+        if rng.random() < 0.7:
+            item["snippet"]["tags"] = [f"tag{rng.randint(0, 99)}" for _ in range(rng.randint(1, 5))]
+        if rng.random() < 0.1:
+            # Likes hidden by the uploader
+            del item["statistics"]["likeCount"]
+        if rng.random() < 0.02:
+            del item["contentDetails"]
+        items.append(item)
+    return items
+
+
+def make_raw_channels(n: int, seed: int = 0) -> list:
+    """
+    Build `n` synthetic channel resources shaped like the YouTube `channels` endpoint output.
+    """
+    rng = random.Random(seed)
+    return [
+        {
+            "id": f"UC{i:05d}",
+            "snippet": {
+                "title": f"Channel {i}",
+                "description": "About this channel",
+                "customUrl": f"@channel{i}",
+                "publishedAt": "2015-06-01T00:00:00Z",
+                "thumbnails": {"high": {"url": f"https://yt3.ggpht.com/{i}"}},
+                **({"country": "US"} if rng.random() < 0.5 else {})
+            },
+            "statistics": {
+                "subscriberCount": str(rng.randint(0, 10**7)),
+                "viewCount": str(rng.randint(0, 10**10)),
+                "videoCount": str(rng.randint(0, 5000))
+            }
+        }
+        for i in range(n)
+    ]
+
+
+def make_raw_comments(n: int, seed: int = 0) -> list:
+    """
+    Build `n` synthetic comment threads shaped like the YouTube `commentThreads` endpoint output.
+    """
+    rng = random.Random(seed)
+    return [
+        {
+            "id": f"Ugx{i:09d}",
+            "snippet": {
+                "topLevelComment": {
+                    "snippet": {
+                        "authorDisplayName": f"@user{rng.randint(0, 10**6)}",
+                        "textDisplay": "Great video! " * rng.randint(1, 5),
+                        "likeCount": rng.randint(0, 5000),
+                        "publishedAt": "2024-03-01T08:00:00Z"
+                    }
+                }
+            }
+        }
+        for i in range(n)
+    ]
+
+
+def time_call(func, *args) -> tuple:
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def run(rows: int) -> bool:
+    """
+    Check parity between the row-wise and columnar transforms and report rows/sec for each.
+    """
+    cases = [
+        ("channels", process_channels, process_channels_columnar, (make_raw_channels(rows),)),
+        ("videos", process_videos, process_videos_columnar, (make_raw_videos(rows),)),
+        ("comments", process_comments, process_comments_columnar, (make_raw_comments(rows), "vid00000000")),
+    ]
+
+    ok = True
+    print(f"--- Transform Benchmark ({rows:,} rows) ---")
+    print(f"{'transform':<10} {'row-wise rows/s':>16} {'columnar rows/s':>16} {'speedup':>8}  parity")
+    for name, rowwise, columnar, args in cases:
+        expected, rowwise_secs = time_call(rowwise, *args)
+        actual, columnar_secs = time_call(columnar, *args)
+
+        expected = expected if isinstance(expected, tuple) else (expected,)
+        actual = actual if isinstance(actual, tuple) else (actual,)
+        try:
+            for expected_df, actual_df in zip(expected, actual):
+                pd.testing.assert_frame_equal(expected_df, actual_df, check_exact=True)
+            parity = "OK"
+        except AssertionError as e:
+            parity = f"MISMATCH: {e}"
+            ok = False
+
+        print(
+            f"{name:<10} {rows / rowwise_secs:>16,.0f} {rows / columnar_secs:>16,.0f} "
+            f"{rowwise_secs / columnar_secs:>7.1f}x  {parity}"
+        )
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark and parity-check the transform functions.")
+    parser.add_argument("--rows", type=int, default=200_000, help="Synthetic rows per transform")
+    args = parser.parse_args()
+
+    sys.exit(0 if run(args.rows) else 1)
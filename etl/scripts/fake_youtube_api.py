@@ -0,0 +1,358 @@
+import json
+import time
+import random
+import hashlib
+import argparse
+import threading
+import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+# Synthetic IDs: channel UCbench000042, its uploads playlist UUbench000042 and
+# video vb000042x00007 (the channel's 8th newest upload)
+CHANNEL_PREFIX = "UCbench"
+PLAYLIST_PREFIX = "UUbench"
+
+# Newest upload of every channel; older uploads are spaced 6 hours apart
+NEWEST_UPLOAD = datetime.datetime(2025, 6, 1, tzinfo=datetime.timezone.utc)
+
+# Transient errors injected with --error-rate (all retried by YouTubeAPI)
+INJECTED_STATUS_CODES = (429, 500, 503)
+
+
+def channel_ids(count: int) -> List[str]:
+    return [f"{CHANNEL_PREFIX}{i:06d}" for i in range(count)]
+
+
+def _index(value: str, prefix: str) -> Optional[int]:
+    if not value.startswith(prefix) or not value[len(prefix):].isdigit():
+        return None
+    return int(value[len(prefix):])
+
+
+class FakeYouTubeData:
+    """
+    Deterministic synthetic YouTube catalog, generated per ID on demand.
+
+    Every resource is derived from (seed, ID), so any channel count can be served
+    without holding the catalog in memory and repeated runs see identical data.
+    """
+    def __init__(self, channels: int, videos_per_channel: int = 20, comments_per_video: int = 5, seed: int = 0):
+        self.channels = channels
+        self.videos_per_channel = videos_per_channel
+        self.comments_per_video = comments_per_video
+        self.seed = seed
+
+    def _rng(self, key: str) -> random.Random:
+        return random.Random(f"{self.seed}:{key}")
+
+    def _channel_index(self, channel_id: str) -> Optional[int]:
+        index = _index(channel_id, CHANNEL_PREFIX)
+        return index if index is not None and index < self.channels else None
+
+    def _video_position(self, video_id: str) -> Optional[tuple]:
+        if not video_id.startswith("vb") or "x" not in video_id:
+            return None
+        channel, _, position = video_id[2:].partition("x")
+        if not (channel.isdigit() and position.isdigit()):
+            return None
+        channel, position = int(channel), int(position)
+        if channel >= self.channels or position >= self.videos_per_channel:
+            return None
+        return channel, position
+
+    @staticmethod
+    def video_id(channel: int, position: int) -> str:
+        return f"vb{channel:06d}x{position:05d}"
+
+    @staticmethod
+    def _published_at(position: int) -> str:
+        published = NEWEST_UPLOAD - datetime.timedelta(hours=6 * position)
+        return published.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    def channel(self, channel_id: str) -> Optional[Dict[str, Any]]:
+        index = self._channel_index(channel_id)
+        if index is None:
+            return None
+        rng = self._rng(channel_id)
+        return {
+            "kind": "youtube#channel",
+            "id": channel_id,
+            "snippet": {
+                "title": f"Bench Channel {index}",
+                "description": "Synthetic channel " * rng.randint(1, 10),
+                "customUrl": f"@bench{index}",
+                "publishedAt": "2015-06-01T00:00:00Z",
+                "thumbnails": {"high": {"url": f"https://yt3.ggpht.com/bench{index}"}},
+                **({"country": rng.choice(["US", "GB", "IN", "DE"])} if rng.random() < 0.6 else {})
+            },
+            "statistics": {
+                "subscriberCount": str(rng.randint(0, 10**7)),
+                "viewCount": str(rng.randint(0, 10**10)),
+                "videoCount": str(self.videos_per_channel)
+            },
+            "contentDetails": {"relatedPlaylists": {"uploads": f"{PLAYLIST_PREFIX}{index:06d}"}}
+        }
+
+    def playlist_page(self, playlist_id: str, offset: int, page_size: int) -> Dict[str, Any]:
+        index = _index(playlist_id, PLAYLIST_PREFIX)
+        if index is None or index >= self.channels:
+            return {"items": [], "pageInfo": {"totalResults": 0}}
+
+        positions = range(offset, min(offset + page_size, self.videos_per_channel))
+        page = {
+            "items": [
+                {
+                    "kind": "youtube#playlistItem",
+                    "id": f"PLI{index:06d}x{position:05d}",
+                    "snippet": {"title": f"Video {position}", "publishedAt": self._published_at(position)},
+                    "contentDetails": {
+                        "videoId": self.video_id(index, position),
+                        "videoPublishedAt": self._published_at(position)
+                    }
+                }
+                for position in positions
+            ],
+            "pageInfo": {"totalResults": self.videos_per_channel, "resultsPerPage": page_size}
+        }
+        if offset + page_size < self.videos_per_channel:
+            page["nextPageToken"] = str(offset + page_size)
+        return page
+
+    def video(self, video_id: str) -> Optional[Dict[str, Any]]:
+        position = self._video_position(video_id)
+        if position is None:
+            return None
+        channel, position = position
+        rng = self._rng(video_id)
+        item = {
+            "kind": "youtube#video",
+            "id": video_id,
+            "snippet": {
+                "channelId": f"{CHANNEL_PREFIX}{channel:06d}",
+                "title": f"Bench video {position} of channel {channel}",
+                "description": "Lorem ipsum " * rng.randint(0, 20),
+                "publishedAt": self._published_at(position),
+                "categoryId": str(rng.randint(1, 30)),
+                "thumbnails": {"high": {"url": f"https://i.ytimg.com/vi/{video_id}/hq.jpg"}}
+            },
+            "statistics": {
+                "viewCount": str(rng.randint(0, 10**8)),
+                "likeCount": str(rng.randint(0, 10**6)),
+                "commentCount": str(self.comments_per_video)
+            },
+            "contentDetails": {"duration": f"PT{rng.randint(0, 59)}M{rng.randint(0, 59)}S"}
+        }
+        if rng.random() < 0.7:
+            item["snippet"]["tags"] = [f"tag{rng.randint(0, 99)}" for _ in range(rng.randint(1, 5))]
+        if rng.random() < 0.1:
+            # Likes hidden by the uploader
+            del item["statistics"]["likeCount"]
+        return item
+
+    def comment_thread(self, video_id: str, number: int) -> Dict[str, Any]:
+        """
+        The video's `number`-th comment thread (0 = oldest); threads are one minute apart.
+        """
+        rng = self._rng(f"comment:{video_id}:{number}")
+        published_at = NEWEST_UPLOAD + datetime.timedelta(days=1, minutes=number)
+        return {
+            "kind": "youtube#commentThread",
+            "id": f"Ugb{video_id}c{number:03d}",
+            "snippet": {
+                "videoId": video_id,
+                "topLevelComment": {
+                    "snippet": {
+                        "authorDisplayName": f"@user{rng.randint(0, 10**6)}",
+                        "textDisplay": "Great video!\tReally\\ \"nice\"\n" * rng.randint(1, 3),
+                        "likeCount": rng.randint(0, 5000),
+                        "publishedAt": published_at.strftime("%Y-%m-%dT%H:%M:%SZ")
+                    }
+                }
+            }
+        }
+
+    def comment_threads_page(self, video_id: str, offset: int, page_size: int) -> Dict[str, Any]:
+        """
+        One page of a video's comment threads in order=time (newest first).
+        """
+        if self._video_position(video_id) is None:
+            return {"items": [], "pageInfo": {"totalResults": 0}}
+
+        positions = range(offset, min(offset + page_size, self.comments_per_video))
+        page = {
+            "items": [self.comment_thread(video_id, self.comments_per_video - 1 - position) for position in positions],
+            "pageInfo": {"totalResults": self.comments_per_video, "resultsPerPage": page_size}
+        }
+        if offset + page_size < self.comments_per_video:
+            page["nextPageToken"] = str(offset + page_size)
+        return page
+
+
+class FakeYouTubeServer(ThreadingHTTPServer):
+    """
+    HTTP server exposing FakeYouTubeData under the YouTube Data API v3 paths.
+
+    Also serves GET /_stats (calls and injected errors per endpoint) and GET /_reset.
+    """
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address,
+        data: FakeYouTubeData,
+        latency_ms: float = 0.0,
+        error_rate: float = 0.0,
+        key_quota: int = 0
+    ):
+        super().__init__(address, FakeYouTubeHandler)
+        self.data = data
+        self.latency_ms = latency_ms
+        self.error_rate = error_rate
+        self.key_quota = key_quota
+        self.rng = random.Random(data.seed)
+        self.lock = threading.Lock()
+        self.calls: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+        self.calls_by_key: Dict[str, int] = {}
+        self.not_modified = 0
+
+    def record(self, counter: Dict[str, int], endpoint: str) -> None:
+        with self.lock:
+            counter[endpoint] = counter.get(endpoint, 0) + 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            return {"calls": dict(self.calls), "errors": dict(self.errors), "calls_by_key": dict(self.calls_by_key),
+                    "not_modified": self.not_modified}
+
+    def reset(self) -> None:
+        with self.lock:
+            self.calls.clear()
+            self.errors.clear()
+            self.calls_by_key.clear()
+            self.not_modified = 0
+
+
+class FakeYouTubeHandler(BaseHTTPRequestHandler):
+    # Keep-alive, so the client's pooled session is exercised as in production
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without this Nagle adds ~40ms per response
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def _send_json(self, status: int, body: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> None:
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=UTF-8")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self) -> None:
+        server: FakeYouTubeServer = self.server
+        url = urlparse(self.path)
+        params = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        endpoint = url.path.rstrip("/").rsplit("/", 1)[-1]
+
+        if endpoint == "_stats":
+            return self._send_json(200, server.stats())
+        if endpoint == "_reset":
+            server.reset()
+            return self._send_json(200, {"reset": True})
+
+        server.record(server.calls, endpoint)
+        server.record(server.calls_by_key, params.get("key", ""))
+        if server.key_quota and server.calls_by_key[params.get("key", "")] > server.key_quota:
+            return self._send_json(403, {"error": {"code": 403, "message": "Quota exceeded",
+                                                   "errors": [{"reason": "quotaExceeded"}]}})
+        if server.latency_ms:
+            time.sleep(server.latency_ms * random.uniform(0.5, 1.5) / 1000)
+
+        with server.lock:
+            inject = server.error_rate and server.rng.random() < server.error_rate
+            status = server.rng.choice(INJECTED_STATUS_CODES) if inject else None
+        if status:
+            server.record(server.errors, endpoint)
+            return self._send_json(status, {"error": {"code": status, "message": "Injected error", "errors": []}})
+
+        body = self._resource(endpoint, params)
+        if body is None:
+            return self._send_json(404, {"error": {"code": 404, "message": f"Unknown endpoint {endpoint}"}})
+
+        etag = '"' + hashlib.md5(json.dumps(body, sort_keys=True).encode()).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            with server.lock:
+                server.not_modified += 1
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body["etag"] = etag
+        self._send_json(200, body, {"ETag": etag})
+
+    def _resource(self, endpoint: str, params: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        data: FakeYouTubeData = self.server.data
+        ids = [value for value in params.get("id", "").split(",") if value]
+        max_results = int(params.get("maxResults", "5"))
+
+        if endpoint == "channels":
+            items = [data.channel(channel_id) for channel_id in ids]
+        elif endpoint == "videos":
+            items = [data.video(video_id) for video_id in ids]
+        elif endpoint == "playlistItems":
+            return data.playlist_page(params.get("playlistId", ""), int(params.get("pageToken", "0")), max_results)
+        elif endpoint == "commentThreads":
+            return data.comment_threads_page(params.get("videoId", ""), int(params.get("pageToken", "0")), max_results)
+        else:
+            return None
+
+        items = [item for item in items if item]
+        return {"items": items, "pageInfo": {"totalResults": len(items), "resultsPerPage": len(items)}}
+
+
+def serve(
+    port: int,
+    channels: int,
+    videos_per_channel: int = 20,
+    comments_per_video: int = 5,
+    seed: int = 0,
+    latency_ms: float = 0.0,
+    error_rate: float = 0.0,
+    key_quota: int = 0,
+    host: str = "127.0.0.1"
+) -> None:
+    """
+    Run the stand-in server until interrupted.
+    """
+    data = FakeYouTubeData(channels, videos_per_channel, comments_per_video, seed)
+    server = FakeYouTubeServer((host, port), data, latency_ms=latency_ms, error_rate=error_rate, key_quota=key_quota)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve a synthetic YouTube Data API v3 for local benchmarks.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--channels", type=int, default=1000, help="Channels in the synthetic catalog")
+    parser.add_argument("--videos-per-channel", type=int, default=20)
+    parser.add_argument("--comments-per-video", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Mean added latency per request")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 429/500/503")
+    parser.add_argument("--key-quota", type=int, default=0,
+                        help="Calls each API key may make before it is answered with quotaExceeded (0: unlimited)")
+    args = parser.parse_args()
+
+    print(f"Serving {args.channels:,} synthetic channels on http://127.0.0.1:{args.port} "
+          f"(set YOUTUBE_API_BASE_URL to this URL; channel IDs {CHANNEL_PREFIX}000000...)")
+    serve(args.port, args.channels, args.videos_per_channel, args.comments_per_video,
+          args.seed, args.latency_ms, args.error_rate, args.key_quota)
@@ -1,14 +1,26 @@
 import os
 import sys
 import logging
+import argparse
+import datetime
 from sqlalchemy import create_engine, text
 from dotenv import load_dotenv
 
+# Add etl/ to path so `src` is importable when running this script directly
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.load.partitions import add_months, ensure_partitions, migrate_to_partitioned
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def init_db():
+def init_db(partitioned: bool = False, months_ahead: int = 3):
+    """
+    Apply the schema. With `partitioned`, the fact tables are converted to the
+    monthly-partitioned layout (existing rows are kept) and partitions are created
+    `months_ahead` months into the future.
+    """
     load_dotenv()
     
     user = os.getenv("DB_USER")
@@ -27,9 +39,11 @@ def init_db():
         engine = create_engine(connection_string)
         
         # Read schema file
-        schema_path = os.path.join(os.path.dirname(__file__), '..', 'sql', 'schema.sql')
-        with open(schema_path, 'r') as f:
+        sql_dir = os.path.join(os.path.dirname(__file__), '..', 'sql')
+        with open(os.path.join(sql_dir, 'schema.sql'), 'r') as f:
             schema_sql = f.read()
+        with open(os.path.join(sql_dir, 'partitioned_facts.sql'), 'r') as f:
+            partitioned_sql = f.read()
 
         with engine.connect() as conn:
             # 1. Drop existing tables in reverse dependency order
@@ -49,6 +63,17 @@ def init_db():
             # Split by ';' to handle multiple statements if driver doesn't support bulk
             # But sqlalchemy/psycopg2 usually handles it or we can execute the whole block
             conn.execute(text(schema_sql))
+
+            # 3. Optional partitioned fact tables
+            if partitioned:
+                logger.info("Converting fact tables to the partitioned layout...")
+                migrate_to_partitioned(conn, partitioned_sql, months_ahead=months_ahead)
+                # Recreate the views dropped with the old tables
+                conn.execute(text(schema_sql))
+                # Partition pruning + BRIN replace the B-tree date indexes
+                conn.execute(text("DROP INDEX IF EXISTS idx_fact_channel_date, idx_fact_video_date;"))
+                today = datetime.date.today()
+                ensure_partitions(conn, today, add_months(today, months_ahead))
             
             conn.commit()
             logger.info("Database initialized successfully!")
@@ -59,7 +84,14 @@ def init_db():
         return False
 
 if __name__ == "__main__":
-    if init_db():
+    parser = argparse.ArgumentParser(description="Initialize the database schema.")
+    parser.add_argument("--partitioned", action="store_true",
+                        help="Use monthly range partitions on date_id for the fact tables")
+    parser.add_argument("--months-ahead", type=int, default=3,
+                        help="Monthly partitions to create ahead of the current month")
+    args = parser.parse_args()
+
+    if init_db(partitioned=args.partitioned, months_ahead=args.months_ahead):
         sys.exit(0)
     else:
         sys.exit(1)
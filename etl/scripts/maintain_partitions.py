@@ -0,0 +1,69 @@
+import os
+import sys
+import logging
+import argparse
+import datetime
+from sqlalchemy import create_engine
+from dotenv import load_dotenv
+
+# Add etl/ to path so `src` is importable when running this script directly
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.load.partitions import add_months, detach_old_partitions, ensure_partitions, month_start
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def maintain_partitions(months_ahead: int, retain_months: int, archive_schema: str, drop: bool) -> bool:
+    """
+    Create upcoming monthly fact partitions and detach (archive or drop) expired ones.
+    """
+    load_dotenv()
+
+    user = os.getenv("DB_USER")
+    password = os.getenv("DB_PASSWORD")
+    host = os.getenv("DB_HOST")
+    port = os.getenv("DB_PORT", "5432")
+    dbname = os.getenv("DB_NAME")
+
+    if not all([user, password, host, dbname]):
+        logger.error("Missing database credentials in .env")
+        return False
+
+    connection_string = f"postgresql+psycopg2://{user}:{password}@{host}:{port}/{dbname}"
+
+    try:
+        engine = create_engine(connection_string)
+        today = datetime.date.today()
+
+        with engine.begin() as conn:
+            created = ensure_partitions(conn, today, add_months(today, months_ahead))
+            logger.info(f"{len(created)} partitions created")
+
+            if retain_months > 0:
+                cutoff = add_months(month_start(today), -retain_months)
+                detached = detach_old_partitions(conn, cutoff, archive_schema=archive_schema, drop=drop)
+                logger.info(f"{len(detached)} partitions older than {cutoff} detached")
+        return True
+
+    except Exception as e:
+        logger.error(f"Partition maintenance failed: {e}")
+        return False
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Maintain monthly partitions of the fact tables.")
+    parser.add_argument("--months-ahead", type=int, default=3,
+                        help="Monthly partitions to create ahead of the current month")
+    parser.add_argument("--retain-months", type=int, default=0,
+                        help="Detach partitions older than this many months (0 keeps everything)")
+    parser.add_argument("--archive-schema", default="archive",
+                        help="Schema detached partitions are moved to")
+    parser.add_argument("--drop", action="store_true",
+                        help="Drop detached partitions instead of archiving them")
+    args = parser.parse_args()
+
+    if maintain_partitions(args.months_ahead, args.retain_months, args.archive_schema, args.drop):
+        sys.exit(0)
+    else:
+        sys.exit(1)
@@ -0,0 +1,42 @@
+-- Partitioned layout for the fact tables (optional, applied by `init_db.py --partitioned`)
+--
+-- Both fact tables are range-partitioned by month on date_id. Every unique
+-- constraint on a partitioned table must include the partition key, so the
+-- surrogate id becomes part of the primary key; the (…, date_id) natural keys
+-- used by the loader's ON CONFLICT upserts are unchanged.
+--
+-- Monthly partitions are created by src/load/partitions.py (init_db.py and
+-- scripts/maintain_partitions.py); this file only creates the parents.
+
+-- 4. Fact: Channel Daily Metrics (partitioned)
+CREATE TABLE IF NOT EXISTS fact_channel_daily (
+    id BIGSERIAL,
+    channel_id TEXT REFERENCES dim_channel(channel_id),
+    date_id DATE NOT NULL REFERENCES dim_date(date_id),
+    subscribers BIGINT,
+    total_views BIGINT,
+    total_videos BIGINT,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id, date_id),
+    UNIQUE(channel_id, date_id)
+) PARTITION BY RANGE (date_id);
+
+-- 5. Fact: Video Daily Metrics (partitioned)
+CREATE TABLE IF NOT EXISTS fact_video_daily (
+    id BIGSERIAL,
+    video_id TEXT REFERENCES dim_video(video_id),
+    date_id DATE NOT NULL REFERENCES dim_date(date_id),
+    views BIGINT,
+    likes BIGINT,
+    comments BIGINT,
+    snapshot_at TIMESTAMP WITH TIME ZONE,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id, date_id),
+    UNIQUE(video_id, date_id)
+) PARTITION BY RANGE (date_id);
+
+-- Rows are appended in date order, so a BRIN index on date_id is tiny and
+-- still lets scans inside a partition skip blocks. The B-tree date indexes of
+-- the heap layout are redundant once partitions are pruned by date.
+CREATE INDEX IF NOT EXISTS idx_fact_channel_date_brin ON fact_channel_daily USING BRIN (date_id);
+CREATE INDEX IF NOT EXISTS idx_fact_video_date_brin ON fact_video_daily USING BRIN (date_id);
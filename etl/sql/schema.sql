@@ -13,6 +13,7 @@ CREATE TABLE IF NOT EXISTS dim_channel (
     country TEXT,
     custom_url TEXT,
     thumbnail_url TEXT,
+    content_hash TEXT,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
@@ -29,10 +30,17 @@ CREATE TABLE IF NOT EXISTS dim_video (
     item_count INT DEFAULT 0, -- Store for compatibility if needed or removed
     tags TEXT[],
     thumbnail_url TEXT,
+    content_hash TEXT,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
+-- content_hash: digest of the row's loaded attributes. The loader skips rows whose
+-- hash is unchanged, so updated_at only moves when the content really changes.
+-- (Added here for databases created before the column existed.)
+ALTER TABLE dim_channel ADD COLUMN IF NOT EXISTS content_hash TEXT;
+ALTER TABLE dim_video ADD COLUMN IF NOT EXISTS content_hash TEXT;
+
 -- 3. Dimension: Date (Generated)
 CREATE TABLE IF NOT EXISTS dim_date (
     date_id DATE PRIMARY KEY,
@@ -81,10 +89,30 @@ CREATE TABLE IF NOT EXISTS fact_video_daily (
     views BIGINT,
     likes BIGINT,
     comments BIGINT,
+    snapshot_at TIMESTAMP WITH TIME ZONE,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     UNIQUE(video_id, date_id)
 );
 
+-- snapshot_at: when the stats were fetched. The grain stays one row per video and
+-- day; a video refreshed several times a day keeps its latest snapshot here.
+-- (Added here for databases created before the column existed.)
+ALTER TABLE fact_video_daily ADD COLUMN IF NOT EXISTS snapshot_at TIMESTAMP WITH TIME ZONE;
+
+-- 5b. Fact: every snapshot taken by the refresh scheduler (src/refresh.py), so hot
+-- videos refreshed several times a day keep their sub-daily history
+CREATE TABLE IF NOT EXISTS fact_video_intraday (
+    video_id TEXT REFERENCES dim_video(video_id),
+    snapshot_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    date_id DATE NOT NULL,
+    views BIGINT,
+    likes BIGINT,
+    comments BIGINT,
+    PRIMARY KEY (video_id, snapshot_at)
+);
+
+CREATE INDEX IF NOT EXISTS idx_fact_video_intraday_date ON fact_video_intraday(date_id);
+
 -- 6. Comments Table (Optional/Separate Fact or Dimension depending on usage, kept for raw data)
 CREATE TABLE IF NOT EXISTS youtube_comments (
     comment_id TEXT PRIMARY KEY,
@@ -96,15 +124,65 @@ CREATE TABLE IF NOT EXISTS youtube_comments (
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
+-- --------------------------------------------------
+-- STEP 2b — PIPELINE STATE TABLES
+-- --------------------------------------------------
+
+-- 7. Per-channel high-water mark for incremental video discovery
+CREATE TABLE IF NOT EXISTS channel_watermarks (
+    channel_id TEXT PRIMARY KEY REFERENCES dim_channel(channel_id),
+    last_video_id TEXT,
+    last_published_at TIMESTAMP WITH TIME ZONE,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+-- 8. Run checkpoints: which channels finished which stage for a date_id (used by --resume)
+CREATE TABLE IF NOT EXISTS pipeline_checkpoints (
+    date_id DATE NOT NULL,
+    channel_id TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    completed_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (date_id, channel_id, stage)
+);
+
+-- 14. Per-video comment sync cursor: the video's commentCount when its comments were
+-- last synced and the newest comment stored. Comments are only re-fetched when the
+-- count changes, and only back to that newest comment.
+CREATE TABLE IF NOT EXISTS comment_cursors (
+    video_id TEXT PRIMARY KEY REFERENCES dim_video(video_id),
+    comment_count BIGINT,
+    newest_published_at TIMESTAMP WITH TIME ZONE,
+    synced_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Set while a sync is paused at COMMENT_SYNC_MAX_PAGES: the page to continue from and the
+-- newest comment seen so far (newest_published_at only advances once the sync is complete)
+ALTER TABLE comment_cursors ADD COLUMN IF NOT EXISTS resume_page_token TEXT;
+ALTER TABLE comment_cursors ADD COLUMN IF NOT EXISTS resume_newest_published_at TIMESTAMP WITH TIME ZONE;
+
 -- --------------------------------------------------
 -- STEP 3 — CREATE ANALYTICS VIEWS
 -- --------------------------------------------------
 
 CREATE SCHEMA IF NOT EXISTS analytics;
 
--- 1. analytics_channel_summary
-CREATE OR REPLACE VIEW analytics.channel_summary AS
-SELECT
+-- The latest-snapshot views are materialized so dashboard reads do not rescan the
+-- fact history; the pipeline refreshes them (CONCURRENTLY, so readers are never
+-- blocked) after every load. Earlier installs created them as plain views.
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_views WHERE schemaname = 'analytics' AND viewname = 'channel_summary') THEN
+        DROP VIEW analytics.channel_summary;
+    END IF;
+    IF EXISTS (SELECT 1 FROM pg_views WHERE schemaname = 'analytics' AND viewname = 'video_performance') THEN
+        DROP VIEW analytics.video_performance;
+    END IF;
+END $$;
+
+-- 1. analytics_channel_summary (latest snapshot per channel)
+CREATE MATERIALIZED VIEW IF NOT EXISTS analytics.channel_summary AS
+SELECT DISTINCT ON (dc.channel_id)
     dc.channel_id,
     dc.channel_name,
     dc.country,
@@ -114,13 +192,14 @@ SELECT
     fcd.date_id as last_updated
 FROM dim_channel dc
 JOIN fact_channel_daily fcd ON dc.channel_id = fcd.channel_id
-WHERE fcd.date_id = (
-    SELECT MAX(date_id) FROM fact_channel_daily WHERE channel_id = dc.channel_id
-);
+ORDER BY dc.channel_id, fcd.date_id DESC;
 
--- 2. analytics_video_performance
-CREATE OR REPLACE VIEW analytics.video_performance AS
-SELECT
+-- Required by REFRESH MATERIALIZED VIEW CONCURRENTLY
+CREATE UNIQUE INDEX IF NOT EXISTS idx_channel_summary_channel_id ON analytics.channel_summary(channel_id);
+
+-- 2. analytics_video_performance (latest snapshot per video)
+CREATE MATERIALIZED VIEW IF NOT EXISTS analytics.video_performance AS
+SELECT DISTINCT ON (dv.video_id)
     dv.video_id,
     dv.title as video_title,
     dc.channel_name,
@@ -132,9 +211,10 @@ SELECT
 FROM dim_video dv
 JOIN dim_channel dc ON dv.channel_id = dc.channel_id
 JOIN fact_video_daily fvd ON dv.video_id = fvd.video_id
-WHERE fvd.date_id = (
-    SELECT MAX(date_id) FROM fact_video_daily WHERE video_id = dv.video_id
-);
+ORDER BY dv.video_id, fvd.date_id DESC;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_video_performance_video_id ON analytics.video_performance(video_id);
+CREATE INDEX IF NOT EXISTS idx_video_performance_views ON analytics.video_performance(total_views DESC);
 
 -- 3. analytics_channel_growth
 CREATE OR REPLACE VIEW analytics.channel_growth AS
@@ -148,6 +228,107 @@ FROM fact_channel_daily fcd
 JOIN dim_channel dc ON fcd.channel_id = dc.channel_id
 ORDER BY fcd.date_id DESC;
 
+-- --------------------------------------------------
+-- STEP 4 — DAILY ROLLUP TABLES
+-- --------------------------------------------------
+
+-- The fact tables hold cumulative counters; these rollups store what each day
+-- added (delta to the previous snapshot) so dashboards never sum raw snapshots.
+-- They are rebuilt for the loaded date_id after every run (src/load/rollups.py).
+-- *_gained is NULL for a video's first snapshot, when there is nothing to diff against.
+
+-- 9. Per-video daily deltas
+CREATE TABLE IF NOT EXISTS agg_video_daily (
+    video_id TEXT REFERENCES dim_video(video_id),
+    date_id DATE REFERENCES dim_date(date_id),
+    channel_id TEXT REFERENCES dim_channel(channel_id),
+    views BIGINT,
+    likes BIGINT,
+    comments BIGINT,
+    views_gained BIGINT,
+    likes_gained BIGINT,
+    comments_gained BIGINT,
+    engagement_rate DOUBLE PRECISION, -- (likes + comments) / views
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (video_id, date_id)
+);
+
+-- 10. Per-channel daily totals and deltas (sum over the channel's tracked videos)
+CREATE TABLE IF NOT EXISTS agg_channel_daily (
+    channel_id TEXT REFERENCES dim_channel(channel_id),
+    date_id DATE REFERENCES dim_date(date_id),
+    videos_tracked INT,
+    views BIGINT,
+    likes BIGINT,
+    comments BIGINT,
+    views_gained BIGINT,
+    likes_gained BIGINT,
+    comments_gained BIGINT,
+    engagement_rate DOUBLE PRECISION,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (channel_id, date_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_agg_video_daily_date ON agg_video_daily(date_id);
+CREATE INDEX IF NOT EXISTS idx_agg_channel_daily_date ON agg_channel_daily(date_id);
+
+-- --------------------------------------------------
+-- STEP 4b — RUN METRICS & WORK QUEUE
+-- --------------------------------------------------
+
+-- 11. One row per pipeline run (status: success, partial = some channels rolled back, failed)
+CREATE TABLE IF NOT EXISTS pipeline_runs (
+    run_id BIGSERIAL PRIMARY KEY,
+    date_id DATE NOT NULL,
+    started_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    finished_at TIMESTAMP WITH TIME ZONE,
+    duration_seconds DOUBLE PRECISION,
+    status TEXT NOT NULL,
+    channels_total INT,
+    channels_failed INT,
+    quota_used INT,
+    retries INT,
+    error TEXT
+);
+
+-- 12. Per-stage counters of each run (stages: api.<endpoint>, transform.<entity>, load.<table>, ...)
+CREATE TABLE IF NOT EXISTS pipeline_stage_metrics (
+    run_id BIGINT REFERENCES pipeline_runs(run_id) ON DELETE CASCADE,
+    stage TEXT NOT NULL,
+    calls BIGINT,
+    seconds DOUBLE PRECISION,
+    rows_in BIGINT,
+    rows_out BIGINT,
+    rows_upserted BIGINT,
+    bytes BIGINT,
+    quota_units BIGINT,
+    retries BIGINT,
+    errors BIGINT,
+    cache_hits BIGINT,
+    PRIMARY KEY (run_id, stage)
+);
+
+CREATE INDEX IF NOT EXISTS idx_pipeline_runs_started_at ON pipeline_runs(started_at);
+
+-- 13. Work queue for coordinator/worker mode: one job per channel and date_id.
+-- Workers claim jobs with FOR UPDATE SKIP LOCKED and hold them under a lease;
+-- a job whose lease expires is reclaimed, until max attempts are used up.
+CREATE TABLE IF NOT EXISTS pipeline_jobs (
+    job_id BIGSERIAL PRIMARY KEY,
+    date_id DATE NOT NULL,
+    channel_id TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending', -- pending | running | done | failed
+    attempts INT NOT NULL DEFAULT 0,
+    worker_id TEXT,
+    lease_expires_at TIMESTAMP WITH TIME ZONE,
+    last_error TEXT,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (date_id, channel_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_pipeline_jobs_claimable ON pipeline_jobs(date_id, job_id) WHERE status IN ('pending', 'running');
+
 -- --------------------------------------------------
 -- STEP 5 — PERFORMANCE ADDITIONS
 -- --------------------------------------------------
@@ -158,3 +339,44 @@ CREATE INDEX IF NOT EXISTS idx_fact_channel_cid ON fact_channel_daily(channel_id
 CREATE INDEX IF NOT EXISTS idx_fact_video_date ON fact_video_daily(date_id);
 CREATE INDEX IF NOT EXISTS idx_fact_video_vid ON fact_video_daily(video_id);
 
+
+-- --------------------------------------------------
+-- STEP 6 — FULL-TEXT SEARCH
+-- --------------------------------------------------
+
+-- search_vector columns are generated by PostgreSQL from the loaded text, so every
+-- upsert in DataLoader.load_data keeps them current (the loader never writes them).
+-- Queries must use the same 'english' configuration (see src/search.py).
+
+-- array_to_string is only STABLE; for TEXT[] it is safe to declare immutable, which
+-- generated columns require
+CREATE OR REPLACE FUNCTION search_tags_text(tags TEXT[]) RETURNS TEXT
+    LANGUAGE SQL IMMUTABLE PARALLEL SAFE
+    AS $$ SELECT array_to_string(tags, ' ') $$;
+
+ALTER TABLE youtube_comments ADD COLUMN IF NOT EXISTS search_vector TSVECTOR
+    GENERATED ALWAYS AS (to_tsvector('english', COALESCE(text, ''))) STORED;
+
+-- Title ranks above tags, tags above description
+ALTER TABLE dim_video ADD COLUMN IF NOT EXISTS search_vector TSVECTOR
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', COALESCE(title, '')), 'A') ||
+        setweight(to_tsvector('english', COALESCE(search_tags_text(tags), '')), 'B') ||
+        setweight(to_tsvector('english', COALESCE(description, '')), 'C')
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_youtube_comments_search ON youtube_comments USING GIN (search_vector);
+CREATE INDEX IF NOT EXISTS idx_dim_video_search ON dim_video USING GIN (search_vector);
+
+-- Trigram indexes serve substring searches (ILIKE '%keyword%'). pg_trgm ships with
+-- PostgreSQL contrib (and Supabase); without it these indexes are skipped.
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm') THEN
+        CREATE EXTENSION IF NOT EXISTS pg_trgm;
+        CREATE INDEX IF NOT EXISTS idx_youtube_comments_text_trgm ON youtube_comments USING GIN (text gin_trgm_ops);
+        CREATE INDEX IF NOT EXISTS idx_dim_video_title_trgm ON dim_video USING GIN (title gin_trgm_ops);
+    ELSE
+        RAISE NOTICE 'pg_trgm is not available; skipping trigram indexes';
+    END IF;
+END $$;
@@ -0,0 +1,199 @@
+import os
+import time
+import sqlite3
+import hashlib
+import logging
+import datetime
+import threading
+from typing import Any, Dict, List, Optional
+
+from src.extract.quota import QuotaExceededError, next_reset, quota_day
+
+logger = logging.getLogger(__name__)
+
+
+def key_id(api_key: str) -> str:
+    """
+    Short fingerprint identifying a key in the store and in logs (the key itself is never stored).
+    """
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:12]
+
+
+class KeyPool:
+    """
+    Pool of YouTube Data API keys (one per Google Cloud project) sharing the extraction load.
+
+    Each request is routed to the key with the most quota left today. A key the API
+    reports as out of quota is set aside until the next daily reset, and requests
+    fail over to the others; QuotaExceededError is raised only once every key is used up.
+
+    Units used and cooldowns live in a SQLite file, so a pool is shared by every
+    thread, process and container (on one host) pointing at the same path. Every
+    pick is one write transaction, so no two callers can spend the same headroom.
+    Without a path the pool is kept in memory for the current process.
+    """
+    def __init__(self, api_keys: List[str], path: Optional[str] = None, daily_limit: int = 10000):
+        """
+        Args:
+            api_keys: API keys, each from a separate project (keys of one project share its quota).
+            path: SQLite database file. Parent directories are created if needed.
+            daily_limit: Quota units available per key and day.
+        """
+        self.keys = {key_id(api_key): api_key for api_key in dict.fromkeys(api_keys) if api_key}
+        if not self.keys:
+            raise ValueError("At least one API key is required")
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.daily_limit = daily_limit
+
+        self._lock = threading.Lock()
+        # Waits for other processes' transactions instead of failing with "database is locked"
+        self._conn = sqlite3.connect(path or ":memory:", check_same_thread=False, isolation_level=None, timeout=30)
+        if path:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS key_usage (
+                key_id TEXT NOT NULL,
+                quota_day TEXT NOT NULL,
+                units_used INTEGER NOT NULL DEFAULT 0,
+                exhausted_until REAL,
+                updated_at REAL,
+                PRIMARY KEY (key_id, quota_day)
+            )
+            """
+        )
+
+    @classmethod
+    def from_env(cls, api_key: Optional[str] = None) -> "KeyPool":
+        """
+        Build a pool from YOUTUBE_API_KEYS (comma-separated) or YOUTUBE_API_KEY, stored at
+        YOUTUBE_KEY_POOL_PATH (in memory if unset), with YOUTUBE_DAILY_QUOTA units per key.
+
+        Raises:
+            ValueError: If no key is configured.
+        """
+        api_keys = [api_key] if api_key else [
+            value.strip() for value in (os.getenv("YOUTUBE_API_KEYS") or os.getenv("YOUTUBE_API_KEY") or "").split(",")
+        ]
+        if not any(api_keys):
+            raise ValueError("YouTube API key must be provided or set in environment variable "
+                             "YOUTUBE_API_KEYS (comma-separated) or YOUTUBE_API_KEY")
+        return cls(
+            api_keys,
+            path=os.getenv("YOUTUBE_KEY_POOL_PATH") or None,
+            daily_limit=int(os.getenv("YOUTUBE_DAILY_QUOTA", "10000"))
+        )
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _usage(self, day: str) -> List[tuple]:
+        """
+        Today's row of every key, created if missing. Caller holds the lock.
+        """
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO key_usage (key_id, quota_day) VALUES (?, ?)", [(kid, day) for kid in self.keys]
+        )
+        placeholders = ", ".join("?" for _ in self.keys)
+        return self._conn.execute(
+            f"SELECT key_id, units_used, exhausted_until FROM key_usage "
+            f"WHERE quota_day = ? AND key_id IN ({placeholders})",
+            [day, *self.keys]
+        ).fetchall()
+
+    def acquire(self, units: int = 1) -> str:
+        """
+        Reserve `units` on the available key with the most headroom and return that key.
+
+        Raises:
+            QuotaExceededError: If no key has `units` left today.
+        """
+        now = time.time()
+        day = quota_day(now).isoformat()
+        with self._lock:
+            # BEGIN IMMEDIATE takes the write lock up front, so the pick and the charge are atomic across processes
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                available = [
+                    (self.daily_limit - units_used, kid)
+                    for kid, units_used, exhausted_until in self._usage(day)
+                    if (exhausted_until is None or exhausted_until <= now) and units_used + units <= self.daily_limit
+                ]
+                if available:
+                    _, chosen = max(available)
+                    self._conn.execute(
+                        "UPDATE key_usage SET units_used = units_used + ?, updated_at = ? WHERE key_id = ? AND quota_day = ?",
+                        (units, now, chosen, day)
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        if not available:
+            raise QuotaExceededError(
+                f"All {len(self.keys)} API keys are out of quota until "
+                f"{datetime.datetime.fromtimestamp(next_reset(now), datetime.timezone.utc):%Y-%m-%d %H:%M} UTC"
+            )
+        return self.keys[chosen]
+
+    def mark_exhausted(self, api_key: str) -> None:
+        """
+        Set a key aside until the next daily reset (the API answered quotaExceeded).
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO key_usage (key_id, quota_day, exhausted_until, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (key_id, quota_day) DO UPDATE SET "
+                "exhausted_until = excluded.exhausted_until, updated_at = excluded.updated_at",
+                (key_id(api_key), quota_day(now).isoformat(), next_reset(now), now)
+            )
+        remaining = len(self.available())
+        logger.warning(f"API key {key_id(api_key)} is out of quota until the daily reset; "
+                       f"{remaining} of {len(self.keys)} keys left")
+
+    def available(self) -> List[str]:
+        """
+        IDs of the keys not set aside by a quotaExceeded response.
+        """
+        return [status["key_id"] for status in self.status() if not status["exhausted"]]
+
+    @property
+    def remaining(self) -> int:
+        """
+        Units left today across the available keys, as seen by every user of the pool.
+        """
+        return sum(status["remaining"] for status in self.status() if not status["exhausted"])
+
+    def status(self) -> List[Dict[str, Any]]:
+        """
+        Today's usage of every key.
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._usage(quota_day(now).isoformat())
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return [
+            {
+                "key_id": kid,
+                "units_used": units_used,
+                "remaining": max(0, self.daily_limit - units_used),
+                "exhausted": exhausted_until is not None and exhausted_until > now,
+            }
+            for kid, units_used, exhausted_until in sorted(rows)
+        ]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
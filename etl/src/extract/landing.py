@@ -0,0 +1,139 @@
+import os
+import json
+import gzip
+import uuid
+import socket
+import logging
+import datetime
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Files being written carry this suffix until they are closed, so readers never see partial files
+IN_PROGRESS_SUFFIX = ".inprogress"
+
+
+class RawLandingZone:
+    """
+    Appends every raw API response to gzip-compressed NDJSON files on local disk,
+    partitioned by snapshot date and endpoint:
+
+        <root>/date_id=2026-10-17/videos/part-20261017T060000-<host>-<pid>-<run>-00000.ndjson.gz
+
+    Each line holds the endpoint, the request parameters (without the API key), the
+    fetch time and the response body, so runs can be re-transformed later (see
+    src/replay.py) without calling the API again.
+    """
+    def __init__(self, root: str, rotate_records: int = 5000):
+        """
+        Args:
+            root: Directory of the landing zone.
+            rotate_records: Responses per file before a new part file is started.
+        """
+        self.root = root
+        self.rotate_records = rotate_records
+        self._lock = threading.Lock()
+        self._files: Dict[Tuple[datetime.date, str], Any] = {}
+        self._counts: Dict[Tuple[datetime.date, str], int] = {}
+        self._sequence = 0
+        # The start time and a random run ID keep names unique across restarts (a container's
+        # hostname and PID repeat), so a new run never replaces an earlier run's parts
+        started = datetime.datetime.now(datetime.timezone.utc)
+        self._prefix = f"part-{started:%Y%m%dT%H%M%S}-{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+    @classmethod
+    def from_env(cls) -> Optional["RawLandingZone"]:
+        """
+        Build a landing zone from RAW_LANDING_* env vars, or return None if RAW_LANDING_PATH is unset.
+        """
+        root = os.getenv("RAW_LANDING_PATH")
+        if not root:
+            return None
+        return cls(root, rotate_records=int(os.getenv("RAW_LANDING_ROTATE_RECORDS", "5000")))
+
+    def write(self, endpoint: str, params: Dict[str, Any], data: Dict[str, Any]) -> None:
+        """
+        Append one response under today's partition.
+        """
+        fetched_at = datetime.datetime.now(datetime.timezone.utc)
+        # Local fetch date, the date_id of a regular daily run
+        key = (datetime.date.today(), endpoint)
+        line = json.dumps({
+            "endpoint": endpoint,
+            "params": {name: value for name, value in params.items() if name != "key"},
+            "fetched_at": fetched_at.isoformat(),
+            "data": data,
+        }, separators=(",", ":"))
+
+        with self._lock:
+            f = self._files.get(key)
+            if f is None:
+                f = self._files[key] = self._open(*key)
+                self._counts[key] = 0
+            f.write(line + "\n")
+            self._counts[key] += 1
+            if self._counts[key] >= self.rotate_records:
+                self._close_file(key)
+
+    def close(self) -> None:
+        """
+        Close every open part file and publish it under its final name.
+        """
+        with self._lock:
+            for key in list(self._files):
+                self._close_file(key)
+
+    def _open(self, date_id: datetime.date, endpoint: str):
+        directory = os.path.join(self.root, f"date_id={date_id.isoformat()}", endpoint)
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{self._prefix}-{self._sequence:05d}.ndjson.gz")
+        self._sequence += 1
+        # "x" refuses to reuse an existing name instead of truncating it
+        f = gzip.open(path + IN_PROGRESS_SUFFIX, "xt", encoding="utf-8")
+        f.final_path = path
+        return f
+
+    def _close_file(self, key: Tuple[datetime.date, str]) -> None:
+        f = self._files.pop(key)
+        self._counts.pop(key, None)
+        f.close()
+        os.replace(f.final_path + IN_PROGRESS_SUFFIX, f.final_path)
+
+
+def landed_dates(
+    root: str,
+    since: Optional[datetime.date] = None,
+    until: Optional[datetime.date] = None
+) -> List[datetime.date]:
+    """
+    List the date partitions in the landing zone within [since, until], oldest first.
+    """
+    if not os.path.isdir(root):
+        return []
+    dates = []
+    for name in os.listdir(root):
+        if not name.startswith("date_id="):
+            continue
+        date_id = datetime.date.fromisoformat(name[len("date_id="):])
+        if (since is None or date_id >= since) and (until is None or date_id <= until):
+            dates.append(date_id)
+    return sorted(dates)
+
+
+def iter_landed_responses(root: str, date_id: datetime.date, endpoint: str) -> Iterator[Dict[str, Any]]:
+    """
+    Stream the landed responses of one endpoint and date, one record at a time.
+
+    Files still being written (or left behind by a crashed run) are skipped.
+    """
+    directory = os.path.join(root, f"date_id={date_id.isoformat()}", endpoint)
+    if not os.path.isdir(directory):
+        return
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith(".ndjson.gz"):
+            continue
+        with gzip.open(os.path.join(directory, name), "rt", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
@@ -0,0 +1,131 @@
+import time
+import datetime
+import threading
+import logging
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Quota cost (units) of one call to each YouTube Data API v3 list endpoint.
+# See https://developers.google.com/youtube/v3/determine_quota_cost
+ENDPOINT_COSTS = {
+    "channels": 1,
+    "videos": 1,
+    "playlistItems": 1,
+    "commentThreads": 1,
+    "search": 100,
+}
+
+
+# Daily quotas reset at midnight Pacific Time. A fixed UTC-8 offset is used, so during
+# daylight saving time the budget is renewed one hour after Google does, never before.
+QUOTA_RESET_TZ = datetime.timezone(datetime.timedelta(hours=-8))
+
+
+def quota_day(now: Optional[float] = None) -> datetime.date:
+    """
+    The quota day a timestamp falls in.
+    """
+    return datetime.datetime.fromtimestamp(now if now is not None else time.time(), QUOTA_RESET_TZ).date()
+
+
+def next_reset(now: Optional[float] = None) -> float:
+    """
+    Timestamp of the next daily quota reset.
+    """
+    day = quota_day(now) + datetime.timedelta(days=1)
+    return datetime.datetime.combine(day, datetime.time(), QUOTA_RESET_TZ).timestamp()
+
+
+class QuotaExceededError(Exception):
+    """
+    Raised when a request would exceed the daily quota budget.
+    """
+
+
+class QuotaTracker:
+    """
+    Thread-safe counter of quota units spent per endpoint during a run.
+
+    High-priority calls (channels, videos, playlists) may use the whole daily
+    budget. Low-priority calls (comments) stop being scheduled once only the
+    reserved headroom is left, so core metrics are never starved by comments.
+
+    The budget is renewed at the daily quota reset (midnight Pacific Time), so a
+    long-running process (e.g. a worker) gets a fresh budget each quota day; the
+    per-endpoint counts keep covering the whole run.
+    """
+    def __init__(self, daily_limit: int = 10000, low_priority_reserve: int = 1000):
+        """
+        Args:
+            daily_limit: Total quota units available for the run.
+            low_priority_reserve: Units kept back from low-priority calls.
+        """
+        self.daily_limit = daily_limit
+        self.low_priority_reserve = low_priority_reserve
+        self.units_by_endpoint: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        # Units spent in the current quota day, checked against the budget
+        self._day = quota_day()
+        self._day_used = 0
+
+    @staticmethod
+    def cost(endpoint: str) -> int:
+        return ENDPOINT_COSTS.get(endpoint, 1)
+
+    @property
+    def used(self) -> int:
+        with self._lock:
+            return sum(self.units_by_endpoint.values())
+
+    @property
+    def remaining(self) -> int:
+        """
+        Units left in today's budget.
+        """
+        with self._lock:
+            return max(0, self.daily_limit - self._used_today())
+
+    def _used_today(self) -> int:
+        """
+        Units spent in the current quota day, starting over at the reset. Caller holds the lock.
+        """
+        day = quota_day()
+        if day != self._day:
+            logger.info(f"Quota day rolled over to {day}; budget renewed ({self._day_used} units used on {self._day})")
+            self._day, self._day_used = day, 0
+        return self._day_used
+
+    def can_spend(self, endpoint: str, low_priority: bool = False) -> bool:
+        """
+        Check whether a call to `endpoint` fits in the remaining budget.
+        """
+        limit = self.daily_limit - (self.low_priority_reserve if low_priority else 0)
+        with self._lock:
+            return self._used_today() + self.cost(endpoint) <= limit
+
+    def spend(self, endpoint: str, low_priority: bool = False) -> None:
+        """
+        Record one call to `endpoint`, raising if it does not fit in the budget.
+
+        Raises:
+            QuotaExceededError: If the call would exceed the (priority-adjusted) budget.
+        """
+        cost = self.cost(endpoint)
+        limit = self.daily_limit - (self.low_priority_reserve if low_priority else 0)
+
+        with self._lock:
+            used = self._used_today()
+            if used + cost > limit:
+                raise QuotaExceededError(
+                    f"Quota budget reached for {endpoint}: {used}/{self.daily_limit} units used today"
+                )
+            self._day_used += cost
+            self.units_by_endpoint[endpoint] = self.units_by_endpoint.get(endpoint, 0) + cost
+
+    def summary(self) -> Dict[str, int]:
+        """
+        Return a copy of the per-endpoint unit counts.
+        """
+        with self._lock:
+            return dict(self.units_by_endpoint)
@@ -0,0 +1,209 @@
+import os
+import json
+import time
+import zlib
+import sqlite3
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Dict, Optional, Any
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedResponse:
+    """
+    A cached API response body and its ETag.
+    """
+    data: Dict[str, Any]
+    etag: Optional[str]
+    size: int
+    fresh: bool
+
+
+class ResponseCache:
+    """
+    Persistent SQLite cache of YouTube API responses.
+
+    Entries younger than `fresh_ttl` are served without any request. Older
+    entries are revalidated with If-None-Match, and entries older than
+    `max_age` are dropped. When the cache grows past `max_bytes`, the least
+    recently used entries are evicted.
+    """
+    def __init__(
+        self,
+        path: str,
+        fresh_ttl: float = 6 * 3600,
+        max_age: float = 7 * 24 * 3600,
+        max_bytes: int = 256 * 1024 * 1024
+    ):
+        """
+        Args:
+            path: SQLite database file. Parent directories are created if needed.
+            fresh_ttl: Seconds during which an entry is used without revalidation.
+            max_age: Seconds after which an entry is evicted.
+            max_bytes: Upper bound on the total size of stored (compressed) bodies.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.fresh_ttl = fresh_ttl
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.bytes_saved = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                cache_key TEXT PRIMARY KEY,
+                endpoint TEXT NOT NULL,
+                etag TEXT,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses(last_access)")
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    @classmethod
+    def from_env(cls) -> Optional["ResponseCache"]:
+        """
+        Build a cache from YOUTUBE_CACHE_* env vars, or return None if YOUTUBE_CACHE_PATH is unset.
+        """
+        path = os.getenv("YOUTUBE_CACHE_PATH")
+        if not path:
+            return None
+        return cls(
+            path,
+            fresh_ttl=float(os.getenv("YOUTUBE_CACHE_FRESH_TTL", str(6 * 3600))),
+            max_age=float(os.getenv("YOUTUBE_CACHE_MAX_AGE", str(7 * 24 * 3600))),
+            max_bytes=int(os.getenv("YOUTUBE_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+        )
+
+    @staticmethod
+    def make_key(endpoint: str, params: Dict[str, Any]) -> str:
+        """
+        Build a cache key from the endpoint and its parameters (the API key is ignored).
+        """
+        relevant = {k: str(v) for k, v in params.items() if k != "key"}
+        raw = endpoint + "?" + json.dumps(relevant, sort_keys=True)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, endpoint: str, params: Dict[str, Any]) -> Optional[CachedResponse]:
+        """
+        Look up a response. Returns None (and counts a miss) if nothing usable is cached.
+        """
+        key = self.make_key(endpoint, params)
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, body, size, stored_at FROM responses WHERE cache_key = ?", (key,)
+            ).fetchone()
+
+            if row is None or now - row[3] > self.max_age:
+                if row is not None:
+                    self._delete(key, row[2])
+                self.misses += 1
+                return None
+
+            etag, body, size, stored_at = row
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE cache_key = ?", (now, key))
+
+            fresh = now - stored_at <= self.fresh_ttl
+            if fresh:
+                self.hits += 1
+                self.bytes_saved += size
+
+        data = json.loads(zlib.decompress(body))
+        return CachedResponse(data=data, etag=etag, size=size, fresh=fresh)
+
+    def put(self, endpoint: str, params: Dict[str, Any], data: Dict[str, Any], etag: Optional[str]) -> None:
+        """
+        Store a response, evicting expired and least recently used entries as needed.
+        """
+        key = self.make_key(endpoint, params)
+        body = zlib.compress(json.dumps(data).encode("utf-8"))
+        size = len(body)
+        if size > self.max_bytes:
+            return
+
+        now = time.time()
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM responses WHERE cache_key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (cache_key, endpoint, etag, body, size, stored_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, endpoint, etag, body, size, now, now)
+            )
+            self._total_bytes += size - (old[0] if old else 0)
+            self._evict(now)
+
+    def mark_revalidated(self, endpoint: str, params: Dict[str, Any], cached: CachedResponse) -> None:
+        """
+        Record a 304 Not Modified: the entry is fresh again and its body did not need re-downloading.
+        """
+        key = self.make_key(endpoint, params)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE responses SET stored_at = ?, last_access = ? WHERE cache_key = ?", (now, now, key)
+            )
+            self.revalidated += 1
+            self.bytes_saved += cached.size
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return hit/miss counters and the current cache size.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "revalidated": self.revalidated,
+                "misses": self.misses,
+                "bytes_saved": self.bytes_saved,
+                "bytes_stored": self._total_bytes,
+            }
+
+    def _delete(self, key: str, size: int) -> None:
+        self._conn.execute("DELETE FROM responses WHERE cache_key = ?", (key,))
+        self._total_bytes -= size
+
+    def _evict(self, now: float) -> None:
+        """
+        Drop expired entries, then least recently used ones until under max_bytes. Caller holds the lock.
+        """
+        expired = self._conn.execute(
+            "DELETE FROM responses WHERE stored_at < ? RETURNING size", (now - self.max_age,)
+        ).fetchall()
+        self._total_bytes -= sum(row[0] for row in expired)
+
+        while self._total_bytes > self.max_bytes:
+            victims = self._conn.execute(
+                "SELECT cache_key, size FROM responses ORDER BY last_access LIMIT 100"
+            ).fetchall()
+            if not victims:
+                self._total_bytes = 0
+                break
+            for key, size in victims:
+                self._delete(key, size)
+                if self._total_bytes <= self.max_bytes:
+                    break
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
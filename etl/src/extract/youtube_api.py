@@ -1,71 +1,331 @@
 import os
+import time
+import random
 import logging
+import threading
 import requests
-from typing import List, Dict, Optional, Any
-from datetime import datetime
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from typing import Callable, Iterator, List, Dict, Optional, Any, Tuple, TypeVar
+from datetime import datetime, timezone
+
+from src.extract.quota import QuotaTracker, QuotaExceededError
+from src.extract.key_pool import KeyPool
+from src.extract.response_cache import ResponseCache
+from src.extract.landing import RawLandingZone
+from src.metrics import recorder
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+R = TypeVar("R")
+
+# The API accepts at most 50 comma-separated IDs per channels/videos call
+MAX_IDS_PER_REQUEST = 50
+
+# Responses worth retrying: rate limiting and transient server errors
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+# 403 reasons that are transient (per-user/per-second limits), unlike quotaExceeded
+RETRYABLE_403_REASONS = {"rateLimitExceeded", "userRateLimitExceeded"}
+
+
+class RateLimiter:
+    """
+    Thread-safe limiter that spaces out calls to at most `rate` per second.
+    """
+    def __init__(self, rate: Optional[float] = None):
+        """
+        Args:
+            rate: Maximum calls per second. None or <= 0 disables limiting.
+        """
+        self.interval = 1.0 / rate if rate and rate > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = time.monotonic()
+
+    def acquire(self) -> None:
+        """
+        Block until the caller is allowed to make the next call.
+        """
+        if not self.interval:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.interval
+
+        if wait > 0:
+            time.sleep(wait)
+
+
+def chunked(items: List[T], size: int) -> List[List[T]]:
+    """
+    Split a list into consecutive chunks of at most `size` elements.
+    """
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def _error_reason(response: requests.Response) -> Optional[str]:
+    """
+    Extract the first error reason (e.g. 'quotaExceeded') from an API error response.
+    """
+    try:
+        errors = response.json().get("error", {}).get("errors", [])
+    except ValueError:
+        return None
+    return errors[0].get("reason") if errors else None
+
+
+def _retry_after_seconds(response: requests.Response) -> Optional[float]:
+    """
+    Parse a Retry-After header given either as seconds or as an HTTP date.
+    """
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
 class YouTubeAPI:
     """
     Client for interacting with the YouTube Data API v3.
     """
     BASE_URL = "https://www.googleapis.com/youtube/v3"
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        requests_per_second: Optional[float] = None,
+        max_retries: Optional[int] = None,
+        quota: Optional[QuotaTracker] = None,
+        cache: Optional[ResponseCache] = None,
+        landing: Optional[RawLandingZone] = None,
+        keys: Optional[KeyPool] = None
+    ):
         """
         Initialize the YouTube API client.
         
         Args:
-            api_key: YouTube Data API key. If not provided, reads from YOUTUBE_API_KEY env var.
+            api_key: A single YouTube Data API key. If neither this nor `keys` is given, the
+                keys are read from YOUTUBE_API_KEYS (comma-separated) or YOUTUBE_API_KEY.
+            max_workers: Maximum number of concurrent requests. Defaults to YOUTUBE_MAX_WORKERS env var (or 8).
+                Use 1 to run every request sequentially.
+            requests_per_second: Cap on request rate across all workers. Defaults to
+                YOUTUBE_REQUESTS_PER_SECOND env var (or 10). 0 disables the cap.
+            max_retries: Retries for 429/5xx responses and network errors. Defaults to
+                YOUTUBE_MAX_RETRIES env var (or 5).
+            quota: Quota tracker to charge requests to. Defaults to one with YOUTUBE_DAILY_QUOTA
+                (10000) units per key and YOUTUBE_LOW_PRIORITY_RESERVE (1000).
+            cache: Persistent response cache. Defaults to one at YOUTUBE_CACHE_PATH, or no
+                caching if that env var is unset.
+            landing: Raw landing zone every response is archived to. Defaults to one at
+                RAW_LANDING_PATH, or none if that env var is unset.
+            keys: Pool the API key of each request is taken from. Defaults to one built
+                from `api_key` or the env vars (see KeyPool.from_env).
         """
-        self.api_key = api_key or os.getenv("YOUTUBE_API_KEY")
-        if not self.api_key:
-            raise ValueError("YouTube API key must be provided or set in environment variable YOUTUBE_API_KEY")
+        self.keys = keys or KeyPool.from_env(api_key)
+        # Overridable so benchmarks can point the client at a local stand-in server
+        self.base_url = (os.getenv("YOUTUBE_API_BASE_URL") or self.BASE_URL).rstrip("/")
+
+        if max_workers is None:
+            max_workers = int(os.getenv("YOUTUBE_MAX_WORKERS", "8"))
+        if requests_per_second is None:
+            requests_per_second = float(os.getenv("YOUTUBE_REQUESTS_PER_SECOND", "10"))
 
-    def _make_request(self, endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        self.max_workers = max(1, max_workers)
+        self.rate_limiter = RateLimiter(requests_per_second)
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv("YOUTUBE_MAX_RETRIES", "5"))
+        self.backoff_base = float(os.getenv("YOUTUBE_BACKOFF_BASE", "0.5"))
+        self.backoff_max = float(os.getenv("YOUTUBE_BACKOFF_MAX", "60"))
+        self.timeout = float(os.getenv("YOUTUBE_REQUEST_TIMEOUT", "30"))
+        self.quota = quota or QuotaTracker(
+            daily_limit=int(os.getenv("YOUTUBE_DAILY_QUOTA", "10000")) * len(self.keys),
+            low_priority_reserve=int(os.getenv("YOUTUBE_LOW_PRIORITY_RESERVE", "1000"))
+        )
+        self.retry_count = 0
+        self.cache = cache if cache is not None else ResponseCache.from_env()
+        self.landing = landing if landing is not None else RawLandingZone.from_env()
+
+        # Uploads playlist ID per channel, filled by get_channel_details
+        self._uploads_playlists: Dict[str, str] = {}
+
+        # One pooled keep-alive session shared by all workers
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _backoff_delay(self, attempt: int, response: Optional[requests.Response] = None) -> float:
+        """
+        Delay before retry `attempt`: Retry-After if the server sent one, else full-jitter exponential backoff.
+        """
+        if response is not None:
+            retry_after = _retry_after_seconds(response)
+            if retry_after is not None:
+                return min(retry_after, self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _make_request(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        low_priority: bool = False,
+        revalidate: bool = False
+    ) -> Dict[str, Any]:
         """
         Helper method to make API requests with error handling.
+        
+        Transient failures (429, 5xx, per-second rate limits, network errors) are retried
+        with backoff. Every attempt is charged to the quota tracker and sent with the
+        pool's key with the most headroom; a key the API reports as out of quota is set
+        aside and the request is sent again with the next one.
+        
+        Args:
+            endpoint: API resource name, e.g. 'videos'.
+            params: Query parameters (the API key is added here).
+            low_priority: If True, the call is refused once only the reserved quota remains.
+            revalidate: If True, a fresh cache entry is revalidated with its ETag instead of
+                served directly (for resources known to have changed).
+            
+        Raises:
+            QuotaExceededError: If the quota budget is used up or every key is out of quota.
+            requests.exceptions.RequestException: If the request still fails after all retries.
         """
-        params["key"] = self.api_key
-        url = f"{self.BASE_URL}/{endpoint}"
+        url = f"{self.base_url}/{endpoint}"
         
-        try:
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            logger.error(f"API request failed for {endpoint}: {str(e)}")
-            if response is not None:
-                logger.error(f"Response: {response.text}")
-            raise
+        with recorder.timed(f"api.{endpoint}") as counters:
+            # Serve fresh cache entries directly; revalidate stale ones with their ETag
+            cached = self.cache.get(endpoint, params) if self.cache else None
+            if cached and cached.fresh and not revalidate:
+                counters["cache_hits"] = 1
+                return self._land(endpoint, params, cached.data)
+            headers = {"If-None-Match": cached.etag} if cached and cached.etag else None
+            
+            attempt = 0
+            while True:
+                # Take a key before charging the run's budget, so a request that is never sent
+                # (every key out of quota) is not counted. A call over budget is refused before
+                # it reserves pool units (spend() raises with the budget details).
+                if not self.quota.can_spend(endpoint, low_priority=low_priority):
+                    self.quota.spend(endpoint, low_priority=low_priority)
+                params["key"] = self.keys.acquire(self.quota.cost(endpoint))
+                self.quota.spend(endpoint, low_priority=low_priority)
+                counters["quota_units"] = counters.get("quota_units", 0) + self.quota.cost(endpoint)
+                self.rate_limiter.acquire()
+                response = None
+                try:
+                    response = self.session.get(url, params=params, headers=headers, timeout=self.timeout)
+                    counters["bytes"] = counters.get("bytes", 0) + len(response.content)
+                    if response.status_code == 304 and cached:
+                        self.cache.mark_revalidated(endpoint, params, cached)
+                        counters["cache_hits"] = 1
+                        return self._land(endpoint, params, cached.data)
+                    if response.status_code == 403 and _error_reason(response) == "quotaExceeded":
+                        # Fail over: the next acquire() skips this key (and raises once none are left)
+                        self.keys.mark_exhausted(params["key"])
+                        continue
+                    response.raise_for_status()
+                    data = response.json()
+                    counters["rows_out"] = len(data.get("items", []))
+                    if self.cache:
+                        self.cache.put(endpoint, params, data, response.headers.get("ETag") or data.get("etag"))
+                    return self._land(endpoint, params, data)
+                except (requests.exceptions.ConnectionError, requests.exceptions.Timeout, requests.exceptions.HTTPError) as e:
+                    retryable = response is None or response.status_code in RETRYABLE_STATUS_CODES or (
+                        response.status_code == 403 and _error_reason(response) in RETRYABLE_403_REASONS
+                    )
+                    if not retryable or attempt >= self.max_retries:
+                        logger.error(f"API request failed for {endpoint}: {str(e)}")
+                        if response is not None:
+                            logger.error(f"Response: {response.text}")
+                        raise
+
+                    delay = self._backoff_delay(attempt, response)
+                    attempt += 1
+                    self.retry_count += 1
+                    counters["retries"] = attempt
+                    logger.warning(f"Retrying {endpoint} in {delay:.1f}s (attempt {attempt}/{self.max_retries}): {str(e)}")
+                    time.sleep(delay)
+
+    def _land(self, endpoint: str, params: Dict[str, Any], data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Archive a response in the raw landing zone (if configured) and return it.
+        """
+        if self.landing:
+            self.landing.write(endpoint, params, data)
+        return data
+
+    def _map_concurrent(self, func: Callable[[T], R], items: List[T]) -> List[R]:
+        """
+        Apply `func` to every item using the bounded worker pool.
+        
+        Results are returned in the same order as `items`.
+        """
+        if self.max_workers == 1 or len(items) <= 1:
+            return [func(item) for item in items]
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(items))) as executor:
+            return list(executor.map(func, items))
 
     def get_channel_details(self, channel_ids: List[str]) -> List[Dict[str, Any]]:
         """
         Fetch details for a list of channel IDs.
         
+        Duplicate IDs are dropped and the rest are fetched in concurrent batches of 50
+        (the API limit). Each channel's uploads playlist ID is cached for the run.
+        
         Args:
             channel_ids: List of YouTube channel IDs.
             
         Returns:
             List of channel resource objects.
         """
-        if not channel_ids:
+        unique_ids = list(dict.fromkeys(channel_ids))
+        if not unique_ids:
             return []
 
-        # Join IDs with commas (API limit is usually 50 ids per request)
-        ids_string = ",".join(channel_ids)
-        
+        batches = self._map_concurrent(self._get_channel_batch, chunked(unique_ids, MAX_IDS_PER_REQUEST))
+        channels = [channel for batch in batches for channel in batch]
+
+        for channel in channels:
+            uploads = channel.get("contentDetails", {}).get("relatedPlaylists", {}).get("uploads")
+            if uploads:
+                self._uploads_playlists[channel["id"]] = uploads
+
+        return channels
+
+    def _get_channel_batch(self, channel_ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        Fetch details for a list of up to 50 channel IDs.
+        """
         params = {
             "part": "snippet,statistics,contentDetails",
-            "id": ids_string
+            "id": ",".join(channel_ids)
         }
         
         data = self._make_request("channels", params)
         return data.get("items", [])
 
+    def get_uploads_playlist_id(self, channel_id: str) -> Optional[str]:
+        """
+        Return the uploads playlist ID of a channel, fetching it only if not already cached.
+        """
+        if channel_id not in self._uploads_playlists:
+            self.get_channel_details([channel_id])
+        return self._uploads_playlists.get(channel_id)
+
     def get_videos(self, channel_id: str, limit: int = 50) -> List[Dict[str, Any]]:
         """
         Fetch videos for a specific channel using the upload playlist.
@@ -77,53 +337,160 @@ class YouTubeAPI:
         Returns:
             List of video resource objects (with snippet and statistics).
         """
-        # 1. Get the uploads playlist ID
-        channel_data = self.get_channel_details([channel_id])
-        if not channel_data:
+        # 1. Get the uploads playlist ID (cached by an earlier get_channel_details call)
+        uploads_playlist_id = self.get_uploads_playlist_id(channel_id)
+        if not uploads_playlist_id:
             logger.warning(f"Channel {channel_id} not found.")
             return []
-            
-        uploads_playlist_id = channel_data[0]["contentDetails"]["relatedPlaylists"]["uploads"]
         
-        videos = []
-        next_page_token = None
+        # 2. Collect video IDs from the playlist
+        video_ids = []
+        for items in self.iter_playlist_pages(uploads_playlist_id, page_size=min(50, limit)):
+            video_ids.extend(item["contentDetails"]["videoId"] for item in items)
+            if len(video_ids) >= limit:
+                break
         
-        # 2. Fetch videos from the playlist
-        while len(videos) < limit:
-            request_limit = min(50, limit - len(videos))
-            
+        # 3. playlistItems only give snippet and contentDetails, so fetch the
+        # detailed video objects (statistics, duration) in concurrent batches.
+        videos = self.get_video_statistics(video_ids[:limit])
+        return videos[:limit]
+
+    def iter_playlist_pages(self, playlist_id: str, page_size: int = 50) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Yield the items of a playlist one page at a time (pages must be walked sequentially).
+        
+        Args:
+            playlist_id: The ID of the playlist.
+            page_size: Items per page (max 50).
+        """
+        next_page_token = None
+        while True:
             params = {
                 "part": "snippet,contentDetails",
-                "playlistId": uploads_playlist_id,
-                "maxResults": request_limit,
+                "playlistId": playlist_id,
+                "maxResults": page_size,
             }
             if next_page_token:
                 params["pageToken"] = next_page_token
                 
             data = self._make_request("playlistItems", params)
             items = data.get("items", [])
-            
             if not items:
-                break
-                
-            # We need video IDs to get statistics (views, likes, etc.) as playlistItems 
-            # only give snippet and contentDetails.
-            video_ids = [item["contentDetails"]["videoId"] for item in items]
-            video_stats = self._get_video_statistics(video_ids)
+                return
             
-            # Merge stats into video objects (simplistic merge)
-            # Or just return the detailed video objects directly
-            videos.extend(video_stats)
+            yield items
             
             next_page_token = data.get("nextPageToken")
             if not next_page_token:
-                break
-                
-        return videos[:limit]
+                return
+
+    def get_new_video_ids(
+        self,
+        channel_id: str,
+        last_video_id: Optional[str] = None,
+        last_published_at: Optional[datetime] = None,
+        limit: Optional[int] = None
+    ) -> Tuple[List[str], Optional[Dict[str, Any]]]:
+        """
+        List uploads newer than a channel's high-water mark.
+        
+        The uploads playlist is newest first, so paging stops at the first item that is
+        the last seen video or was published at or before the last seen publish time.
+        Without a high-water mark the whole playlist (up to `limit`) is walked.
+        
+        Args:
+            channel_id: The ID of the channel.
+            last_video_id: Newest video ID seen on a previous run.
+            last_published_at: Publish time of that video.
+            limit: Optional cap on the number of IDs returned.
+            
+        Returns:
+            Tuple of (new video IDs newest first, new high-water mark or None if nothing new).
+            The high-water mark is a dict with 'video_id' and 'published_at'.
+        """
+        uploads_playlist_id = self.get_uploads_playlist_id(channel_id)
+        if not uploads_playlist_id:
+            logger.warning(f"Channel {channel_id} not found.")
+            return [], None
+
+        new_ids = []
+        watermark = None
+        for items in self.iter_playlist_pages(uploads_playlist_id):
+            for item in items:
+                details = item.get("contentDetails", {})
+                video_id = details.get("videoId")
+                published = details.get("videoPublishedAt")
+                published_at = datetime.fromisoformat(published) if published else None
+
+                if video_id == last_video_id or (
+                    last_published_at and published_at and published_at <= last_published_at
+                ):
+                    return new_ids, watermark
+
+                new_ids.append(video_id)
+                if published_at and (watermark is None or published_at > watermark["published_at"]):
+                    watermark = {"video_id": video_id, "published_at": published_at}
+
+                if limit and len(new_ids) >= limit:
+                    return new_ids, watermark
+
+        return new_ids, watermark
+
+    def get_video_statistics(self, video_ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        Fetch detailed statistics for any number of video IDs.
+        
+        IDs are split into batches of 50 that are fetched concurrently.
+        
+        Args:
+            video_ids: List of YouTube video IDs.
+            
+        Returns:
+            List of video resource objects, in the same order as the batches were requested.
+        """
+        batches = self._map_concurrent(self._get_video_statistics, chunked(video_ids, MAX_IDS_PER_REQUEST))
+        return [video for batch in batches for video in batch]
+
+    def iter_video_statistics(self, video_ids: List[str]) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Yield video resource objects one 50-ID batch at a time.
+        
+        Up to `max_workers` batches are fetched concurrently per window, so memory is
+        bounded by the window size rather than the number of IDs.
+        """
+        yield from self.iter_video_batches(chunked(video_ids, MAX_IDS_PER_REQUEST))
+
+    def iter_video_batches(self, batches: List[List[str]]) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Yield the video resource objects of each pre-built batch (at most 50 IDs each), in order.
+        
+        Lets callers such as the refresh scheduler decide which IDs share a request.
+        """
+        for window in chunked(batches, self.max_workers):
+            yield from self._map_concurrent(self._get_video_statistics, window)
+
+    def iter_videos(self, channel_id: str, limit: int = 50) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Yield a channel's newest videos (with statistics) one playlist page at a time.
+        
+        Streaming counterpart of get_videos.
+        """
+        uploads_playlist_id = self.get_uploads_playlist_id(channel_id)
+        if not uploads_playlist_id:
+            logger.warning(f"Channel {channel_id} not found.")
+            return
+        
+        remaining = limit
+        for items in self.iter_playlist_pages(uploads_playlist_id, page_size=min(50, limit)):
+            video_ids = [item["contentDetails"]["videoId"] for item in items][:remaining]
+            yield self._get_video_statistics(video_ids)
+            remaining -= len(video_ids)
+            if remaining <= 0:
+                return
 
     def _get_video_statistics(self, video_ids: List[str]) -> List[Dict[str, Any]]:
         """
-        Fetch detailed statistics for a list of video IDs.
+        Fetch detailed statistics for a list of up to 50 video IDs.
         """
         if not video_ids:
             return []
@@ -137,21 +504,96 @@ class YouTubeAPI:
         data = self._make_request("videos", params)
         return data.get("items", [])
 
-    def get_video_comments(self, video_id: str, limit: int = 20) -> List[Dict[str, Any]]:
+    def get_new_comments(
+        self,
+        video_id: str,
+        since: Optional[datetime] = None,
+        max_pages: int = 0,
+        page_token: Optional[str] = None
+    ) -> Optional[Tuple[List[Dict[str, Any]], Optional[str]]]:
         """
-        Fetch top comments for a video.
+        Fetch a video's comment threads published at or after `since`, newest first.
+        
+        Pages through commentThreads in time order and stops at the first page that
+        reaches `since`, so a video whose comments are already stored costs one call.
+        
+        Args:
+            video_id: YouTube video ID.
+            since: Newest published_at already stored for the video. None fetches every thread.
+            max_pages: Stop after this many pages (0 for no limit).
+            page_token: Continue an earlier sync that stopped at `max_pages` from this page.
+                If the API no longer accepts it, the sync starts over from the newest page.
+            
+        Returns:
+            The new comment thread objects and, if `max_pages` stopped the sync before it
+            reached `since`, the page token to resume from (None once complete); or None if
+            the comments could not be fetched (disabled, quota reserve reached, or a request failure).
         """
         params = {
             "part": "snippet",
             "videoId": video_id,
-            "maxResults": min(limit, 100),
+            "maxResults": 100,
             "textFormat": "plainText",
-            "order": "relevance"
+            "order": "time"
         }
-        
+        if page_token:
+            params["pageToken"] = page_token
+        threads: List[Dict[str, Any]] = []
+        pages = 0
         try:
-            data = self._make_request("commentThreads", params)
-            return data.get("items", [])
+            while True:
+                data = self._make_request("commentThreads", params, low_priority=True, revalidate=True)
+                pages += 1
+                for item in data.get("items", []):
+                    published = item["snippet"]["topLevelComment"]["snippet"].get("publishedAt")
+                    # Comments at exactly `since` are re-fetched: others may share that timestamp
+                    if since and published and datetime.fromisoformat(published) < since:
+                        return threads, None
+                    threads.append(item)
+
+                next_page_token = data.get("nextPageToken")
+                if not next_page_token:
+                    return threads, None
+                if max_pages and pages >= max_pages:
+                    logger.info(f"Comment sync of video {video_id} paused after {pages} pages")
+                    return threads, next_page_token
+                params["pageToken"] = next_page_token
+        except QuotaExceededError as e:
+            logger.debug(f"Skipping comments for video {video_id}: {e}")
+            return None
+        except requests.exceptions.HTTPError as e:
+            if page_token and pages == 0 and e.response is not None and e.response.status_code == 400:
+                logger.info(f"Resume token of video {video_id} was rejected; syncing its comments from the newest")
+                return self.get_new_comments(video_id, since, max_pages)
+            logger.warning(f"Could not fetch comments for video {video_id}: {e}")
+            return None
         except Exception as e:
             logger.warning(f"Could not fetch comments for video {video_id}: {e}")
-            return []
+            return None
+
+    def get_new_comments_for_videos(
+        self,
+        since_by_video: Dict[str, Optional[datetime]],
+        max_pages: int = 0,
+        page_tokens: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Optional[Tuple[List[Dict[str, Any]], Optional[str]]]]:
+        """
+        Fetch the new comment threads of several videos concurrently.
+        
+        Args:
+            since_by_video: Mapping of video ID to its newest stored comment time (or None).
+            max_pages: Page limit per video (0 for no limit).
+            page_tokens: Mapping of video ID to the page token its paused sync resumes from.
+            
+        Returns:
+            Mapping of video ID to its new threads and resume token (same shape as get_new_comments).
+        """
+        video_ids = list(since_by_video)
+        page_tokens = page_tokens or {}
+        results = self._map_concurrent(
+            lambda video_id: self.get_new_comments(
+                video_id, since_by_video[video_id], max_pages, page_tokens.get(video_id)
+            ),
+            video_ids
+        )
+        return dict(zip(video_ids, results))
@@ -0,0 +1,197 @@
+import os
+import logging
+import datetime
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# Job states in pipeline_jobs
+PENDING, RUNNING, DONE, FAILED = "pending", "running", "done", "failed"
+
+
+@dataclass
+class Job:
+    job_id: int
+    date_id: datetime.date
+    channel_id: str
+    attempts: int
+
+
+class JobQueue:
+    """
+    Per-channel work queue in the pipeline_jobs table.
+
+    A coordinator enqueues one job per channel and date_id; any number of workers
+    claim jobs with SELECT ... FOR UPDATE SKIP LOCKED, so concurrent claims never
+    block on or return the same job. A claimed job is leased: if its worker dies
+    and the lease expires, another worker reclaims it, until `max_attempts` claims
+    have been made and the job is marked failed.
+    """
+    def __init__(self, engine: Engine, lease_seconds: Optional[int] = None, max_attempts: Optional[int] = None):
+        """
+        Args:
+            engine: SQLAlchemy engine of the pipeline database.
+            lease_seconds: How long a claim is held without a heartbeat. Defaults to
+                JOB_LEASE_SECONDS env var (or 600).
+            max_attempts: Claims allowed per job before it is marked failed. Defaults to
+                JOB_MAX_ATTEMPTS env var (or 3).
+        """
+        self.engine = engine
+        self.lease_seconds = lease_seconds or int(os.getenv("JOB_LEASE_SECONDS", "600"))
+        self.max_attempts = max_attempts or int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+
+    def enqueue(self, date_id: datetime.date, channel_ids: List[str], retry_failed: bool = False) -> int:
+        """
+        Add a pending job for every channel that has none for `date_id` yet.
+
+        Args:
+            date_id: Snapshot date to process.
+            channel_ids: Channels to enqueue.
+            retry_failed: Also reset that date's failed jobs to pending with fresh attempts.
+
+        Returns:
+            Number of jobs added or reset.
+        """
+        with self.engine.begin() as conn:
+            added = conn.execute(
+                text(
+                    "INSERT INTO pipeline_jobs (date_id, channel_id) "
+                    "SELECT :date_id, channel_id FROM unnest(CAST(:channel_ids AS TEXT[])) AS channel_id "
+                    "ON CONFLICT (date_id, channel_id) DO NOTHING"
+                ),
+                {"date_id": date_id, "channel_ids": list(dict.fromkeys(channel_ids))}
+            ).rowcount
+            if retry_failed:
+                added += conn.execute(
+                    text(
+                        "UPDATE pipeline_jobs SET status = :pending, attempts = 0, last_error = NULL, "
+                        "updated_at = now() WHERE date_id = :date_id AND status = :failed"
+                    ),
+                    {"date_id": date_id, "pending": PENDING, "failed": FAILED}
+                ).rowcount
+        logger.info(f"Enqueued {added} jobs for {date_id}")
+        return added
+
+    def claim(self, worker_id: str, limit: int = 1, date_id: Optional[datetime.date] = None) -> List[Job]:
+        """
+        Claim up to `limit` pending (or lease-expired) jobs for `worker_id`, oldest date first.
+        """
+        self._fail_exhausted()
+        date_filter = "AND date_id = :date_id" if date_id else ""
+        with self.engine.begin() as conn:
+            rows = conn.execute(
+                text(
+                    "UPDATE pipeline_jobs SET status = :running, worker_id = :worker_id, attempts = attempts + 1, "
+                    "lease_expires_at = now() + make_interval(secs => :lease), updated_at = now() "
+                    "WHERE job_id IN ("
+                    "  SELECT job_id FROM pipeline_jobs "
+                    "  WHERE (status = :pending OR (status = :running AND lease_expires_at < now())) "
+                    f"   AND attempts < :max_attempts {date_filter} "
+                    "  ORDER BY date_id, job_id LIMIT :limit "
+                    "  FOR UPDATE SKIP LOCKED"
+                    ") RETURNING job_id, date_id, channel_id, attempts"
+                ),
+                {
+                    "running": RUNNING, "pending": PENDING, "worker_id": worker_id, "lease": self.lease_seconds,
+                    "max_attempts": self.max_attempts, "limit": limit, "date_id": date_id
+                }
+            ).all()
+        jobs = sorted((Job(*row) for row in rows), key=lambda job: job.job_id)
+        if jobs:
+            logger.info(f"Worker {worker_id} claimed {len(jobs)} jobs")
+        return jobs
+
+    def heartbeat(self, jobs: List[Job], worker_id: str) -> None:
+        """
+        Extend the leases `worker_id` holds on `jobs`.
+        """
+        with self.engine.begin() as conn:
+            conn.execute(
+                text(
+                    "UPDATE pipeline_jobs SET lease_expires_at = now() + make_interval(secs => :lease) "
+                    "WHERE job_id = ANY(:job_ids) AND worker_id = :worker_id AND status = :running"
+                ),
+                {"lease": self.lease_seconds, "job_ids": [job.job_id for job in jobs],
+                 "worker_id": worker_id, "running": RUNNING}
+            )
+
+    def complete(self, job: Job, worker_id: str) -> bool:
+        """
+        Mark a job done. Returns False if the lease was lost to another worker.
+        """
+        return self._finish(job, worker_id, DONE, None)
+
+    def fail(self, job: Job, worker_id: str, error: str) -> bool:
+        """
+        Record a failed attempt: the job goes back to pending, or to failed once its attempts are used up.
+        """
+        status = FAILED if job.attempts >= self.max_attempts else PENDING
+        return self._finish(job, worker_id, status, error)
+
+    def release(self, jobs: List[Job], worker_id: str, error: str) -> int:
+        """
+        Return jobs to pending without counting the claim as an attempt (e.g. the quota ran out
+        before they could be processed). Returns the number released; jobs whose lease was lost are skipped.
+        """
+        if not jobs:
+            return 0
+        with self.engine.begin() as conn:
+            released = conn.execute(
+                text(
+                    "UPDATE pipeline_jobs SET status = :pending, attempts = GREATEST(attempts - 1, 0), "
+                    "last_error = :error, lease_expires_at = NULL, updated_at = now() "
+                    "WHERE job_id = ANY(:job_ids) AND worker_id = :worker_id AND status = :running"
+                ),
+                {"pending": PENDING, "error": error, "job_ids": [job.job_id for job in jobs],
+                 "worker_id": worker_id, "running": RUNNING}
+            ).rowcount
+        logger.info(f"Worker {worker_id} released {released} jobs: {error}")
+        return released
+
+    def _finish(self, job: Job, worker_id: str, status: str, error: Optional[str]) -> bool:
+        with self.engine.begin() as conn:
+            updated = conn.execute(
+                text(
+                    "UPDATE pipeline_jobs SET status = :status, last_error = :error, lease_expires_at = NULL, "
+                    "updated_at = now() WHERE job_id = :job_id AND worker_id = :worker_id AND status = :running"
+                ),
+                {"status": status, "error": error, "job_id": job.job_id, "worker_id": worker_id, "running": RUNNING}
+            ).rowcount
+        if not updated:
+            logger.warning(f"Lease on job {job.job_id} ({job.channel_id}) was lost; result not recorded")
+        return bool(updated)
+
+    def _fail_exhausted(self) -> None:
+        """
+        Mark jobs whose lease expired on their last allowed attempt as failed.
+        """
+        with self.engine.begin() as conn:
+            conn.execute(
+                text(
+                    "UPDATE pipeline_jobs SET status = :failed, last_error = COALESCE(last_error, 'lease expired'), "
+                    "lease_expires_at = NULL, updated_at = now() "
+                    "WHERE status = :running AND lease_expires_at < now() AND attempts >= :max_attempts"
+                ),
+                {"failed": FAILED, "running": RUNNING, "max_attempts": self.max_attempts}
+            )
+
+    def counts(self, date_id: datetime.date) -> Dict[str, int]:
+        """
+        Number of jobs per status for `date_id`.
+        """
+        with self.engine.connect() as conn:
+            rows = conn.execute(
+                text("SELECT status, COUNT(*) FROM pipeline_jobs WHERE date_id = :date_id GROUP BY status"),
+                {"date_id": date_id}
+            ).all()
+        return {status: 0 for status in (PENDING, RUNNING, DONE, FAILED)} | dict(rows)
+
+    def outstanding(self, date_id: datetime.date) -> int:
+        """
+        Jobs of `date_id` that are still pending or running.
+        """
+        counts = self.counts(date_id)
+        return counts[PENDING] + counts[RUNNING]
@@ -1,22 +1,80 @@
 import os
+import json
+import hashlib
 import logging
+import threading
+import datetime
 import pandas as pd
-from sqlalchemy import create_engine
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+from sqlalchemy.engine import Connection
+from sqlalchemy import MetaData, Table, create_engine, text
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import sessionmaker
 
+from src.load.pg_copy import iter_copy_buffers
+from src.metrics import COUNTER_NAMES, StageStats, recorder
+
+# Load strategies accepted by DataLoader.load_data
+LOAD_METHODS = ("auto", "insert", "copy")
+
+# PostgreSQL's limit on bind parameters in one statement
+MAX_BIND_PARAMS = 65535
+
+# Tables with this column only get rows whose content changed (see DataLoader.load_data)
+HASH_COLUMN = "content_hash"
+
+# Bookkeeping columns left out of the content hash
+UNHASHED_COLUMNS = ("created_at", "updated_at", HASH_COLUMN)
+
+# Materialized latest-snapshot views refreshed after every load
+ANALYTICS_MATVIEWS = ("analytics.channel_summary", "analytics.video_performance")
+
 logger = logging.getLogger(__name__)
 
+def content_hashes(df: pd.DataFrame) -> pd.Series:
+    """
+    MD5 of each row's attributes (every column except the bookkeeping ones), as hex strings.
+    
+    Columns are hashed in name order and values as canonical JSON, so the hash only
+    depends on the content, not on the frame's column order or dtypes.
+    """
+    columns = sorted(column for column in df.columns if column not in UNHASHED_COLUMNS)
+    values = df[columns].astype(object).where(df[columns].notna(), None)
+    return pd.Series(
+        [
+            hashlib.md5(json.dumps(row, default=str, separators=(",", ":")).encode("utf-8")).hexdigest()
+            for row in values.itertuples(index=False, name=None)
+        ],
+        index=df.index,
+        dtype=object
+    )
+
+
+def _updatable_columns(target_table: Table, unique_keys: list[str]) -> List[Any]:
+    """
+    Columns an upsert overwrites on conflict: all but the keys, created_at and
+    generated columns (such as the search vectors, which PostgreSQL computes itself).
+    """
+    return [
+        col for col in target_table.columns
+        if col.name not in unique_keys + ['created_at'] and col.computed is None
+    ]
+
+
 class DataLoader:
     """
     Handles loading data into Cloud PostgreSQL using SQLAlchemy.
     """
-    def __init__(self, connection_string: str = None):
+    def __init__(self, connection_string: str = None, load_method: str = None):
         """
         Initialize database connection.
         
         Args:
             connection_string: SQLAlchemy connection string. If None, built from env vars.
+            load_method: Default load strategy: 'insert' (multi-VALUES upsert), 'copy'
+                (COPY into a staging table, then merge) or 'auto' (copy for frames of at
+                least COPY_MIN_ROWS rows). Defaults to LOAD_METHOD env var (or 'auto').
         """
         if not connection_string:
             user = os.getenv("DB_USER")
@@ -30,22 +88,57 @@ class DataLoader:
             
             connection_string = f"postgresql+psycopg2://{user}:{password}@{host}:{port}/{dbname}"
             
-        self.engine = create_engine(connection_string)
+        # Pool settings; statement_timeout is applied per connection (0 disables it)
+        statement_timeout_ms = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+        connect_args = {"options": f"-c statement_timeout={statement_timeout_ms}"} if statement_timeout_ms else {}
+        self.engine = create_engine(
+            connection_string,
+            pool_size=int(os.getenv("DB_POOL_SIZE", "5")),
+            max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "5")),
+            pool_pre_ping=os.getenv("DB_POOL_PRE_PING", "true").lower() == "true",
+            pool_recycle=int(os.getenv("DB_POOL_RECYCLE", "1800")),
+            connect_args=connect_args
+        )
         self.Session = sessionmaker(bind=self.engine)
 
+        # Reflected tables and upsert statements, cached for the loader's lifetime
+        self._metadata = MetaData()
+        self._tables: Dict[str, Table] = {}
+        self._upsert_statements: Dict[Tuple[str, Tuple[str, ...]], Any] = {}
+        self._cache_lock = threading.Lock()
+
+        self.load_method = (load_method or os.getenv("LOAD_METHOD", "auto")).lower()
+        if self.load_method not in LOAD_METHODS:
+            raise ValueError(f"Unknown load method: {self.load_method}")
+        self.copy_min_rows = int(os.getenv("COPY_MIN_ROWS", "1000"))
+        self.skip_unchanged = os.getenv("LOAD_SKIP_UNCHANGED", "true").lower() == "true"
+
     def load_data(
         self, 
         df: pd.DataFrame, 
         table_name: str, 
-        unique_keys: list[str]
+        unique_keys: list[str],
+        method: str = None,
+        conn: Optional[Connection] = None,
+        skip_unchanged: Optional[bool] = None
     ) -> int:
         """
         Load dataframe into database with upsert (merge) logic.
         
+        For tables with a content_hash column (the dimensions), each row's hash is
+        computed and compared with the stored hashes (fetched in one query), and only
+        new or changed rows are sent. The upsert also leaves a row untouched if its
+        hash matches, so unchanged rows are never rewritten and their updated_at stays.
+        
         Args:
             df: Pandas DataFrame to load.
             table_name: Target table name.
             unique_keys: List of column names that form the unique constraint (for conflict resolution).
+            method: 'insert', 'copy' or 'auto'. Defaults to the loader's load_method.
+            conn: Connection of an open transaction (see `transaction`) to load within.
+                If None, the load runs and commits in its own transaction.
+            skip_unchanged: Skip rows whose content hash is unchanged (hashed tables only).
+                Defaults to LOAD_SKIP_UNCHANGED env var (or true).
             
         Returns:
             Number of rows affected.
@@ -53,46 +146,295 @@ class DataLoader:
         if df.empty:
             logger.info(f"No data to load for table {table_name}")
             return 0
+        
+        method = (method or self.load_method).lower()
+        if method not in LOAD_METHODS:
+            raise ValueError(f"Unknown load method: {method}")
+        if method == "auto":
+            method = "copy" if len(df) >= self.copy_min_rows else "insert"
             
-        # Create a list of dictionaries for bulk insert
-        records = df.to_dict(orient='records')
+        target_table = self.get_table(table_name)
+
+        # Execute
+        upsert = self._copy_upsert if method == "copy" else self._insert_upsert
+        hashed = HASH_COLUMN in target_table.columns
+        if skip_unchanged is None:
+            skip_unchanged = self.skip_unchanged
+        with recorder.timed(f"load.{table_name}") as counters:
+            counters["rows_in"] = len(df)
+            if hashed:
+                df = df.assign(**{HASH_COLUMN: content_hashes(df)})
+            with self._connection(conn) as active_conn:
+                if hashed and skip_unchanged:
+                    df = self._changed_rows(active_conn, df, table_name, unique_keys)
+                rowcount = upsert(active_conn, df, target_table, unique_keys) if not df.empty else 0
+            counters["rows_upserted"] = rowcount
         
-        # Prepare the insert statement with ON CONFLICT logic
-        # Prepare the insert statement with ON CONFLICT logic
-        # Note: pd.io.sql.get_schema is a bit hacky for table object, better to assume table exists or reflect it.
-        # But for raw sql construction, we can just use the table name string if we trust input.
+        logger.info(f"Upserted {rowcount} rows into {table_name}")
+        return rowcount
+
+    @contextmanager
+    def transaction(self) -> Iterator[Connection]:
+        """
+        Open a transaction that several load_data calls can share; commits on success, rolls back on error.
+        """
+        with self.engine.begin() as conn:
+            yield conn
+
+    @contextmanager
+    def _connection(self, conn: Optional[Connection]) -> Iterator[Connection]:
+        """
+        Use the caller's connection, or open a transaction of our own.
+        """
+        if conn is not None:
+            yield conn
+        else:
+            with self.transaction() as own_conn:
+                yield own_conn
+
+    def _changed_rows(self, conn, df: pd.DataFrame, table_name: str, unique_keys: list[str]) -> pd.DataFrame:
+        """
+        Drop the rows whose content hash matches the stored one.
+        """
+        if len(unique_keys) != 1:
+            raise ValueError(f"Content-hash loads need a single-column key, got {unique_keys} for {table_name}")
+        key = unique_keys[0]
+        stored = dict(conn.execute(
+            text(f'SELECT "{key}", "{HASH_COLUMN}" FROM "{table_name}" WHERE "{key}" = ANY(:keys)'),
+            {"keys": df[key].tolist()}
+        ).all())
+        changed = df[df[HASH_COLUMN].ne(df[key].map(stored))]
+        logger.info(f"{table_name}: {len(changed)} of {len(df)} rows new or changed")
+        return changed
+
+    def get_table(self, table_name: str) -> Table:
+        """
+        Return the reflected Table for `table_name`, reflecting it only on first use.
+        """
+        with self._cache_lock:
+            if table_name not in self._tables:
+                # Reflect table from database to ensure we match columns
+                try:
+                    self._tables[table_name] = Table(table_name, self._metadata, autoload_with=self.engine)
+                except Exception as e:
+                    logger.error(f"Error reflecting table {table_name}: {e}")
+                    raise
+            return self._tables[table_name]
+
+    def _upsert_statement(self, target_table: Table, unique_keys: list[str]):
+        """
+        Build (once per table and key set) the INSERT ... ON CONFLICT statement used by the insert path.
+        """
+        cache_key = (target_table.name, tuple(unique_keys))
+        with self._cache_lock:
+            if cache_key not in self._upsert_statements:
+                stmt = insert(target_table)
+                
+                # Define what to do on conflict (update all columns except unique keys and created_at)
+                update_cols = {col.name: stmt.excluded[col.name] for col in _updatable_columns(target_table, unique_keys)}
+                
+                if not update_cols:
+                    # If all columns are keys (rare), do nothing
+                    stmt = stmt.on_conflict_do_nothing(index_elements=unique_keys)
+                elif HASH_COLUMN in target_table.columns:
+                    # Leave rows whose content is unchanged untouched (no new tuple, no WAL)
+                    stmt = stmt.on_conflict_do_update(
+                        index_elements=unique_keys,
+                        set_=update_cols,
+                        where=target_table.c[HASH_COLUMN].is_distinct_from(stmt.excluded[HASH_COLUMN])
+                    )
+                else:
+                    stmt = stmt.on_conflict_do_update(index_elements=unique_keys, set_=update_cols)
+                self._upsert_statements[cache_key] = stmt
+            return self._upsert_statements[cache_key]
+
+    def _insert_upsert(self, conn, df: pd.DataFrame, target_table: Table, unique_keys: list[str]) -> int:
+        """
+        Upsert with multi-VALUES INSERT ... ON CONFLICT statements, one round-trip per chunk.
         
-        # Let's rely on sqlalchemy Table reflection or just construct text/table object if needed.
-        # However, dialects.postgresql.insert requires a Table object usually.
-        # To keep it simple and efficient without reflecting specific schema classes repeatedly:
-        from sqlalchemy import MetaData, Table
-        metadata = MetaData()
+        Chunks stay under both PostgreSQL's bind-parameter limit and SQLAlchemy's
+        insertmanyvalues page size, so each chunk is sent as a single statement.
+        """
+        # Create a list of dictionaries for bulk insert (missing values as None, not NaN)
+        records = df.astype(object).where(df.notna(), None).to_dict(orient='records')
+        stmt = self._upsert_statement(target_table, unique_keys)
         
-        # Reflect table from database to ensure we match columns
+        chunk_rows = max(1, min(self.engine.dialect.insertmanyvalues_page_size, MAX_BIND_PARAMS // len(df.columns)))
+        rowcount = 0
+        for start in range(0, len(records), chunk_rows):
+            rowcount += conn.execute(stmt, records[start:start + chunk_rows]).rowcount
+        return rowcount
+
+    def _copy_upsert(self, conn, df: pd.DataFrame, target_table: Table, unique_keys: list[str]) -> int:
+        """
+        Upsert by streaming the frame with COPY FROM STDIN into a temporary staging
+        table, then merging it with one INSERT ... SELECT ... ON CONFLICT.
+        
+        Conflict handling matches _insert_upsert: every table column except the unique
+        keys, created_at and generated columns is overwritten from EXCLUDED (columns
+        missing from the frame take their defaults).
+        """
+        table_name = target_table.name
+        stage_name = f"_stage_{table_name}"
+        columns = ", ".join(f'"{name}"' for name in df.columns)
+        conflict = ", ".join(f'"{key}"' for key in unique_keys)
+        update_cols = [col.name for col in _updatable_columns(target_table, unique_keys)]
+        if update_cols:
+            action = "DO UPDATE SET " + ", ".join(f'"{name}" = EXCLUDED."{name}"' for name in update_cols)
+            if HASH_COLUMN in target_table.columns:
+                action += f' WHERE "{table_name}"."{HASH_COLUMN}" IS DISTINCT FROM EXCLUDED."{HASH_COLUMN}"'
+        else:
+            action = "DO NOTHING"
+
+        # Same column types as the target but none of its constraints or defaults
+        conn.execute(text(
+            f'CREATE TEMP TABLE "{stage_name}" ON COMMIT DROP AS '
+            f'SELECT {columns} FROM "{table_name}" WITH NO DATA'
+        ))
+
+        cursor = conn.connection.cursor()
         try:
-            target_table = Table(table_name, metadata, autoload_with=self.engine)
-        except Exception as e:
-            logger.error(f"Error reflecting table {table_name}: {e}")
-            raise
+            for buffer in iter_copy_buffers(df):
+                cursor.copy_expert(f'COPY "{stage_name}" ({columns}) FROM STDIN', buffer)
+        finally:
+            cursor.close()
+
+        result = conn.execute(text(
+            f'INSERT INTO "{table_name}" ({columns}) SELECT {columns} FROM "{stage_name}" '
+            f'ON CONFLICT ({conflict}) {action}'
+        ))
+        # Dropped now rather than at commit, so the same table can be flushed again
+        # within one transaction (e.g. a large channel's mid-channel flush)
+        conn.execute(text(f'DROP TABLE "{stage_name}"'))
+        return result.rowcount
 
-        stmt = insert(target_table).values(records)
+    def get_channel_watermarks(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch the incremental-discovery high-water mark of every channel.
         
-        # Define what to do on conflict (update all columns except unique keys and created_at)
-        # We need to exclude columns that shouldn't be updated or don't exist in source
-        update_cols = {col.name: col for col in stmt.excluded if col.name not in unique_keys + ['created_at']}
+        Returns:
+            Mapping of channel ID to a dict with 'last_video_id' and 'last_published_at'.
+        """
+        with self.engine.connect() as conn:
+            rows = conn.execute(text(
+                "SELECT channel_id, last_video_id, last_published_at FROM channel_watermarks"
+            )).mappings().all()
+        return {row["channel_id"]: dict(row) for row in rows}
+
+    def get_tracked_video_ids(self, channel_id: str) -> List[str]:
+        """
+        List every video of a channel already stored in dim_video, newest first.
+        """
+        with self.engine.connect() as conn:
+            rows = conn.execute(
+                text("SELECT video_id FROM dim_video WHERE channel_id = :channel_id ORDER BY published_at DESC"),
+                {"channel_id": channel_id}
+            ).scalars().all()
+        return list(rows)
+
+    def get_comment_cursors(self, video_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch the comment sync cursors of `video_ids`.
         
-        if not update_cols:
-            # If all columns are keys (rare), do nothing
-            on_conflict_stmt = stmt.on_conflict_do_nothing(index_elements=unique_keys)
-        else:
-            on_conflict_stmt = stmt.on_conflict_do_update(
-                index_elements=unique_keys,
-                set_=update_cols
-            )
+        Returns:
+            Mapping of video ID to a dict with 'comment_count', 'newest_published_at',
+            'resume_page_token' and 'resume_newest_published_at' (videos never synced are absent).
+        """
+        if not video_ids:
+            return {}
+        with self.engine.connect() as conn:
+            rows = conn.execute(
+                text(
+                    "SELECT video_id, comment_count, newest_published_at, resume_page_token, "
+                    "resume_newest_published_at FROM comment_cursors "
+                    "WHERE video_id = ANY(:video_ids)"
+                ),
+                {"video_ids": list(video_ids)}
+            ).mappings().all()
+        return {row["video_id"]: dict(row) for row in rows}
 
-        # Execute
+    def get_completed_channels(self, date_id: datetime.date, stage: str) -> Set[str]:
+        """
+        Return the channels whose `stage` already completed for `date_id`.
+        """
         with self.engine.connect() as conn:
-            result = conn.execute(on_conflict_stmt)
-            conn.commit()
-            logger.info(f"Upserted {result.rowcount} rows into {table_name}")
-            return result.rowcount
+            rows = conn.execute(
+                text("SELECT channel_id FROM pipeline_checkpoints WHERE date_id = :date_id AND stage = :stage"),
+                {"date_id": date_id, "stage": stage}
+            ).scalars().all()
+        return set(rows)
+
+    def mark_completed(
+        self,
+        channel_ids: List[str],
+        date_id: datetime.date,
+        stage: str,
+        conn: Optional[Connection] = None
+    ) -> None:
+        """
+        Record that `stage` completed for `channel_ids` on `date_id`.
+        
+        Pass the connection of the transaction that loaded the data so the checkpoint
+        commits atomically with it.
+        """
+        checkpoints = pd.DataFrame({
+            "date_id": [date_id] * len(channel_ids),
+            "channel_id": channel_ids,
+            "stage": [stage] * len(channel_ids),
+            "completed_at": [pd.Timestamp.now(tz="UTC")] * len(channel_ids)
+        })
+        self.load_data(checkpoints, "pipeline_checkpoints", ["date_id", "channel_id", "stage"], conn=conn)
+
+    def refresh_materialized_views(self, views: Tuple[str, ...] = ANALYTICS_MATVIEWS) -> None:
+        """
+        Refresh the materialized analytics views so they reflect the latest load.
+        
+        Refreshes run CONCURRENTLY (each view has a unique index), so dashboard
+        queries keep reading the previous snapshot until the new one is ready.
+        """
+        for view in views:
+            with self.engine.begin() as conn:
+                populated = conn.execute(
+                    text("SELECT ispopulated FROM pg_matviews WHERE schemaname || '.' || matviewname = :view"),
+                    {"view": view}
+                ).scalar()
+                if populated is None:
+                    logger.warning(f"Materialized view {view} not found, run init_db.py")
+                    continue
+                # CONCURRENTLY needs an already-populated view
+                concurrently = "CONCURRENTLY " if populated else ""
+                with recorder.timed(f"refresh.{view}"):
+                    conn.execute(text(f"REFRESH MATERIALIZED VIEW {concurrently}{view}"))
+            logger.info(f"Refreshed {view}")
+
+    def save_run_metrics(self, run: Dict[str, Any], stages: Dict[str, StageStats]) -> int:
+        """
+        Persist one run and its per-stage counters to pipeline_runs / pipeline_stage_metrics.
+        
+        Args:
+            run: Run fields (date_id, started_at, finished_at, duration_seconds, status,
+                channels_total, channels_failed, quota_used, retries, error).
+            stages: Counters per stage, as returned by MetricsRecorder.snapshot().
+            
+        Returns:
+            The new run_id.
+        """
+        columns = ["date_id", "started_at", "finished_at", "duration_seconds", "status",
+                   "channels_total", "channels_failed", "quota_used", "retries", "error"]
+        with self.transaction() as conn:
+            run_id = conn.execute(
+                text(
+                    f"INSERT INTO pipeline_runs ({', '.join(columns)}) "
+                    f"VALUES ({', '.join(':' + name for name in columns)}) RETURNING run_id"
+                ),
+                {name: run.get(name) for name in columns}
+            ).scalar()
+            if stages:
+                conn.execute(
+                    text(
+                        f"INSERT INTO pipeline_stage_metrics (run_id, stage, {', '.join(COUNTER_NAMES)}) "
+                        f"VALUES (:run_id, :stage, {', '.join(':' + name for name in COUNTER_NAMES)})"
+                    ),
+                    [{"run_id": run_id, "stage": stage, **vars(stats)} for stage, stats in stages.items()]
+                )
+        return run_id
@@ -0,0 +1,171 @@
+import re
+import logging
+import datetime
+from typing import List, Optional
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+logger = logging.getLogger(__name__)
+
+# Fact tables that may be range-partitioned by month on date_id
+PARTITIONED_TABLES = ("fact_channel_daily", "fact_video_daily")
+
+# Monthly partitions are named <table>_yYYYYmMM
+_PARTITION_SUFFIX = re.compile(r"_y(\d{4})m(\d{2})$")
+
+
+def month_start(day: datetime.date) -> datetime.date:
+    return day.replace(day=1)
+
+
+def add_months(day: datetime.date, months: int) -> datetime.date:
+    """
+    Return the first day of the month `months` after `day`'s month.
+    """
+    index = day.year * 12 + day.month - 1 + months
+    return datetime.date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: datetime.date) -> str:
+    return f"{table}_y{month.year:04d}m{month.month:02d}"
+
+
+def is_partitioned(conn: Connection, table: str) -> bool:
+    """
+    Check whether `table` uses the partitioned layout.
+    """
+    return conn.execute(
+        text(
+            "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table pt "
+            "JOIN pg_class c ON c.oid = pt.partrelid WHERE c.relname = :table)"
+        ),
+        {"table": table}
+    ).scalar()
+
+
+def list_partitions(conn: Connection, table: str) -> List[str]:
+    """
+    List the partitions currently attached to `table`.
+    """
+    return list(conn.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits i "
+            "JOIN pg_class parent ON parent.oid = i.inhparent "
+            "JOIN pg_class child ON child.oid = i.inhrelid "
+            "WHERE parent.relname = :table ORDER BY child.relname"
+        ),
+        {"table": table}
+    ).scalars().all())
+
+
+def ensure_partitions(conn: Connection, start: datetime.date, end: datetime.date) -> List[str]:
+    """
+    Create the monthly partitions covering [start, end] for every partitioned fact table.
+
+    Tables still using the plain heap layout are skipped, so this is safe to call on every run.
+
+    Returns:
+        Names of the partitions that were created.
+    """
+    created = []
+    for table in PARTITIONED_TABLES:
+        if not is_partitioned(conn, table):
+            continue
+
+        existing = set(list_partitions(conn, table))
+        month = month_start(start)
+        while month <= end:
+            name = partition_name(table, month)
+            if name not in existing:
+                conn.execute(text(
+                    f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "{table}" '
+                    f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+                ))
+                created.append(name)
+            month = add_months(month, 1)
+
+    if created:
+        logger.info(f"Created partitions: {created}")
+    return created
+
+
+def detach_old_partitions(
+    conn: Connection,
+    before: datetime.date,
+    archive_schema: Optional[str] = "archive",
+    drop: bool = False
+) -> List[str]:
+    """
+    Detach monthly partitions that end on or before `before`.
+
+    Detached partitions are moved into `archive_schema` (still queryable, no longer
+    scanned by dashboard queries) or dropped if `drop` is True.
+
+    Returns:
+        Names of the partitions that were detached.
+    """
+    detached = []
+    for table in PARTITIONED_TABLES:
+        if not is_partitioned(conn, table):
+            continue
+
+        for name in list_partitions(conn, table):
+            match = _PARTITION_SUFFIX.search(name)
+            if not match:
+                continue
+            month = datetime.date(int(match.group(1)), int(match.group(2)), 1)
+            if add_months(month, 1) > before:
+                continue
+
+            conn.execute(text(f'ALTER TABLE "{table}" DETACH PARTITION "{name}"'))
+            if drop:
+                conn.execute(text(f'DROP TABLE "{name}"'))
+            elif archive_schema:
+                conn.execute(text(f'CREATE SCHEMA IF NOT EXISTS "{archive_schema}"'))
+                conn.execute(text(f'ALTER TABLE "{name}" SET SCHEMA "{archive_schema}"'))
+            detached.append(name)
+
+    if detached:
+        logger.info(f"Detached partitions: {detached}")
+    return detached
+
+
+def migrate_to_partitioned(conn: Connection, partitioned_sql: str, months_ahead: int = 3) -> List[str]:
+    """
+    Convert heap fact tables to the partitioned layout, copying their rows across.
+
+    The heap tables are renamed, the partitioned parents are created from
+    `partitioned_sql`, partitions covering the existing data (plus `months_ahead`)
+    are created, rows are copied, and the old tables are dropped together with the
+    views that depend on them (the caller re-applies schema.sql to recreate them).
+
+    Returns:
+        Names of the tables that were migrated.
+    """
+    heap_tables = [
+        table for table in PARTITIONED_TABLES
+        if conn.execute(text("SELECT to_regclass(:table) IS NOT NULL"), {"table": table}).scalar()
+        and not is_partitioned(conn, table)
+    ]
+    for table in heap_tables:
+        conn.execute(text(f'ALTER TABLE "{table}" RENAME TO "{table}_heap"'))
+        # Index (and constraint) names survive the rename and would collide with the new table's
+        index_names = conn.execute(
+            text("SELECT indexname FROM pg_indexes WHERE tablename = :table"), {"table": f"{table}_heap"}
+        ).scalars().all()
+        for index_name in index_names:
+            conn.execute(text(f'ALTER INDEX "{index_name}" RENAME TO "{index_name}_heap"'))
+
+    conn.execute(text(partitioned_sql))
+
+    today = datetime.date.today()
+    for table in heap_tables:
+        first = conn.execute(text(f'SELECT MIN(date_id) FROM "{table}_heap"')).scalar() or today
+        ensure_partitions(conn, first, add_months(today, months_ahead))
+        columns = "channel_id, date_id, subscribers, total_views, total_videos, created_at" \
+            if table == "fact_channel_daily" else "video_id, date_id, views, likes, comments, snapshot_at, created_at"
+        conn.execute(text(f'INSERT INTO "{table}" ({columns}) SELECT {columns} FROM "{table}_heap"'))
+        conn.execute(text(f'DROP TABLE "{table}_heap" CASCADE'))
+        logger.info(f"Migrated {table} to the partitioned layout")
+
+    return heap_tables
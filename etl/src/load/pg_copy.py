@@ -0,0 +1,81 @@
+import io
+import pandas as pd
+from typing import Any, Iterator, List
+from pandas.api.types import (
+    is_bool_dtype, is_datetime64_any_dtype, is_float_dtype, is_integer_dtype
+)
+
+# Encoding of NULL in PostgreSQL's COPY text format
+COPY_NULL = "\\N"
+
+
+def _escape(values: pd.Series) -> pd.Series:
+    """
+    Escape backslashes and field/row separators for COPY text format.
+    """
+    return (
+        values.str.replace("\\", "\\\\", regex=False)
+        .str.replace("\t", "\\t", regex=False)
+        .str.replace("\n", "\\n", regex=False)
+        .str.replace("\r", "\\r", regex=False)
+    )
+
+
+def _array_literal(values: List[Any]) -> str:
+    """
+    Render a Python list as a PostgreSQL array literal, e.g. ['a', 'b'] -> {"a","b"}.
+    """
+    elements = []
+    for value in values:
+        if value is None:
+            elements.append("NULL")
+        else:
+            escaped = str(value).replace("\\", "\\\\").replace('"', '\\"')
+            elements.append(f'"{escaped}"')
+    return "{" + ",".join(elements) + "}"
+
+
+def _object_to_text(value: Any) -> Any:
+    if isinstance(value, (list, tuple)):
+        return _array_literal(value)
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+def column_to_copy_text(column: pd.Series) -> pd.Series:
+    """
+    Convert one DataFrame column to its COPY text representation (vectorized where the dtype allows).
+    """
+    nulls = column.isna().to_numpy()
+
+    if is_bool_dtype(column.dtype):
+        text = column.map({True: "t", False: "f"})
+    elif is_integer_dtype(column.dtype):
+        text = column.astype(str)
+    elif is_float_dtype(column.dtype):
+        finite = column[~nulls]
+        # Integral floats (e.g. counts that picked up a NaN) must load into BIGINT columns
+        if finite.empty or ((finite == finite.round()).all() and finite.abs().max() < 2 ** 53):
+            text = column.fillna(0).astype("int64").astype(str)
+        else:
+            text = column.astype(str)
+    elif is_datetime64_any_dtype(column.dtype):
+        text = column.map(lambda ts: ts.isoformat() if not pd.isna(ts) else None)
+    else:
+        text = _escape(column.map(_object_to_text, na_action="ignore").astype(object))
+
+    text = text.astype(object)
+    text[nulls] = COPY_NULL
+    return text
+
+
+def iter_copy_buffers(df: pd.DataFrame, chunk_rows: int = 50_000) -> Iterator[io.StringIO]:
+    """
+    Serialize a DataFrame to COPY text format, one in-memory buffer per `chunk_rows` rows.
+    """
+    for start in range(0, len(df), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows]
+        columns = [column_to_copy_text(chunk[name]) for name in chunk.columns]
+        lines = columns[0].str.cat(columns[1:], sep="\t") if len(columns) > 1 else columns[0]
+        yield io.StringIO("\n".join(lines.tolist()) + "\n")
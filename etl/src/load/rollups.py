@@ -0,0 +1,101 @@
+import logging
+import datetime
+from typing import Dict
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+logger = logging.getLogger(__name__)
+
+# Per-video deltas against each video's previous snapshot (any earlier date, so gaps
+# between runs are absorbed into the next day's delta)
+VIDEO_ROLLUP_SQL = """
+INSERT INTO agg_video_daily (
+    video_id, date_id, channel_id, views, likes, comments,
+    views_gained, likes_gained, comments_gained, engagement_rate, updated_at
+)
+SELECT
+    cur.video_id,
+    cur.date_id,
+    dv.channel_id,
+    cur.views,
+    cur.likes,
+    cur.comments,
+    cur.views - prev.views,
+    cur.likes - prev.likes,
+    cur.comments - prev.comments,
+    (COALESCE(cur.likes, 0) + COALESCE(cur.comments, 0))::FLOAT / NULLIF(cur.views, 0),
+    CURRENT_TIMESTAMP
+FROM fact_video_daily cur
+JOIN dim_video dv ON dv.video_id = cur.video_id
+LEFT JOIN LATERAL (
+    SELECT p.views, p.likes, p.comments
+    FROM fact_video_daily p
+    WHERE p.video_id = cur.video_id AND p.date_id < cur.date_id
+    ORDER BY p.date_id DESC
+    LIMIT 1
+) prev ON TRUE
+WHERE cur.date_id = :date_id
+ON CONFLICT (video_id, date_id) DO UPDATE SET
+    channel_id = EXCLUDED.channel_id,
+    views = EXCLUDED.views,
+    likes = EXCLUDED.likes,
+    comments = EXCLUDED.comments,
+    views_gained = EXCLUDED.views_gained,
+    likes_gained = EXCLUDED.likes_gained,
+    comments_gained = EXCLUDED.comments_gained,
+    engagement_rate = EXCLUDED.engagement_rate,
+    updated_at = EXCLUDED.updated_at
+"""
+
+# Per-channel totals, summed from the per-video rollup of the same day
+CHANNEL_ROLLUP_SQL = """
+INSERT INTO agg_channel_daily (
+    channel_id, date_id, videos_tracked, views, likes, comments,
+    views_gained, likes_gained, comments_gained, engagement_rate, updated_at
+)
+SELECT
+    channel_id,
+    date_id,
+    COUNT(*),
+    SUM(views),
+    SUM(likes),
+    SUM(comments),
+    SUM(views_gained),
+    SUM(likes_gained),
+    SUM(comments_gained),
+    (COALESCE(SUM(likes), 0) + COALESCE(SUM(comments), 0))::FLOAT / NULLIF(SUM(views), 0),
+    CURRENT_TIMESTAMP
+FROM agg_video_daily
+WHERE date_id = :date_id
+GROUP BY channel_id, date_id
+ON CONFLICT (channel_id, date_id) DO UPDATE SET
+    videos_tracked = EXCLUDED.videos_tracked,
+    views = EXCLUDED.views,
+    likes = EXCLUDED.likes,
+    comments = EXCLUDED.comments,
+    views_gained = EXCLUDED.views_gained,
+    likes_gained = EXCLUDED.likes_gained,
+    comments_gained = EXCLUDED.comments_gained,
+    engagement_rate = EXCLUDED.engagement_rate,
+    updated_at = EXCLUDED.updated_at
+"""
+
+
+def update_daily_rollups(conn: Connection, date_id: datetime.date) -> Dict[str, int]:
+    """
+    Recompute the per-video and per-channel rollups of one date_id.
+
+    Only the snapshots of `date_id` (and each video's previous one) are read, so the
+    cost tracks a single day's load rather than the whole fact history. Re-running
+    for the same date (e.g. after --resume) overwrites that day's rows.
+
+    Returns:
+        Rows written per rollup table.
+    """
+    params = {"date_id": date_id}
+    counts = {
+        "agg_video_daily": conn.execute(text(VIDEO_ROLLUP_SQL), params).rowcount,
+        "agg_channel_daily": conn.execute(text(CHANNEL_ROLLUP_SQL), params).rowcount,
+    }
+    logger.info(f"Rollups for {date_id}: {counts}")
+    return counts
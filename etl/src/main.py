@@ -1,15 +1,23 @@
 import os
 import logging
 import sys
+import argparse
+import datetime
+from typing import Dict, List, Set
 from dotenv import load_dotenv
-import pandas as pd
 
 # Add src to path to allow imports if running directly
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from src.extract.youtube_api import YouTubeAPI
-from src.transform.clean_data import process_channels, process_videos, process_comments
+from src.extract.quota import QuotaExceededError
+from src.transform.clean_data import process_channels_columnar as process_channels
 from src.load.load_sql import DataLoader
+from src.load.partitions import ensure_partitions
+from src.load.rollups import update_daily_rollups
+from src.metrics import export_run, recorder
+from src.pipeline import StreamingPipeline, CHECKPOINT_STAGE as VIDEOS_STAGE
+from src.scheduler import load_candidates, plan_batches
 
 # Configure logging
 logging.basicConfig(
@@ -21,10 +29,139 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def main():
+# Checkpoint stage recorded once a channel's dim_channel/fact_channel_daily rows are committed
+CHANNELS_STAGE = "channels"
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="YouTube Analytics Pipeline")
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip channels and stages already completed for today's date_id"
+    )
+    return parser.parse_args(argv)
+
+
+def process_channel_batch(
+    api: YouTubeAPI,
+    loader: DataLoader,
+    channel_ids: List[str],
+    date_id: datetime.date,
+    discovery_mode: str = "latest",
+    resume: bool = False
+) -> Dict[str, BaseException]:
+    """
+    Extract, transform and load the channel details, videos and comments of `channel_ids` for `date_id`.
+    
+    Args:
+        api: YouTube API client.
+        loader: Database loader.
+        channel_ids: Channels to process.
+        date_id: Snapshot date the rows and checkpoints are recorded under.
+        discovery_mode: 'latest' or 'incremental' video discovery.
+        resume: Skip the stages already checkpointed for `date_id`.
+        
+    Returns:
+        Channels that failed and were rolled back, mapped to their error.
+    """
+    # Make sure the date's fact partitions exist (no-op for the unpartitioned layout)
+    with loader.transaction() as conn:
+        ensure_partitions(conn, date_id, date_id)
+
+    # Skip work already checkpointed for this date when resuming
+    pending_channels, pending_videos = channel_ids, channel_ids
+    if resume:
+        channels_done = loader.get_completed_channels(date_id, CHANNELS_STAGE)
+        videos_done = loader.get_completed_channels(date_id, VIDEOS_STAGE)
+        pending_channels = [cid for cid in channel_ids if cid not in channels_done]
+        pending_videos = [cid for cid in channel_ids if cid not in videos_done]
+        logger.info(f"Resuming {date_id}: {len(pending_channels)} channel loads and "
+                    f"{len(pending_videos)} video loads pending")
+
+    # --- EXTRACT & TRANSFORM: CHANNELS ---
+    # Channel details are also needed for the uploads playlists of pending video loads
+    logger.info("Extracting channel details...")
+    raw_channels = api.get_channel_details(list(dict.fromkeys(pending_channels + pending_videos)))
+    if not raw_channels and (pending_channels or pending_videos):
+        logger.warning("No channel contents found.")
+        return {}
+
+    pending_channel_set = set(pending_channels)
+    raw_channels = [channel for channel in raw_channels if channel.get("id") in pending_channel_set]
+    if raw_channels:
+        logger.info("Transforming channel data...")
+        dim_channel_df, fact_channel_df = process_channels(raw_channels, date_id)
+
+        # --- LOAD: CHANNELS (one transaction, committed with its checkpoints) ---
+        logger.info("Loading channel data...")
+        with loader.transaction() as conn:
+            loader.load_data(dim_channel_df, "dim_channel", ["channel_id"], conn=conn)
+            loader.load_data(fact_channel_df, "fact_channel_daily", ["channel_id", "date_id"], conn=conn)
+            loader.mark_completed(dim_channel_df["channel_id"].tolist(), date_id, CHANNELS_STAGE, conn=conn)
+
+    # --- EXTRACT & TRANSFORM & LOAD: VIDEOS & COMMENTS (streamed, one transaction per channel) ---
+    pipeline = StreamingPipeline(
+        api, loader, discovery_mode=discovery_mode, date_id=date_id,
+        refresh_video_ids=due_video_ids(loader) if discovery_mode == "incremental" else None
+    )
+    rows_loaded = pipeline.run(pending_videos)
+    logger.info(f"Rows upserted: {rows_loaded}")
+
+    # Channels never reached (extraction stops when the quota runs out) count as failed too,
+    # with the quota error when that is what stopped it so callers can retry them after the reset
+    failed_channels = dict(pipeline.failed_channels)
+    completed = set(pipeline.completed_channels)
+    quota_hit = any(isinstance(error, QuotaExceededError) for error in failed_channels.values())
+    for channel_id in pending_videos:
+        if channel_id not in completed and channel_id not in failed_channels:
+            failed_channels[channel_id] = (
+                QuotaExceededError("Not processed: quota used up") if quota_hit
+                else RuntimeError("Not processed: extraction stopped early")
+            )
+    return failed_channels
+
+
+def due_video_ids(loader: DataLoader) -> Set[str]:
+    """
+    Tracked videos the tier scheduler (src/scheduler.py) finds due for a stats refresh.
+
+    Incremental runs re-read only these, so the daily run and src/refresh.py share one
+    refresh policy and a video is not fetched again before its tier's interval is up.
+    """
+    now = datetime.datetime.now(datetime.timezone.utc)
+    with loader.engine.connect() as conn:
+        candidates = load_candidates(conn, now)
+    # No batch cap: the run's quota budget is what stops a daily run
+    batches, due_by_tier = plan_batches(candidates, now, max_batches=len(candidates))
+    logger.info(f"{len(candidates)} tracked videos, due by tier: {due_by_tier}")
+    return {video_id for batch in batches for video_id in batch}
+
+
+def refresh_analytics(loader: DataLoader, date_id: datetime.date) -> None:
+    """
+    Rebuild the rollups of `date_id` and refresh the materialized views read by the dashboard.
+    """
+    with recorder.timed("rollups.daily"), loader.transaction() as conn:
+        update_daily_rollups(conn, date_id)
+    loader.refresh_materialized_views()
+
+
+def main(argv=None):
     """
     Main pipeline execution function.
     """
+    args = parse_args(argv)
+    recorder.reset()
+    run = {
+        "date_id": datetime.date.today(),
+        "started_at": recorder.started_at,
+        "status": "failed",
+        "channels_total": 0,
+        "channels_failed": 0,
+        "error": None,
+    }
+    api = loader = None
     try:
         load_dotenv()
         logger.info("Starting YouTube Analytics Pipeline")
@@ -35,68 +172,75 @@ def main():
             logger.error("CHANNEL_IDS (or YOUTUBE_CHANNEL_IDS) environment variable is not set.")
             return
 
-        channel_ids = [cid.strip() for cid in channel_ids_env.split(",") if cid.strip()]
+        channel_ids = list(dict.fromkeys(cid.strip() for cid in channel_ids_env.split(",") if cid.strip()))
         logger.info(f"Targeting {len(channel_ids)} channels: {channel_ids}")
+        run["channels_total"] = len(channel_ids)
+
+        # "latest" re-reads the newest uploads; "incremental" uses per-channel high-water marks
+        discovery_mode = os.getenv("VIDEO_DISCOVERY_MODE", "latest").lower()
+        if discovery_mode not in ("latest", "incremental"):
+            logger.error(f"Unknown VIDEO_DISCOVERY_MODE: {discovery_mode}")
+            return
+
+        date_id = run["date_id"]
 
         # Initialize modules
         api = YouTubeAPI()
         loader = DataLoader()
 
-        # --- EXTRACT & TRANSFORM: CHANNELS ---
-        logger.info("Extracting channel details...")
-        raw_channels = api.get_channel_details(channel_ids)
-        if not raw_channels:
-            logger.warning("No channel contents found.")
-            return
+        failed_channels = process_channel_batch(api, loader, channel_ids, date_id, discovery_mode, resume=args.resume)
 
-        logger.info("Transforming channel data...")
-        dim_channel_df, fact_channel_df = process_channels(raw_channels)
-
-        # --- LOAD: CHANNELS ---
-        logger.info("Loading channel data...")
-        loader.load_data(dim_channel_df, "dim_channel", ["channel_id"])
-        loader.load_data(fact_channel_df, "fact_channel_daily", ["channel_id", "date_id"])
-
-        # --- EXTRACT & TRANSFORM & LOAD: VIDEOS & COMMENTS ---
-        for channel_id in channel_ids:
-            logger.info(f"Processing videos for channel: {channel_id}")
-            
-            # Extract Videos
-            raw_videos = api.get_videos(channel_id, limit=50)
-            
-            if not raw_videos:
-                logger.info(f"No videos found for channel {channel_id}")
-                continue
-                
-            # Transform Videos
-            dim_video_df, fact_video_df = process_videos(raw_videos)
-            
-            # Load Videos
-            logger.info(f"Loading {len(dim_video_df)} videos for channel {channel_id}...")
-            loader.load_data(dim_video_df, "dim_video", ["video_id"])
-            loader.load_data(fact_video_df, "fact_video_daily", ["video_id", "date_id"])
-            
-            # Extract & Process Comments
-            logger.info("Processing comments...")
-            all_comments_df = pd.DataFrame()
-            
-            for index, row in dim_video_df.iterrows():
-                video_id = row['video_id']
-                raw_comments = api.get_video_comments(video_id, limit=20)
-                if raw_comments:
-                    comments_df = process_comments(raw_comments, video_id)
-                    all_comments_df = pd.concat([all_comments_df, comments_df], ignore_index=True)
-            
-            # Load Comments
-            if not all_comments_df.empty:
-               logger.info(f"Loading {len(all_comments_df)} comments for channel {channel_id}...")
-               loader.load_data(all_comments_df, "youtube_comments", ["comment_id"])
+        # --- ROLLUP & REFRESH: pre-aggregated tables and views read by the dashboard ---
+        # Runs even if some channels failed, so the committed ones are visible
+        refresh_analytics(loader, date_id)
 
+        logger.info(f"Quota units used: {api.quota.used}/{api.quota.daily_limit} {api.quota.summary()} "
+                    f"({api.retry_count} retries)")
+        logger.info(f"API key usage today (all users of the pool): {api.keys.status()}")
+        if api.cache:
+            logger.info(f"Response cache: {api.cache.stats()}")
+        if failed_channels:
+            run["status"] = "partial"
+            run["channels_failed"] = len(failed_channels)
+            logger.error(f"{len(failed_channels)} channels failed and were rolled back: "
+                         f"{list(failed_channels)}. Re-run with --resume to retry only those.")
+            sys.exit(1)
+        run["status"] = "success"
         logger.info("Pipeline finished successfully.")
 
     except Exception as e:
+        run["error"] = str(e)
         logger.exception(f"Pipeline failed: {e}")
         sys.exit(1)
+    finally:
+        finish_run(run, api, loader)
+
+
+def finish_run(run: dict, api: YouTubeAPI = None, loader: DataLoader = None) -> None:
+    """
+    Complete the run record, persist it with its per-stage metrics and export the reports.
+    
+    Metrics problems are logged and never fail the run.
+    """
+    if api and api.landing:
+        api.landing.close()
+
+    run["finished_at"] = datetime.datetime.now(datetime.timezone.utc)
+    run["duration_seconds"] = recorder.elapsed()
+    run["quota_used"] = api.quota.used if api else 0
+    run["retries"] = api.retry_count if api else 0
+
+    for stage, stats in sorted(recorder.snapshot().items()):
+        logger.info(f"Stage {stage}: {stats.calls} calls, {stats.seconds:.2f}s, rows in/out/upserted "
+                    f"{stats.rows_in}/{stats.rows_out}/{stats.rows_upserted}, {stats.bytes} bytes, "
+                    f"{stats.quota_units} quota units, {stats.retries} retries, {stats.errors} errors")
+
+    if loader:
+        try:
+            run["run_id"] = loader.save_run_metrics(run, recorder.snapshot())
+        except Exception as e:
+            logger.warning(f"Could not save run metrics: {e}")
+    export_run(run)
 
 if __name__ == "__main__":
     main()
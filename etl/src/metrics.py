@@ -0,0 +1,183 @@
+import os
+import json
+import time
+import logging
+import datetime
+import functools
+import threading
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, fields
+from typing import Any, Callable, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# Prefix of every exported Prometheus metric
+METRIC_PREFIX = "youtube_pipeline"
+
+
+@dataclass
+class StageStats:
+    """
+    Counters accumulated for one stage (e.g. 'api.videos', 'transform.videos', 'load.dim_video').
+    """
+    calls: int = 0
+    seconds: float = 0.0
+    rows_in: int = 0
+    rows_out: int = 0
+    rows_upserted: int = 0
+    bytes: int = 0
+    quota_units: int = 0
+    retries: int = 0
+    errors: int = 0
+    cache_hits: int = 0
+
+
+COUNTER_NAMES = tuple(field.name for field in fields(StageStats))
+
+
+class MetricsRecorder:
+    """
+    Thread-safe registry of per-stage counters for the current run.
+
+    Stages record through `timed` (a context manager) or `add`; the extract, transform
+    and load modules all write to the module-level `recorder`, and main() resets it at
+    the start of each run and persists/exports it at the end.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.stages: Dict[str, StageStats] = {}
+            self.started_at = datetime.datetime.now(datetime.timezone.utc)
+            self._start = time.perf_counter()
+
+    def add(self, stage: str, **counters: float) -> None:
+        """
+        Add `counters` (StageStats field names) to `stage`.
+        """
+        with self._lock:
+            stats = self.stages.setdefault(stage, StageStats())
+            for name, value in counters.items():
+                setattr(stats, name, getattr(stats, name) + value)
+
+    @contextmanager
+    def timed(self, stage: str) -> Iterator[Dict[str, float]]:
+        """
+        Time one call of `stage`. Counters set on the yielded dict are added when the block exits.
+        """
+        counters: Dict[str, float] = {}
+        start = time.perf_counter()
+        try:
+            yield counters
+        except BaseException:
+            counters["errors"] = counters.get("errors", 0) + 1
+            raise
+        finally:
+            self.add(stage, calls=1, seconds=time.perf_counter() - start, **counters)
+
+    def snapshot(self) -> Dict[str, StageStats]:
+        with self._lock:
+            return {stage: StageStats(**asdict(stats)) for stage, stats in self.stages.items()}
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._start
+
+    def totals(self, prefix: str) -> StageStats:
+        """
+        Sum the counters of every stage starting with `prefix` (e.g. 'api.').
+        """
+        total = StageStats()
+        for stage, stats in self.snapshot().items():
+            if stage.startswith(prefix):
+                for name in COUNTER_NAMES:
+                    setattr(total, name, getattr(total, name) + getattr(stats, name))
+        return total
+
+    def report(self, run: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Build the JSON-serializable report of the run: `run` fields plus every stage's counters.
+        """
+        return {
+            **{key: value.isoformat() if hasattr(value, "isoformat") else value for key, value in run.items()},
+            "stages": {stage: asdict(stats) for stage, stats in sorted(self.snapshot().items())},
+        }
+
+    def write_json(self, path: str, run: Dict[str, Any]) -> None:
+        _write_atomic(path, json.dumps(self.report(run), indent=2))
+
+    def write_prometheus(self, path: str, run: Dict[str, Any]) -> None:
+        """
+        Write the run in Prometheus text exposition format, for node_exporter's textfile collector.
+        """
+        lines = []
+        run_gauges = {
+            "last_run_timestamp_seconds": ("Unix time the last run finished.", run["finished_at"].timestamp()),
+            "last_run_duration_seconds": ("Wall time of the last run.", run["duration_seconds"]),
+            "last_run_success": ("1 if the last run completed without failures.", 1 if run["status"] == "success" else 0),
+            "last_run_channels": ("Channels targeted by the last run.", run["channels_total"]),
+            "last_run_channels_failed": ("Channels rolled back in the last run.", run["channels_failed"]),
+            "last_run_quota_units": ("YouTube API quota units spent by the last run.", run["quota_used"]),
+        }
+        for name, (help_text, value) in run_gauges.items():
+            lines += [f"# HELP {METRIC_PREFIX}_{name} {help_text}", f"# TYPE {METRIC_PREFIX}_{name} gauge",
+                      f"{METRIC_PREFIX}_{name} {value}"]
+
+        stages = sorted(self.snapshot().items())
+        for counter in COUNTER_NAMES:
+            name = f"{METRIC_PREFIX}_stage_{counter}"
+            lines += [f"# HELP {name} Per-stage {counter.replace('_', ' ')} in the last run.", f"# TYPE {name} gauge"]
+            lines += [f'{name}{{stage="{stage}"}} {getattr(stats, counter)}' for stage, stats in stages]
+
+        _write_atomic(path, "\n".join(lines) + "\n")
+
+
+def _write_atomic(path: str, content: str) -> None:
+    """
+    Write via a temporary file and rename, so scrapers never read a partial file.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+# Shared by every instrumented module
+recorder = MetricsRecorder()
+
+
+def instrumented(stage: str) -> Callable:
+    """
+    Decorator recording calls, time, input rows (length of the first argument) and
+    output rows (total length of the returned DataFrame or tuple of DataFrames).
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with recorder.timed(stage) as counters:
+                result = func(*args, **kwargs)
+                counters["rows_in"] = len(args[0]) if args and hasattr(args[0], "__len__") else 0
+                frames = result if isinstance(result, tuple) else (result,)
+                counters["rows_out"] = sum(len(frame) for frame in frames if hasattr(frame, "__len__"))
+            return result
+        return wrapper
+    return decorator
+
+
+def export_run(run: Dict[str, Any]) -> None:
+    """
+    Write the Prometheus textfile and JSON report configured by METRICS_TEXTFILE_PATH / METRICS_JSON_PATH.
+    """
+    textfile_path: Optional[str] = os.getenv("METRICS_TEXTFILE_PATH")
+    json_path: Optional[str] = os.getenv("METRICS_JSON_PATH")
+    try:
+        if textfile_path:
+            recorder.write_prometheus(textfile_path, run)
+        if json_path:
+            recorder.write_json(json_path, run)
+    except OSError as e:
+        logger.warning(f"Could not export run metrics: {e}")
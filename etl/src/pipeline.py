@@ -0,0 +1,455 @@
+import os
+import queue
+import datetime
+import logging
+import threading
+import pandas as pd
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from src.extract.youtube_api import YouTubeAPI
+from src.extract.quota import QuotaExceededError
+from src.transform.clean_data import (
+    process_videos_columnar as process_videos,
+    process_comments_columnar as process_comments
+)
+from src.load.load_sql import DataLoader
+from src.metrics import recorder
+
+logger = logging.getLogger(__name__)
+
+# Tables written by the streaming loader, in foreign-key order, with their conflict keys
+LOAD_ORDER = {
+    "dim_video": ["video_id"],
+    "fact_video_daily": ["video_id", "date_id"],
+    "youtube_comments": ["comment_id"],
+    "comment_cursors": ["video_id"],
+    "channel_watermarks": ["channel_id"],
+}
+
+# Checkpoint stage recorded when a channel's videos and comments are committed
+CHECKPOINT_STAGE = "videos"
+
+# Marks the end of a stage's output
+_END = object()
+
+
+@dataclass
+class CommentSync:
+    """
+    Result of one comment sync of a video, with what its cursor needs.
+    """
+    threads: List[Dict[str, Any]]
+    # commentCount to store once the sync is complete (None makes the next run check again)
+    comment_count: Optional[int]
+    # The cursor as it was: stored count, newest stored comment time, and the newest comment
+    # seen by a paused sync
+    previous_count: Optional[int]
+    since: Optional[datetime.datetime]
+    resume_newest: Optional[datetime.datetime]
+    # Set while the sync is paused at COMMENT_SYNC_MAX_PAGES
+    resume_page_token: Optional[str]
+
+
+class PipelineAborted(Exception):
+    """
+    Raised inside a stage when another stage has failed.
+    """
+
+
+class StreamingPipeline:
+    """
+    Extract, transform and load videos and comments as three overlapping stages.
+
+    The extract stage yields API pages, the transform stage turns each page into
+    DataFrames (a micro-batch of at most 50 videos or their comments), and the load
+    stage buffers frames and upserts them in fixed-size batches inside one
+    transaction per channel. Stages are joined by bounded queues, so a slow stage
+    blocks the ones feeding it and memory stays flat however large a channel is,
+    while loads overlap with API waits.
+    """
+    def __init__(
+        self,
+        api: YouTubeAPI,
+        loader: DataLoader,
+        discovery_mode: str = "latest",
+        video_limit: int = 50,
+        comment_video_limit: Optional[int] = None,
+        comment_max_pages: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        batch_rows: Optional[int] = None,
+        date_id: Optional[datetime.date] = None,
+        refresh_video_ids: Optional[Set[str]] = None
+    ):
+        """
+        Args:
+            api: YouTube API client.
+            loader: Database loader.
+            discovery_mode: 'latest' (newest `video_limit` uploads) or 'incremental' (high-water marks).
+            video_limit: Videos per channel in 'latest' mode.
+            comment_video_limit: Only sync comments of each channel's newest N videos (default: all).
+            comment_max_pages: commentThreads pages fetched per video and run. Defaults to
+                COMMENT_SYNC_MAX_PAGES env var (or 0, no limit).
+            queue_size: Capacity of each inter-stage queue. Defaults to PIPELINE_QUEUE_SIZE env var (or 8).
+            batch_rows: Buffered rows that trigger a load. Defaults to LOAD_BATCH_ROWS env var (or 5000).
+            date_id: Snapshot date the run's checkpoints are recorded under. Defaults to today.
+            refresh_video_ids: Tracked videos whose stats are re-read in 'incremental' mode
+                (e.g. the ones the tier scheduler finds due). Defaults to every tracked video.
+        """
+        if discovery_mode not in ("latest", "incremental"):
+            raise ValueError(f"Unknown discovery mode: {discovery_mode}")
+
+        self.api = api
+        self.loader = loader
+        self.discovery_mode = discovery_mode
+        self.video_limit = video_limit
+        self.comment_video_limit = comment_video_limit
+        self.comment_max_pages = (
+            comment_max_pages if comment_max_pages is not None else int(os.getenv("COMMENT_SYNC_MAX_PAGES", "0"))
+        )
+        self.queue_size = queue_size or int(os.getenv("PIPELINE_QUEUE_SIZE", "8"))
+        self.batch_rows = batch_rows or int(os.getenv("LOAD_BATCH_ROWS", "5000"))
+
+        self.date_id = date_id or datetime.date.today()
+        self.refresh_video_ids = refresh_video_ids
+
+        self.rows_loaded: Dict[str, int] = {table: 0 for table in LOAD_ORDER}
+        self.completed_channels: List[str] = []
+        self.failed_channels: Dict[str, BaseException] = {}
+        self._failed = threading.Event()
+        self._errors: List[BaseException] = []
+
+    def run(self, channel_ids: List[str]) -> Dict[str, int]:
+        """
+        Process the videos and comments of every channel.
+
+        Each channel is committed atomically together with its checkpoint. A channel
+        that fails is rolled back and recorded in `failed_channels`; the others continue.
+
+        Returns:
+            Rows upserted per table.
+
+        Raises:
+            The first unexpected exception raised by any stage.
+        """
+        raw_queue = queue.Queue(maxsize=self.queue_size)
+        frame_queue = queue.Queue(maxsize=self.queue_size)
+
+        stages = [
+            threading.Thread(target=self._run_stage, args=(self._extract, channel_ids, raw_queue), name="extract"),
+            threading.Thread(target=self._run_stage, args=(self._transform, raw_queue, frame_queue), name="transform"),
+            threading.Thread(target=self._run_stage, args=(self._load, frame_queue), name="load"),
+        ]
+        for stage in stages:
+            stage.start()
+        for stage in stages:
+            stage.join()
+
+        if self._errors:
+            raise self._errors[0]
+        return dict(self.rows_loaded)
+
+    # --------------------------------------------------
+    # Stage plumbing
+    # --------------------------------------------------
+
+    def _run_stage(self, target: Callable, *args) -> None:
+        try:
+            target(*args)
+        except PipelineAborted:
+            pass
+        except BaseException as e:
+            logger.error(f"Pipeline stage {threading.current_thread().name} failed: {e}")
+            self._errors.append(e)
+            self._failed.set()
+
+    def _put(self, q: queue.Queue, item: Any) -> None:
+        """
+        Blocking put that gives up if another stage has failed.
+        """
+        while True:
+            if self._failed.is_set():
+                raise PipelineAborted()
+            try:
+                q.put(item, timeout=0.2)
+                return
+            except queue.Full:
+                continue
+
+    def _get(self, q: queue.Queue) -> Any:
+        """
+        Blocking get that gives up if another stage has failed.
+        """
+        while True:
+            if self._failed.is_set():
+                raise PipelineAborted()
+            try:
+                return q.get(timeout=0.2)
+            except queue.Empty:
+                continue
+
+    # --------------------------------------------------
+    # Extract
+    # --------------------------------------------------
+
+    def _channel_pages(self, channel_id: str, watermarks: Dict[str, Dict[str, Any]]) -> Tuple[Iterator[List[Dict[str, Any]]], Optional[Dict[str, Any]]]:
+        """
+        Return an iterator over a channel's video pages and the channel's new high-water mark row.
+        """
+        if self.discovery_mode == "latest":
+            return self.api.iter_videos(channel_id, limit=self.video_limit), None
+
+        # Incremental: read only playlist pages newer than the high-water mark, then
+        # refresh stats for the new uploads plus the tracked videos due for a refresh.
+        watermark = watermarks.get(channel_id, {})
+        new_ids, new_watermark = self.api.get_new_video_ids(
+            channel_id,
+            last_video_id=watermark.get("last_video_id"),
+            last_published_at=watermark.get("last_published_at")
+        )
+        tracked_ids = self.loader.get_tracked_video_ids(channel_id)
+        due_ids = tracked_ids if self.refresh_video_ids is None else [
+            video_id for video_id in tracked_ids if video_id in self.refresh_video_ids
+        ]
+        logger.info(f"Channel {channel_id}: {len(new_ids)} new videos, {len(tracked_ids)} tracked, "
+                    f"{len(due_ids)} due for a refresh")
+
+        watermark_row = None
+        if new_watermark:
+            watermark_row = {
+                "channel_id": channel_id,
+                "last_video_id": new_watermark["video_id"],
+                "last_published_at": new_watermark["published_at"],
+                "updated_at": pd.Timestamp.now(tz="UTC")
+            }
+
+        video_ids = list(dict.fromkeys(new_ids + due_ids))
+        return self.api.iter_video_statistics(video_ids), watermark_row
+
+    def _sync_comments(self, raw_videos: List[Dict[str, Any]]) -> Dict[str, CommentSync]:
+        """
+        Fetch the new comments of the videos whose commentCount changed since their last
+        sync, and continue the syncs an earlier run paused at the page limit.
+        
+        Returns:
+            Mapping of video ID to its sync result for every video synced successfully.
+        """
+        cursors = self.loader.get_comment_cursors([video["id"] for video in raw_videos])
+        since_by_video = {}
+        page_tokens = {}
+        counts = {}
+        for video in raw_videos:
+            count = int(video.get("statistics", {}).get("commentCount") or 0)
+            cursor = cursors.get(video["id"])
+            if cursor is None and count == 0:
+                continue
+            if cursor is not None and cursor["comment_count"] == count and not cursor["resume_page_token"]:
+                continue
+            since_by_video[video["id"]] = cursor["newest_published_at"] if cursor else None
+            if cursor and cursor["resume_page_token"]:
+                page_tokens[video["id"]] = cursor["resume_page_token"]
+            counts[video["id"]] = count
+
+        recorder.add("extract.comment_sync", rows_in=len(raw_videos), rows_out=len(since_by_video))
+        if not since_by_video:
+            return {}
+        results = self.api.get_new_comments_for_videos(
+            since_by_video, max_pages=self.comment_max_pages, page_tokens=page_tokens
+        )
+        syncs = {}
+        for video_id, result in results.items():
+            if result is None:
+                continue
+            threads, next_page_token = result
+            cursor = cursors.get(video_id) or {}
+            syncs[video_id] = CommentSync(
+                threads=threads,
+                # A resumed sync misses comments posted since it was paused, so the count
+                # is left unset and the next run checks the newest page again
+                comment_count=None if video_id in page_tokens else counts[video_id],
+                previous_count=cursor.get("comment_count"),
+                since=since_by_video[video_id],
+                resume_newest=cursor.get("resume_newest_published_at"),
+                resume_page_token=next_page_token,
+            )
+        return syncs
+
+    def _extract(self, channel_ids: List[str], out: queue.Queue) -> None:
+        watermarks = self.loader.get_channel_watermarks() if self.discovery_mode == "incremental" else {}
+
+        for channel_id in channel_ids:
+            logger.info(f"Processing videos for channel: {channel_id}")
+            try:
+                pages, watermark_row = self._channel_pages(channel_id, watermarks)
+
+                videos_seen = 0
+                for raw_videos in pages:
+                    if not raw_videos:
+                        continue
+                    self._put(out, ("videos", channel_id, raw_videos))
+
+                    # Pages are newest first, so a limit keeps comments to the channel's newest videos
+                    candidates = raw_videos
+                    if self.comment_video_limit is not None:
+                        candidates = raw_videos[:max(0, self.comment_video_limit - videos_seen)]
+                    videos_seen += len(raw_videos)
+                    comments = self._sync_comments(candidates)
+                    if comments:
+                        self._put(out, ("comments", channel_id, comments))
+
+                if videos_seen == 0:
+                    logger.info(f"No videos found for channel {channel_id}")
+                self._put(out, ("channel_done", channel_id, watermark_row))
+            except PipelineAborted:
+                raise
+            except QuotaExceededError as e:
+                logger.warning(f"Stopping extraction early: {e}")
+                self._put(out, ("channel_failed", channel_id, e))
+                break
+            except Exception as e:
+                # Isolate the failure: drop this channel's partial load and carry on
+                logger.error(f"Extraction failed for channel {channel_id}: {e}")
+                self._put(out, ("channel_failed", channel_id, e))
+
+        self._put(out, _END)
+
+    # --------------------------------------------------
+    # Transform
+    # --------------------------------------------------
+
+    def _transform(self, inp: queue.Queue, out: queue.Queue) -> None:
+        while True:
+            item = self._get(inp)
+            if item is _END:
+                self._put(out, _END)
+                return
+
+            kind, channel_id, payload = item
+            if kind == "videos":
+                dim_video_df, fact_video_df = process_videos(payload, self.date_id)
+                fact_video_df["snapshot_at"] = pd.Timestamp.now(tz="UTC")
+                self._put(out, ("frame", channel_id, ("dim_video", dim_video_df)))
+                self._put(out, ("frame", channel_id, ("fact_video_daily", fact_video_df)))
+            elif kind == "comments":
+                frames = []
+                cursors = []
+                for video_id, sync in payload.items():
+                    newest = sync.resume_newest
+                    if sync.threads:
+                        frame = process_comments(sync.threads, video_id)
+                        frames.append(frame)
+                        latest = pd.to_datetime(frame["published_at"], utc=True).max()
+                        if pd.notna(latest) and (newest is None or latest > newest):
+                            newest = latest
+                    if sync.resume_page_token:
+                        # Paused before reaching `since`: keep the cursor where it was and
+                        # remember where to continue, so the gap is filled by later runs
+                        cursor = {
+                            "comment_count": sync.previous_count,
+                            "newest_published_at": sync.since,
+                            "resume_page_token": sync.resume_page_token,
+                            "resume_newest_published_at": newest,
+                        }
+                    else:
+                        if newest is None or (sync.since is not None and sync.since > newest):
+                            newest = sync.since
+                        cursor = {
+                            "comment_count": sync.comment_count,
+                            "newest_published_at": newest,
+                            "resume_page_token": None,
+                            "resume_newest_published_at": None,
+                        }
+                    cursors.append({"video_id": video_id, **cursor, "synced_at": pd.Timestamp.now(tz="UTC")})
+                if frames:
+                    self._put(out, ("frame", channel_id, ("youtube_comments", pd.concat(frames, ignore_index=True))))
+                self._put(out, ("frame", channel_id, ("comment_cursors", pd.DataFrame(cursors))))
+            elif kind == "channel_done":
+                if payload:
+                    self._put(out, ("frame", channel_id, ("channel_watermarks", pd.DataFrame([payload]))))
+                self._put(out, ("channel_done", channel_id, None))
+            else:
+                self._put(out, item)
+
+    # --------------------------------------------------
+    # Load
+    # --------------------------------------------------
+
+    def _load(self, inp: queue.Queue) -> None:
+        """
+        Load each channel in its own transaction, committed together with its checkpoint.
+        
+        Within the transaction, buffered frames are still flushed every `batch_rows` rows,
+        so memory stays bounded; a failure rolls back everything loaded for that channel.
+        """
+        buffers: Dict[str, List[pd.DataFrame]] = {table: [] for table in LOAD_ORDER}
+        buffered_rows = 0
+        conn = None
+        transaction = None
+
+        def begin() -> None:
+            nonlocal conn, transaction
+            if transaction is None:
+                conn = self.loader.engine.connect()
+                transaction = conn.begin()
+
+        def close(commit: bool) -> None:
+            nonlocal conn, transaction, buffered_rows
+            try:
+                if transaction is not None:
+                    if commit:
+                        transaction.commit()
+                    else:
+                        transaction.rollback()
+            finally:
+                if conn is not None:
+                    conn.close()
+                conn = transaction = None
+                buffered_rows = 0
+                for frames in buffers.values():
+                    frames.clear()
+
+        while True:
+            item = self._get(inp)
+            if item is _END:
+                close(commit=False)
+                return
+
+            kind, item_channel_id, payload = item
+            if item_channel_id in self.failed_channels:
+                continue
+
+            try:
+                if kind == "frame":
+                    begin()
+                    table, df = payload
+                    buffers[table].append(df)
+                    buffered_rows += len(df)
+                    if buffered_rows >= self.batch_rows:
+                        self._flush(buffers, conn)
+                        buffered_rows = 0
+                elif kind == "channel_done":
+                    begin()
+                    self._flush(buffers, conn)
+                    self.loader.mark_completed([item_channel_id], self.date_id, CHECKPOINT_STAGE, conn=conn)
+                    close(commit=True)
+                    self.completed_channels.append(item_channel_id)
+                elif kind == "channel_failed":
+                    close(commit=False)
+                    self.failed_channels[item_channel_id] = payload
+            except Exception as e:
+                logger.error(f"Load failed for channel {item_channel_id}, rolling back: {e}")
+                close(commit=False)
+                self.failed_channels[item_channel_id] = e
+
+    def _flush(self, buffers: Dict[str, List[pd.DataFrame]], conn) -> None:
+        """
+        Upsert every buffered table in foreign-key order within `conn`'s transaction and empty the buffers.
+        """
+        for table, unique_keys in LOAD_ORDER.items():
+            frames = buffers[table]
+            if not frames:
+                continue
+            df = pd.concat(frames, ignore_index=True).drop_duplicates(subset=unique_keys, keep="last")
+            logger.info(f"Loading {len(df)} rows into {table}...")
+            self.rows_loaded[table] += self.loader.load_data(df, table, unique_keys, conn=conn)
+            frames.clear()
@@ -0,0 +1,117 @@
+import os
+import sys
+import logging
+import argparse
+import datetime
+import pandas as pd
+from dotenv import load_dotenv
+
+# Add src to path to allow imports if running directly
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.extract.youtube_api import YouTubeAPI
+from src.extract.quota import QuotaExceededError
+from src.transform.clean_data import process_videos_columnar as process_videos
+from src.load.load_sql import DataLoader
+from src.load.partitions import ensure_partitions
+from src.main import finish_run, refresh_analytics
+from src.metrics import recorder
+from src.scheduler import load_candidates, plan_batches
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.StreamHandler(sys.stdout)
+    ]
+)
+logger = logging.getLogger(__name__)
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Refresh the stats of due videos by tier (hot videos hourly)")
+    parser.add_argument("--budget", type=int, default=int(os.getenv("REFRESH_QUOTA_BUDGET", "500")),
+                        help="Quota units (50-video batches) this run may spend")
+    parser.add_argument("--dry-run", action="store_true", help="Only show what is due")
+    return parser.parse_args(argv)
+
+
+def refresh_videos(api: YouTubeAPI, loader: DataLoader, budget: int, dry_run: bool = False) -> int:
+    """
+    Refresh the videos the scheduler picks, within `budget` quota units.
+
+    Each batch's snapshot goes into fact_video_intraday and overwrites the video's row
+    for today in fact_video_daily.
+
+    Returns:
+        Number of videos refreshed.
+    """
+    now = datetime.datetime.now(datetime.timezone.utc)
+    date_id = datetime.date.today()
+    with loader.engine.connect() as conn:
+        candidates = load_candidates(conn, now)
+
+    # The pool's headroom also counts what other runs sharing the keys spent today
+    max_batches = min(budget, api.quota.remaining, api.keys.remaining)
+    batches, due_by_tier = plan_batches(candidates, now, max_batches)
+    planned = sum(len(batch) for batch in batches)
+    logger.info(f"{len(candidates)} tracked videos, due by tier: {due_by_tier}; "
+                f"refreshing {planned} in {len(batches)} batches (budget {max_batches} units)")
+    if dry_run or not batches:
+        return 0
+
+    with loader.transaction() as conn:
+        ensure_partitions(conn, date_id, date_id)
+
+    refreshed = 0
+    try:
+        for raw_videos in api.iter_video_batches(batches):
+            if not raw_videos:
+                continue
+            dim_video_df, fact_video_df = process_videos(raw_videos, date_id)
+            fact_video_df["snapshot_at"] = pd.Timestamp.now(tz="UTC")
+            with loader.transaction() as conn:
+                loader.load_data(dim_video_df, "dim_video", ["video_id"], conn=conn)
+                loader.load_data(fact_video_df, "fact_video_daily", ["video_id", "date_id"], conn=conn)
+                loader.load_data(
+                    fact_video_df[["video_id", "snapshot_at", "date_id", "views", "likes", "comments"]],
+                    "fact_video_intraday", ["video_id", "snapshot_at"], conn=conn
+                )
+            refreshed += len(fact_video_df)
+    except QuotaExceededError as e:
+        logger.warning(f"Stopping refresh early: {e}")
+    return refreshed
+
+
+def main(argv=None):
+    load_dotenv()
+    args = parse_args(argv)
+    recorder.reset()
+    run = {
+        "date_id": datetime.date.today(),
+        "started_at": recorder.started_at,
+        "status": "failed",
+        "channels_total": 0,
+        "channels_failed": 0,
+        "error": None,
+    }
+    api = loader = None
+    try:
+        api = YouTubeAPI()
+        loader = DataLoader()
+        refreshed = refresh_videos(api, loader, args.budget, dry_run=args.dry_run)
+        if refreshed:
+            refresh_analytics(loader, run["date_id"])
+        logger.info(f"Refreshed {refreshed} videos using {api.quota.used} quota units")
+        run["status"] = "success"
+    except Exception as e:
+        run["error"] = str(e)
+        logger.exception(f"Refresh failed: {e}")
+        sys.exit(1)
+    finally:
+        if not args.dry_run:
+            finish_run(run, api, loader)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+import os
+import sys
+import logging
+import argparse
+import datetime
+import itertools
+from typing import Any, Dict, Iterator, List
+import pandas as pd
+from dotenv import load_dotenv
+
+# Add src to path to allow imports if running directly
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.extract.landing import iter_landed_responses, landed_dates
+from src.transform.clean_data import (
+    process_channels_columnar as process_channels,
+    process_videos_columnar as process_videos,
+    process_comments_columnar as process_comments
+)
+from src.load.load_sql import DataLoader
+from src.load.partitions import ensure_partitions
+from src.load.rollups import update_daily_rollups
+from src.metrics import recorder
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.StreamHandler(sys.stdout)
+    ]
+)
+logger = logging.getLogger(__name__)
+
+# Landed endpoints replayed, in foreign-key order (playlistItems only served video discovery)
+REPLAY_ENDPOINTS = ("channels", "videos", "commentThreads")
+
+# Upsert keys of the replayed tables
+TABLE_KEYS = {
+    "dim_channel": ["channel_id"],
+    "fact_channel_daily": ["channel_id", "date_id"],
+    "dim_video": ["video_id"],
+    "fact_video_daily": ["video_id", "date_id"],
+    "youtube_comments": ["comment_id"],
+}
+
+DIMENSION_TABLES = ("dim_channel", "dim_video")
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Re-run transform and load from the raw landing zone (no API calls)")
+    parser.add_argument("--path", default=os.getenv("RAW_LANDING_PATH"), help="Landing zone root (default: RAW_LANDING_PATH)")
+    parser.add_argument("--since", type=datetime.date.fromisoformat, default=None, help="First date_id to replay")
+    parser.add_argument("--until", type=datetime.date.fromisoformat, default=None, help="Last date_id to replay")
+    parser.add_argument("--batch-records", type=int, default=int(os.getenv("REPLAY_BATCH_RECORDS", "200")),
+                        help="Landed responses transformed and loaded per batch")
+    parser.add_argument("--facts-only", action="store_true",
+                        help="Skip dim_channel/dim_video so older snapshots don't overwrite current attributes")
+    return parser.parse_args(argv)
+
+
+def _batches(records: Iterator[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    while True:
+        batch = list(itertools.islice(records, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _transform(endpoint: str, batch: List[Dict[str, Any]], date_id: datetime.date) -> Dict[str, pd.DataFrame]:
+    """
+    Transform a batch of landed responses into the frames to load, keyed by table.
+    """
+    if endpoint == "commentThreads":
+        frames = [
+            process_comments(record["data"]["items"], record["params"]["videoId"])
+            for record in batch
+            if record["data"].get("items")
+        ]
+        return {"youtube_comments": pd.concat(frames, ignore_index=True)} if frames else {}
+
+    items = [item for record in batch for item in record["data"].get("items", [])]
+    if not items:
+        return {}
+    if endpoint == "channels":
+        dim_df, fact_df = process_channels(items, date_id)
+        tables = ("dim_channel", "fact_channel_daily")
+    else:
+        dim_df, fact_df = process_videos(items, date_id)
+        fact_df["snapshot_at"] = pd.to_datetime(
+            [record["fetched_at"] for record in batch for _ in record["data"].get("items", [])], utc=True
+        )
+        tables = ("dim_video", "fact_video_daily")
+    return dict(zip(tables, (dim_df, fact_df)))
+
+
+def replay_date(
+    loader: DataLoader,
+    root: str,
+    date_id: datetime.date,
+    batch_records: int = 200,
+    facts_only: bool = False
+) -> Dict[str, int]:
+    """
+    Re-transform and load every landed response of `date_id`, streaming `batch_records` responses at a time.
+
+    Args:
+        loader: Database loader.
+        root: Landing zone root.
+        date_id: Date partition to replay.
+        batch_records: Responses held in memory per batch.
+        facts_only: Skip the dimension tables.
+
+    Returns:
+        Rows upserted per table.
+    """
+    with loader.transaction() as conn:
+        ensure_partitions(conn, date_id, date_id)
+
+    rows_loaded: Dict[str, int] = {}
+    for endpoint in REPLAY_ENDPOINTS:
+        for batch in _batches(iter_landed_responses(root, date_id, endpoint), batch_records):
+            frames = _transform(endpoint, batch, date_id)
+            with loader.transaction() as conn:
+                for table, df in frames.items():
+                    if facts_only and table in DIMENSION_TABLES:
+                        continue
+                    unique_keys = TABLE_KEYS[table]
+                    # A response can be landed more than once (e.g. a resumed run); the latest one wins
+                    if "snapshot_at" in df.columns:
+                        df = df.sort_values("snapshot_at", kind="stable")
+                    df = df.drop_duplicates(subset=unique_keys, keep="last")
+                    rows_loaded[table] = rows_loaded.get(table, 0) + loader.load_data(df, table, unique_keys, conn=conn)
+    return rows_loaded
+
+
+def main(argv=None):
+    load_dotenv()
+    args = parse_args(argv)
+    if not args.path:
+        logger.error("No landing zone given: pass --path or set RAW_LANDING_PATH.")
+        sys.exit(1)
+
+    dates = landed_dates(args.path, args.since, args.until)
+    if not dates:
+        logger.warning(f"No landed dates found under {args.path}")
+        sys.exit(0)
+
+    recorder.reset()
+    loader = DataLoader()
+    try:
+        # Oldest first, so the dimension rows end up with the newest attributes
+        for date_id in dates:
+            rows_loaded = replay_date(loader, args.path, date_id, args.batch_records, args.facts_only)
+            with recorder.timed("rollups.daily"), loader.transaction() as conn:
+                update_daily_rollups(conn, date_id)
+            logger.info(f"Replayed {date_id}: {rows_loaded}")
+        loader.refresh_materialized_views()
+    except Exception as e:
+        logger.exception(f"Replay failed: {e}")
+        sys.exit(1)
+    logger.info(f"Replayed {len(dates)} dates in {recorder.elapsed():.1f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+import heapq
+import logging
+import datetime
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+logger = logging.getLogger(__name__)
+
+# The videos endpoint accepts at most 50 IDs per call (1 quota unit)
+BATCH_SIZE = 50
+
+
+@dataclass(frozen=True)
+class RefreshTier:
+    """
+    How often videos of one tier are refreshed.
+
+    A video belongs to the first tier whose age or velocity condition it meets.
+    """
+    name: str
+    max_age_days: Optional[float]
+    min_views_per_day: Optional[float]
+    interval: datetime.timedelta
+
+
+# Hottest first; the last tier catches everything else
+TIERS = (
+    RefreshTier("hot", max_age_days=2, min_views_per_day=50000, interval=datetime.timedelta(hours=1)),
+    RefreshTier("warm", max_age_days=30, min_views_per_day=1000, interval=datetime.timedelta(days=1)),
+    RefreshTier("cool", max_age_days=365, min_views_per_day=50, interval=datetime.timedelta(days=7)),
+    RefreshTier("cold", max_age_days=None, min_views_per_day=None, interval=datetime.timedelta(days=30)),
+)
+
+# A video counts as due slightly before its interval has fully elapsed, so hourly
+# runs that start a few minutes early don't skip a whole cycle
+DUE_SLACK = 0.1
+
+# Candidates: every tracked video with its last snapshot time (looked back far
+# enough to cover the slowest tier) and its views gained per day over the last week
+# (summed, so gains of videos refreshed less than daily are spread over the window)
+CANDIDATES_SQL = """
+WITH last_snapshot AS (
+    SELECT video_id, MAX(COALESCE(snapshot_at, date_id::TIMESTAMPTZ)) AS refreshed_at
+    FROM fact_video_daily
+    WHERE date_id >= :snapshot_since
+    GROUP BY video_id
+),
+velocity AS (
+    SELECT video_id, SUM(views_gained)::FLOAT / :velocity_days AS views_per_day
+    FROM agg_video_daily
+    WHERE date_id >= :velocity_since AND views_gained IS NOT NULL
+    GROUP BY video_id
+)
+SELECT dv.video_id, dv.published_at, ls.refreshed_at, v.views_per_day
+FROM dim_video dv
+LEFT JOIN last_snapshot ls ON ls.video_id = dv.video_id
+LEFT JOIN velocity v ON v.video_id = dv.video_id
+"""
+
+
+@dataclass
+class Candidate:
+    video_id: str
+    published_at: Optional[datetime.datetime]
+    refreshed_at: Optional[datetime.datetime]
+    views_per_day: Optional[float]
+
+
+def load_candidates(conn: Connection, now: datetime.datetime, velocity_days: int = 7) -> List[Candidate]:
+    """
+    Read every tracked video with the inputs of its tier and due time.
+    """
+    today = now.date()
+    rows = conn.execute(text(CANDIDATES_SQL), {
+        "snapshot_since": today - 2 * max(tier.interval for tier in TIERS),
+        "velocity_since": today - datetime.timedelta(days=velocity_days),
+        "velocity_days": velocity_days,
+    }).all()
+    return [
+        Candidate(video_id, published_at, refreshed_at, float(views_per_day) if views_per_day is not None else None)
+        for video_id, published_at, refreshed_at, views_per_day in rows
+    ]
+
+
+def assign_tier(candidate: Candidate, now: datetime.datetime) -> int:
+    """
+    Return the index in TIERS of the first tier the video qualifies for.
+    """
+    age_days = (now - candidate.published_at).total_seconds() / 86400 if candidate.published_at else None
+    for index, tier in enumerate(TIERS):
+        young = tier.max_age_days is not None and age_days is not None and age_days <= tier.max_age_days
+        fast = (
+            tier.min_views_per_day is not None
+            and candidate.views_per_day is not None
+            and candidate.views_per_day >= tier.min_views_per_day
+        )
+        if young or fast or (tier.max_age_days is None and tier.min_views_per_day is None):
+            return index
+    return len(TIERS) - 1
+
+
+def plan_batches(
+    candidates: List[Candidate],
+    now: datetime.datetime,
+    max_batches: int
+) -> Tuple[List[List[str]], Dict[str, int]]:
+    """
+    Pick the videos due for a refresh, most urgent first, and group them into 50-ID batches.
+
+    Videos are ordered by tier, then by how overdue they are relative to their tier's
+    interval (never-refreshed videos first). Only `max_batches` batches (one quota
+    unit each) are planned; the rest wait for the next run.
+
+    Returns:
+        The batches, and the number of due videos per tier (planned or not).
+    """
+    queue = []
+    due_by_tier = {tier.name: 0 for tier in TIERS}
+    for candidate in candidates:
+        index = assign_tier(candidate, now)
+        interval = TIERS[index].interval.total_seconds()
+        if candidate.refreshed_at is None:
+            overdue = float("inf")
+        else:
+            overdue = (now - candidate.refreshed_at).total_seconds() / interval
+            if overdue < 1 - DUE_SLACK:
+                continue
+        due_by_tier[TIERS[index].name] += 1
+        queue.append((index, -overdue, candidate.video_id))
+
+    heapq.heapify(queue)
+    batches: List[List[str]] = []
+    while queue and len(batches) < max_batches:
+        batch = [heapq.heappop(queue)[2] for _ in range(min(BATCH_SIZE, len(queue)))]
+        batches.append(batch)
+    return batches, due_by_tier
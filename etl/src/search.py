@@ -0,0 +1,160 @@
+import os
+import sys
+import argparse
+from typing import Any, Dict, List, Optional
+from dotenv import load_dotenv
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+# Add src to path to allow imports if running directly
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.load.load_sql import DataLoader
+
+# Text search configuration of the generated search_vector columns (see sql/schema.sql)
+TS_CONFIG = "english"
+
+# websearch_to_tsquery accepts what analysts type: words, "quoted phrases", OR, -excluded
+SEARCH_COMMENTS_SQL = f"""
+SELECT c.comment_id, c.video_id, c.author_name, c.text, c.like_count, c.published_at,
+       ts_rank_cd(c.search_vector, q) AS rank
+FROM youtube_comments c, websearch_to_tsquery('{TS_CONFIG}', :query) q
+WHERE c.search_vector @@ q
+  AND (CAST(:video_id AS TEXT) IS NULL OR c.video_id = :video_id)
+ORDER BY rank DESC, c.like_count DESC NULLS LAST
+LIMIT :limit
+"""
+
+SEARCH_VIDEOS_SQL = f"""
+SELECT v.video_id, v.channel_id, v.title, v.published_at, ts_rank_cd(v.search_vector, q) AS rank
+FROM dim_video v, websearch_to_tsquery('{TS_CONFIG}', :query) q
+WHERE v.search_vector @@ q
+ORDER BY rank DESC
+LIMIT :limit
+"""
+
+# Substring match; served by the trigram index when pg_trgm is installed
+SUBSTRING_COMMENTS_SQL = """
+SELECT comment_id, video_id, author_name, text, like_count, published_at
+FROM youtube_comments
+WHERE text ILIKE '%' || :pattern || '%'
+ORDER BY like_count DESC NULLS LAST
+LIMIT :limit
+"""
+
+# Comments matching the query and total occurrences of its terms, per video
+TERM_COUNTS_SQL = f"""
+WITH q AS (
+    SELECT websearch_to_tsquery('{TS_CONFIG}', :query) AS query,
+           tsvector_to_array(to_tsvector('{TS_CONFIG}', :query)) AS lexemes
+)
+SELECT c.video_id, v.title, COUNT(DISTINCT c.comment_id) AS comments,
+       SUM(array_length(t.positions, 1)) AS occurrences
+FROM youtube_comments c
+CROSS JOIN q
+JOIN dim_video v ON v.video_id = c.video_id
+CROSS JOIN LATERAL unnest(c.search_vector) t
+WHERE c.search_vector @@ q.query AND t.lexeme = ANY(q.lexemes)
+GROUP BY c.video_id, v.title
+ORDER BY comments DESC, occurrences DESC
+LIMIT :limit
+"""
+
+# Most frequent lexemes in one video's comments (ndoc: comments containing it, nentry: occurrences)
+TOP_TERMS_SQL = """
+SELECT word, ndoc, nentry
+FROM ts_stat('SELECT search_vector FROM youtube_comments WHERE video_id = ' || quote_literal(:video_id))
+ORDER BY nentry DESC, ndoc DESC, word
+LIMIT :limit
+"""
+
+
+def _rows(conn: Connection, sql: str, **params: Any) -> List[Dict[str, Any]]:
+    return [dict(row) for row in conn.execute(text(sql), params).mappings().all()]
+
+
+def search_comments(conn: Connection, query: str, limit: int = 20, video_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Full-text search of comments, best match first (optionally within one video).
+    """
+    return _rows(conn, SEARCH_COMMENTS_SQL, query=query, limit=limit, video_id=video_id)
+
+
+def search_videos(conn: Connection, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+    """
+    Full-text search of video titles, tags and descriptions, best match first.
+    """
+    return _rows(conn, SEARCH_VIDEOS_SQL, query=query, limit=limit)
+
+
+def substring_comments(conn: Connection, pattern: str, limit: int = 20) -> List[Dict[str, Any]]:
+    """
+    Comments containing `pattern` anywhere (case-insensitive), for partial words and IDs.
+    """
+    escaped = pattern.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return _rows(conn, SUBSTRING_COMMENTS_SQL, pattern=escaped, limit=limit)
+
+
+def term_counts(conn: Connection, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+    """
+    Per video: how many comments match `query` and how often its terms occur in them.
+    """
+    return _rows(conn, TERM_COUNTS_SQL, query=query, limit=limit)
+
+
+def top_terms(conn: Connection, video_id: str, limit: int = 20) -> List[Dict[str, Any]]:
+    """
+    The most frequent (stemmed) terms in a video's comments.
+    """
+    return _rows(conn, TOP_TERMS_SQL, video_id=video_id, limit=limit)
+
+
+def print_rows(rows: List[Dict[str, Any]], width: int = 80) -> None:
+    if not rows:
+        print("No matches.")
+        return
+    columns = list(rows[0])
+    print(" | ".join(columns))
+    for row in rows:
+        values = [str(row[column]).replace("\n", " ") for column in columns]
+        print(" | ".join(value if len(value) <= width else value[:width - 3] + "..." for value in values))
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Keyword search over comments and video metadata")
+    parser.add_argument("--limit", type=int, default=20)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    comments = commands.add_parser("comments", help="Ranked full-text search of comments")
+    comments.add_argument("query")
+    comments.add_argument("--video-id", default=None)
+    videos = commands.add_parser("videos", help="Ranked full-text search of video titles, tags and descriptions")
+    videos.add_argument("query")
+    substring = commands.add_parser("substring", help="Comments containing a substring (ILIKE)")
+    substring.add_argument("pattern")
+    counts = commands.add_parser("counts", help="Matching comments and term occurrences per video")
+    counts.add_argument("query")
+    terms = commands.add_parser("terms", help="Most frequent terms in a video's comments")
+    terms.add_argument("video_id")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    load_dotenv()
+    args = parse_args(argv)
+    loader = DataLoader()
+    with loader.engine.connect() as conn:
+        if args.command == "comments":
+            rows = search_comments(conn, args.query, args.limit, args.video_id)
+        elif args.command == "videos":
+            rows = search_videos(conn, args.query, args.limit)
+        elif args.command == "substring":
+            rows = substring_comments(conn, args.pattern, args.limit)
+        elif args.command == "counts":
+            rows = term_counts(conn, args.query, args.limit)
+        else:
+            rows = top_terms(conn, args.video_id, args.limit)
+    print_rows(rows)
+
+if __name__ == "__main__":
+    main()
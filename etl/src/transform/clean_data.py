@@ -1,7 +1,13 @@
+import numpy as np
 import pandas as pd
 import re
-from typing import List, Dict, Any, Tuple
-from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple
+from datetime import date, datetime
+
+from src.metrics import instrumented
+
+# Regex to extract hours, minutes, seconds from an ISO 8601 duration
+DURATION_PATTERN = re.compile(r'PT(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?')
 
 def parse_duration(duration: str) -> int:
     """
@@ -10,9 +16,7 @@ def parse_duration(duration: str) -> int:
     if not duration:
         return 0
     
-    # Regex to extract hours, minutes, seconds
-    pattern = re.compile(r'PT(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?')
-    match = pattern.match(duration)
+    match = DURATION_PATTERN.match(duration)
     
     if not match:
         return 0
@@ -23,14 +27,17 @@ def parse_duration(duration: str) -> int:
     
     return hours * 3600 + minutes * 60 + seconds
 
-def process_channels(raw_items: List[Dict[str, Any]]) -> Tuple[pd.DataFrame, pd.DataFrame]:
+@instrumented("transform.channels")
+def process_channels(raw_items: List[Dict[str, Any]], date_id: Optional[date] = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
     """
     Process raw channel data into dim_channel and fact_channel_daily dataframes.
+
+    The facts are stamped with `date_id` (the run's snapshot date), defaulting to today.
     """
     dim_channel_data = []
     fact_channel_data = []
     
-    current_date = datetime.now().date()
+    current_date = date_id or datetime.now().date()
     
     for item in raw_items:
         snippet = item.get("snippet", {})
@@ -58,14 +65,17 @@ def process_channels(raw_items: List[Dict[str, Any]]) -> Tuple[pd.DataFrame, pd.
         
     return pd.DataFrame(dim_channel_data), pd.DataFrame(fact_channel_data)
 
-def process_videos(raw_items: List[Dict[str, Any]]) -> Tuple[pd.DataFrame, pd.DataFrame]:
+@instrumented("transform.videos")
+def process_videos(raw_items: List[Dict[str, Any]], date_id: Optional[date] = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
     """
     Process raw video data into dim_video and fact_video_daily dataframes.
+
+    The facts are stamped with `date_id` (the run's snapshot date), defaulting to today.
     """
     dim_video_data = []
     fact_video_data = []
     
-    current_date = datetime.now().date()
+    current_date = date_id or datetime.now().date()
     
     for item in raw_items:
         snippet = item.get("snippet", {})
@@ -96,6 +106,7 @@ def process_videos(raw_items: List[Dict[str, Any]]) -> Tuple[pd.DataFrame, pd.Da
         
     return pd.DataFrame(dim_video_data), pd.DataFrame(fact_video_data)
 
+@instrumented("transform.comments")
 def process_comments(raw_items: List[Dict[str, Any]], video_id: str) -> pd.DataFrame:
     """
     Process raw comment threads into a dataframe.
@@ -115,3 +126,116 @@ def process_comments(raw_items: List[Dict[str, Any]], video_id: str) -> pd.DataF
         })
         
     return pd.DataFrame(comments_data)
+
+
+# --------------------------------------------------
+# Columnar transforms
+# --------------------------------------------------
+# Same output as the row-wise functions above, but each column is pulled out of
+# the raw items in one pass and built straight into numpy arrays, instead of
+# assembling a dict per row. Durations are parsed once per distinct value.
+
+def _parse_counts(values: List[Any]) -> np.ndarray:
+    """
+    Convert a column of API count strings (e.g. '1234') straight into an int64 array.
+    """
+    return np.fromiter(map(int, values), dtype=np.int64, count=len(values))
+
+def parse_durations(durations: List[str]) -> np.ndarray:
+    """
+    Vectorized parse_duration: convert a column of ISO 8601 durations to seconds.
+    
+    Durations repeat heavily, so the column is factorized and only the distinct
+    values go through the regex; the results are broadcast back with a take.
+    """
+    codes, uniques = pd.factorize(pd.Series(durations, dtype=object))
+    unique_seconds = np.fromiter(map(parse_duration, uniques), dtype=np.int64, count=len(uniques))
+    # Missing durations get code -1, which picks the trailing 0
+    return np.append(unique_seconds, 0).take(codes)
+
+@instrumented("transform.channels")
+def process_channels_columnar(raw_items: List[Dict[str, Any]], date_id: Optional[date] = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Columnar equivalent of process_channels.
+    """
+    if not raw_items:
+        return pd.DataFrame(), pd.DataFrame()
+
+    ids = [item.get("id") for item in raw_items]
+    snippets = [item.get("snippet", {}) for item in raw_items]
+    statistics = [item.get("statistics", {}) for item in raw_items]
+    current_date = date_id or datetime.now().date()
+
+    dim_channel_df = pd.DataFrame({
+        "channel_id": ids,
+        "channel_name": [snippet.get("title") for snippet in snippets],
+        "description": [snippet.get("description") for snippet in snippets],
+        "custom_url": [snippet.get("customUrl") for snippet in snippets],
+        "published_at": [snippet.get("publishedAt") for snippet in snippets],
+        "thumbnail_url": [snippet.get("thumbnails", {}).get("high", {}).get("url") for snippet in snippets],
+        "country": [snippet.get("country") for snippet in snippets]
+    })
+
+    fact_channel_df = pd.DataFrame({
+        "channel_id": ids,
+        "date_id": [current_date] * len(ids),
+        "subscribers": _parse_counts([stats.get("subscriberCount", 0) for stats in statistics]),
+        "total_views": _parse_counts([stats.get("viewCount", 0) for stats in statistics]),
+        "total_videos": _parse_counts([stats.get("videoCount", 0) for stats in statistics])
+    })
+
+    return dim_channel_df, fact_channel_df
+
+@instrumented("transform.videos")
+def process_videos_columnar(raw_items: List[Dict[str, Any]], date_id: Optional[date] = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Columnar equivalent of process_videos.
+    """
+    if not raw_items:
+        return pd.DataFrame(), pd.DataFrame()
+
+    ids = [item.get("id") for item in raw_items]
+    snippets = [item.get("snippet", {}) for item in raw_items]
+    statistics = [item.get("statistics", {}) for item in raw_items]
+    current_date = date_id or datetime.now().date()
+
+    dim_video_df = pd.DataFrame({
+        "video_id": ids,
+        "channel_id": [snippet.get("channelId") for snippet in snippets],
+        "title": [snippet.get("title") for snippet in snippets],
+        "description": [snippet.get("description") for snippet in snippets],
+        "published_at": [snippet.get("publishedAt") for snippet in snippets],
+        "duration_seconds": parse_durations([item.get("contentDetails", {}).get("duration") for item in raw_items]),
+        "category": [snippet.get("categoryId") for snippet in snippets],
+        "tags": [snippet.get("tags", []) for snippet in snippets],
+        "thumbnail_url": [snippet.get("thumbnails", {}).get("high", {}).get("url") for snippet in snippets]
+    })
+
+    fact_video_df = pd.DataFrame({
+        "video_id": ids,
+        "date_id": [current_date] * len(ids),
+        "views": _parse_counts([stats.get("viewCount", 0) for stats in statistics]),
+        "likes": _parse_counts([stats.get("likeCount", 0) for stats in statistics]),
+        "comments": _parse_counts([stats.get("commentCount", 0) for stats in statistics])
+    })
+
+    return dim_video_df, fact_video_df
+
+@instrumented("transform.comments")
+def process_comments_columnar(raw_items: List[Dict[str, Any]], video_id: str) -> pd.DataFrame:
+    """
+    Columnar equivalent of process_comments.
+    """
+    if not raw_items:
+        return pd.DataFrame()
+
+    top_comments = [item.get("snippet", {}).get("topLevelComment", {}).get("snippet", {}) for item in raw_items]
+
+    return pd.DataFrame({
+        "comment_id": [item.get("id") for item in raw_items],
+        "video_id": [video_id] * len(raw_items),
+        "author_name": [comment.get("authorDisplayName") for comment in top_comments],
+        "text": [comment.get("textDisplay") for comment in top_comments],
+        "like_count": _parse_counts([comment.get("likeCount", 0) for comment in top_comments]),
+        "published_at": [comment.get("publishedAt") for comment in top_comments]
+    })
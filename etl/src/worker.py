@@ -0,0 +1,215 @@
+import os
+import sys
+import time
+import socket
+import logging
+import argparse
+import datetime
+import threading
+from typing import List
+from dotenv import load_dotenv
+
+# Add src to path to allow imports if running directly
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.extract.youtube_api import YouTubeAPI
+from src.extract.quota import QuotaExceededError, next_reset
+from src.load.load_sql import DataLoader
+from src.jobs import FAILED, Job, JobQueue
+from src.main import finish_run, process_channel_batch, refresh_analytics
+from src.metrics import recorder
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.StreamHandler(sys.stdout)
+    ]
+)
+logger = logging.getLogger(__name__)
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="YouTube Analytics Pipeline (coordinator/worker mode)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    enqueue = commands.add_parser("enqueue", help="Queue one job per channel in CHANNEL_IDS for a date")
+    enqueue.add_argument("--date-id", type=datetime.date.fromisoformat, default=None, help="Defaults to today")
+    enqueue.add_argument("--retry-failed", action="store_true", help="Also reset that date's failed jobs")
+
+    work = commands.add_parser("work", help="Claim and process queued jobs")
+    work.add_argument("--date-id", type=datetime.date.fromisoformat, default=None,
+                      help="Only claim jobs of this date (default: any date, oldest first)")
+    work.add_argument("--exit-when-empty", action="store_true", help="Stop once no job is claimable")
+
+    finalize = commands.add_parser("finalize", help="Rebuild rollups and refresh views for a date")
+    finalize.add_argument("--date-id", type=datetime.date.fromisoformat, default=None, help="Defaults to today")
+
+    status = commands.add_parser("status", help="Show job counts for a date")
+    status.add_argument("--date-id", type=datetime.date.fromisoformat, default=None, help="Defaults to today")
+    return parser.parse_args(argv)
+
+
+class LeaseKeeper:
+    """
+    Background thread that renews the leases of the jobs being processed.
+    """
+    def __init__(self, jobs_queue: JobQueue, jobs: List[Job], worker_id: str):
+        self.jobs_queue = jobs_queue
+        self.jobs = jobs
+        self.worker_id = worker_id
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="lease-keeper", daemon=True)
+
+    def __enter__(self) -> "LeaseKeeper":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        interval = max(1, self.jobs_queue.lease_seconds // 3)
+        while not self._stop.wait(interval):
+            try:
+                self.jobs_queue.heartbeat(self.jobs, self.worker_id)
+            except Exception as e:
+                logger.warning(f"Lease heartbeat failed: {e}")
+
+
+def process_jobs(
+    api: YouTubeAPI,
+    loader: DataLoader,
+    jobs_queue: JobQueue,
+    jobs: List[Job],
+    worker_id: str,
+    discovery_mode: str
+) -> None:
+    """
+    Process one claimed batch (all jobs share a date_id) and record each job's result.
+
+    Jobs left undone because the quota ran out are released without using up an attempt.
+
+    Raises:
+        QuotaExceededError: If the quota ran out, after the batch's results are recorded.
+    """
+    date_id = jobs[0].date_id
+    recorder.reset()
+    run = {
+        "date_id": date_id,
+        "started_at": recorder.started_at,
+        "status": "failed",
+        "channels_total": len(jobs),
+        "channels_failed": 0,
+        "error": None,
+    }
+    try:
+        with LeaseKeeper(jobs_queue, jobs, worker_id):
+            # resume: a reclaimed job skips the stages its previous worker already committed
+            failed = process_channel_batch(
+                api, loader, [job.channel_id for job in jobs], date_id, discovery_mode, resume=True
+            )
+    except Exception as e:
+        logger.exception(f"Batch of {len(jobs)} jobs failed: {e}")
+        failed = {job.channel_id: e for job in jobs}
+        run["error"] = str(e)
+
+    out_of_quota = [job for job in jobs if isinstance(failed.get(job.channel_id), QuotaExceededError)]
+    jobs_queue.release(out_of_quota, worker_id, "quota used up")
+    for job in jobs:
+        if job in out_of_quota:
+            continue
+        if job.channel_id in failed:
+            jobs_queue.fail(job, worker_id, str(failed[job.channel_id]))
+        else:
+            jobs_queue.complete(job, worker_id)
+
+    run["channels_failed"] = len(failed)
+    if not failed:
+        run["status"] = "success"
+    elif len(failed) < len(jobs):
+        run["status"] = "partial"
+    finish_run(run, api, loader)
+
+    if out_of_quota:
+        raise QuotaExceededError(f"Quota used up; released {len(out_of_quota)} jobs")
+
+
+def work(args: argparse.Namespace, jobs_queue: JobQueue, loader: DataLoader) -> None:
+    worker_id = f"{socket.gethostname()}-{os.getpid()}"
+    batch_size = int(os.getenv("WORKER_BATCH_SIZE", "10"))
+    poll_seconds = float(os.getenv("WORKER_POLL_SECONDS", "5"))
+    discovery_mode = os.getenv("VIDEO_DISCOVERY_MODE", "latest").lower()
+    api = YouTubeAPI()
+    logger.info(f"Worker {worker_id} started (batches of {batch_size})")
+
+    while True:
+        jobs = jobs_queue.claim(worker_id, limit=batch_size, date_id=args.date_id)
+        if not jobs:
+            if args.exit_when_empty:
+                logger.info(f"Worker {worker_id}: no claimable jobs left, exiting")
+                return
+            time.sleep(poll_seconds)
+            continue
+
+        # A claim can span dates; process each date's jobs as their own batch
+        dates = sorted({job.date_id for job in jobs})
+        try:
+            for i, date_id in enumerate(dates):
+                batch = [job for job in jobs if job.date_id == date_id]
+                process_jobs(api, loader, jobs_queue, batch, worker_id, discovery_mode)
+
+                # The worker that drains a date publishes it (idempotent if two race here)
+                if jobs_queue.outstanding(date_id) == 0:
+                    logger.info(f"All jobs for {date_id} finished, refreshing analytics")
+                    refresh_analytics(loader, date_id)
+        except QuotaExceededError as e:
+            # The rest of the claim was never started; hand it back as well
+            jobs_queue.release([job for job in jobs if job.date_id in dates[i + 1:]], worker_id, "quota used up")
+            if args.exit_when_empty:
+                raise
+            # Sleeping instead of exiting keeps a restarting container from claiming (and
+            # burning attempts on) jobs it cannot process until the quota resets
+            wake_at = next_reset()
+            logger.warning(f"Worker {worker_id}: {e}, sleeping until the quota reset at "
+                           f"{datetime.datetime.fromtimestamp(wake_at, datetime.timezone.utc):%Y-%m-%d %H:%M} UTC")
+            time.sleep(max(0.0, wake_at - time.time()))
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    load_dotenv()
+    loader = DataLoader()
+    jobs_queue = JobQueue(loader.engine)
+    date_id = getattr(args, "date_id", None) or datetime.date.today()
+
+    try:
+        if args.command == "enqueue":
+            channel_ids_env = os.getenv("CHANNEL_IDS") or os.getenv("YOUTUBE_CHANNEL_IDS", "")
+            channel_ids = [cid.strip() for cid in channel_ids_env.split(",") if cid.strip()]
+            if not channel_ids:
+                logger.error("CHANNEL_IDS (or YOUTUBE_CHANNEL_IDS) environment variable is not set.")
+                sys.exit(1)
+            jobs_queue.enqueue(date_id, channel_ids, retry_failed=args.retry_failed)
+            logger.info(f"Jobs for {date_id}: {jobs_queue.counts(date_id)}")
+        elif args.command == "work":
+            work(args, jobs_queue, loader)
+        elif args.command == "finalize":
+            refresh_analytics(loader, date_id)
+            logger.info(f"Jobs for {date_id}: {jobs_queue.counts(date_id)}")
+        elif args.command == "status":
+            counts = jobs_queue.counts(date_id)
+            logger.info(f"Jobs for {date_id}: {counts}")
+            if counts[FAILED]:
+                sys.exit(1)
+    except QuotaExceededError as e:
+        logger.error(str(e))
+        sys.exit(1)
+    except Exception as e:
+        logger.exception(f"Worker command {args.command} failed: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+import pytest
+from dotenv import load_dotenv
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from src.load.load_sql import DataLoader
+
+
+@pytest.fixture(scope="session")
+def loader():
+    """
+    DataLoader for the database in the environment (.env); tests using it are skipped without one.
+    """
+    load_dotenv()
+    try:
+        loader = DataLoader()
+        with loader.engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    except (ValueError, OperationalError) as e:
+        pytest.skip(f"No database available: {e}")
+    yield loader
+    loader.engine.dispose()
@@ -0,0 +1,59 @@
+from datetime import datetime, timezone
+
+import pytest
+import requests
+
+from src.extract.youtube_api import YouTubeAPI
+
+# 250 threads, newest first, one per minute
+TIMES = [datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc).timestamp() - 60 * i for i in range(250)]
+
+
+def thread(i):
+    published = datetime.fromtimestamp(TIMES[i], timezone.utc).isoformat()
+    return {"id": f"t{i}", "snippet": {"topLevelComment": {"snippet": {"publishedAt": published}}}}
+
+
+@pytest.fixture
+def api(monkeypatch):
+    monkeypatch.setenv("YOUTUBE_CACHE_PATH", "")
+    monkeypatch.setenv("RAW_LANDING_PATH", "")
+    api = YouTubeAPI(api_key="test", max_workers=1)
+    api.requested_tokens = []
+
+    def fake_request(endpoint, params, low_priority=False, revalidate=False):
+        token = params.get("pageToken")
+        api.requested_tokens.append(token)
+        if token == "expired":
+            response = requests.Response()
+            response.status_code = 400
+            raise requests.exceptions.HTTPError("invalid page token", response=response)
+        start = int(token or 0)
+        page = {"items": [thread(i) for i in range(start, min(start + 100, len(TIMES)))]}
+        if start + 100 < len(TIMES):
+            page["nextPageToken"] = str(start + 100)
+        return page
+
+    monkeypatch.setattr(api, "_make_request", fake_request)
+    return api
+
+
+def test_page_limit_returns_resume_token(api):
+    threads, token = api.get_new_comments("v1", since=None, max_pages=2)
+    assert len(threads) == 200 and token == "200"
+
+    threads, token = api.get_new_comments("v1", since=None, max_pages=2, page_token=token)
+    assert len(threads) == 50 and token is None
+
+
+def test_stops_at_since_without_token(api):
+    since = datetime.fromtimestamp(TIMES[120], timezone.utc)
+    threads, token = api.get_new_comments("v1", since=since, max_pages=5)
+    assert [t["id"] for t in threads][-1] == "t120"
+    assert token is None
+
+
+def test_rejected_resume_token_restarts_from_newest(api):
+    threads, token = api.get_new_comments("v1", since=None, max_pages=1, page_token="expired")
+    assert api.requested_tokens == ["expired", None]
+    assert len(threads) == 100 and token == "100"
@@ -0,0 +1,42 @@
+import datetime
+
+import pytest
+from sqlalchemy import text
+
+from src.jobs import FAILED, PENDING, JobQueue
+
+DATE_ID = datetime.date(2029, 12, 28)
+
+
+@pytest.fixture
+def jobs_queue(loader):
+    def clear():
+        with loader.engine.begin() as conn:
+            conn.execute(text("DELETE FROM pipeline_jobs WHERE date_id = :date_id"), {"date_id": DATE_ID})
+
+    clear()
+    yield JobQueue(loader.engine, lease_seconds=60, max_attempts=2)
+    clear()
+
+
+def test_release_does_not_use_up_attempts(jobs_queue):
+    jobs_queue.enqueue(DATE_ID, ["UCtest_a", "UCtest_b"])
+    for _ in range(3):
+        jobs = jobs_queue.claim("w1", limit=2, date_id=DATE_ID)
+        assert len(jobs) == 2
+        assert jobs_queue.release(jobs, "w1", "quota used up") == 2
+    assert jobs_queue.counts(DATE_ID)[PENDING] == 2
+
+
+def test_release_skips_lost_leases(jobs_queue):
+    jobs_queue.enqueue(DATE_ID, ["UCtest_a"])
+    jobs = jobs_queue.claim("w1", date_id=DATE_ID)
+    assert jobs_queue.release(jobs, "w2", "quota used up") == 0
+
+
+def test_fail_counts_attempts(jobs_queue):
+    jobs_queue.enqueue(DATE_ID, ["UCtest_a"])
+    for _ in range(2):
+        (job,) = jobs_queue.claim("w1", date_id=DATE_ID)
+        jobs_queue.fail(job, "w1", "boom")
+    assert jobs_queue.counts(DATE_ID)[FAILED] == 1
@@ -0,0 +1,73 @@
+import datetime
+
+import pytest
+
+from src.extract import key_pool
+from src.extract.key_pool import KeyPool, key_id
+from src.extract.quota import QUOTA_RESET_TZ, QuotaExceededError, next_reset, quota_day
+
+# 10:00 Pacific (UTC-8), mid quota day
+NOON = datetime.datetime(2026, 3, 10, 10, 0, tzinfo=QUOTA_RESET_TZ).timestamp()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [NOON]
+    monkeypatch.setattr(key_pool.time, "time", lambda: now[0])
+    return now
+
+
+def test_routes_to_key_with_most_headroom(clock):
+    pool = KeyPool(["k1", "k2"], daily_limit=10)
+    picks = [pool.acquire(3) for _ in range(4)]
+    assert sorted(picks) == ["k1", "k1", "k2", "k2"]
+    assert {status["remaining"] for status in pool.status()} == {4}
+
+
+def test_fails_over_when_a_key_is_exhausted(clock):
+    pool = KeyPool(["k1", "k2"], daily_limit=10)
+    pool.mark_exhausted("k1")
+    assert pool.available() == [key_id("k2")]
+    assert all(pool.acquire() == "k2" for _ in range(10))
+    with pytest.raises(QuotaExceededError):
+        pool.acquire()
+
+
+def test_refuses_units_beyond_the_daily_limit(clock):
+    pool = KeyPool(["k1"], daily_limit=5)
+    pool.acquire(5)
+    with pytest.raises(QuotaExceededError):
+        pool.acquire()
+    assert pool.remaining == 0
+
+
+def test_resets_at_the_pacific_day_boundary(clock):
+    pool = KeyPool(["k1"], daily_limit=5)
+    pool.acquire(5)
+    pool.mark_exhausted("k1")
+    assert pool.available() == []
+
+    clock[0] = next_reset(NOON)
+    assert quota_day(clock[0]) == quota_day(NOON) + datetime.timedelta(days=1)
+    assert pool.available() == [key_id("k1")]
+    assert pool.remaining == 5
+    assert pool.acquire(5) == "k1"
+
+
+def test_usage_is_shared_through_the_store(clock, tmp_path):
+    path = str(tmp_path / "pool.db")
+    first, second = KeyPool(["k1", "k2"], path=path, daily_limit=4), KeyPool(["k1", "k2"], path=path, daily_limit=4)
+    for _ in range(4):
+        first.acquire()
+    second.mark_exhausted("k1")
+    assert first.remaining == 2
+    assert second.acquire(2) == "k2"
+    with pytest.raises(QuotaExceededError):
+        first.acquire()
+    first.close()
+    second.close()
+
+
+def test_requires_a_key():
+    with pytest.raises(ValueError):
+        KeyPool(["", ""])
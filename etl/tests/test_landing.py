@@ -0,0 +1,26 @@
+import datetime
+
+from src.extract.landing import RawLandingZone, iter_landed_responses
+
+
+def test_restarted_runs_keep_earlier_parts(tmp_path):
+    # Same host and PID (as after a container restart), one part each
+    for video_id in ("a", "b"):
+        landing = RawLandingZone(str(tmp_path))
+        landing.write("videos", {"id": video_id, "key": "secret"}, {"items": [{"id": video_id}]})
+        landing.close()
+
+    records = list(iter_landed_responses(str(tmp_path), datetime.date.today(), "videos"))
+    assert sorted(record["params"]["id"] for record in records) == ["a", "b"]
+    assert all("key" not in record["params"] for record in records)
+
+
+def test_rotation_starts_new_parts(tmp_path):
+    landing = RawLandingZone(str(tmp_path), rotate_records=2)
+    for i in range(5):
+        landing.write("channels", {"id": str(i)}, {"items": []})
+    landing.close()
+
+    directory = tmp_path / f"date_id={datetime.date.today().isoformat()}" / "channels"
+    assert len(list(directory.glob("*.ndjson.gz"))) == 3
+    assert len(list(iter_landed_responses(str(tmp_path), datetime.date.today(), "channels"))) == 5
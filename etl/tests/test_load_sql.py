@@ -0,0 +1,43 @@
+import pandas as pd
+import pytest
+from sqlalchemy import text
+
+TABLE = "test_copy_upsert"
+
+
+@pytest.fixture
+def table(loader):
+    with loader.engine.begin() as conn:
+        conn.execute(text(f"DROP TABLE IF EXISTS {TABLE}"))
+        conn.execute(text(f"CREATE TABLE {TABLE} (id TEXT PRIMARY KEY, name TEXT, tags TEXT[], views BIGINT)"))
+    loader._tables.pop(TABLE, None)
+    yield TABLE
+    with loader.engine.begin() as conn:
+        conn.execute(text(f"DROP TABLE IF EXISTS {TABLE}"))
+
+
+def test_copy_upsert_twice_in_one_transaction(loader, table):
+    first = pd.DataFrame({"id": ["a", "b"], "name": ["one", "two\tcols"], "tags": [["x"], []], "views": [1, 2]})
+    second = pd.DataFrame({"id": ["b", "c"], "name": ["TWO", None], "tags": [None, ['q"uote']], "views": [20, 3]})
+    with loader.transaction() as conn:
+        assert loader.load_data(first, table, ["id"], method="copy", conn=conn) == 2
+        assert loader.load_data(second, table, ["id"], method="copy", conn=conn) == 2
+
+    with loader.engine.connect() as conn:
+        rows = conn.execute(text(f"SELECT id, name, tags, views FROM {table} ORDER BY id")).all()
+    assert [tuple(row) for row in rows] == [
+        ("a", "one", ["x"], 1),
+        ("b", "TWO", None, 20),
+        ("c", None, ['q"uote'], 3),
+    ]
+
+
+def test_copy_and_insert_paths_agree(loader, table):
+    df = pd.DataFrame({"id": ["a"], "name": ["back\\slash\nline"], "tags": [["t1", "t2"]], "views": [5]})
+    loader.load_data(df, table, ["id"], method="copy")
+    with loader.engine.connect() as conn:
+        copied = tuple(conn.execute(text(f"SELECT name, tags, views FROM {table}")).one())
+    loader.load_data(df.assign(id="b"), table, ["id"], method="insert")
+    with loader.engine.connect() as conn:
+        inserted = tuple(conn.execute(text(f"SELECT name, tags, views FROM {table} WHERE id = 'b'")).one())
+    assert copied == inserted == ("back\\slash\nline", ["t1", "t2"], 5)
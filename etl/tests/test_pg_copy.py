@@ -0,0 +1,37 @@
+import datetime
+import numpy as np
+import pandas as pd
+
+from src.load.pg_copy import COPY_NULL, column_to_copy_text, iter_copy_buffers
+
+
+def test_text_escapes_separators_and_backslashes():
+    column = pd.Series(["tab\there", "line\nbreak", "cr\rhere", "back\\slash", None])
+    assert column_to_copy_text(column).tolist() == [
+        "tab\\there", "line\\nbreak", "cr\\rhere", "back\\\\slash", COPY_NULL
+    ]
+
+
+def test_lists_become_array_literals():
+    column = pd.Series([["a", 'quo"te', "back\\slash"], [], None, ["x", None]], dtype=object)
+    assert column_to_copy_text(column).tolist() == [
+        '{"a","quo\\\\"te","back\\\\\\\\slash"}', "{}", COPY_NULL, '{"x",NULL}'
+    ]
+
+
+def test_integral_floats_load_as_integers():
+    assert column_to_copy_text(pd.Series([1.0, np.nan, 3.0])).tolist() == ["1", COPY_NULL, "3"]
+    assert column_to_copy_text(pd.Series([1.5, np.nan])).tolist() == ["1.5", COPY_NULL]
+
+
+def test_booleans_dates_and_timestamps():
+    assert column_to_copy_text(pd.Series([True, False])).tolist() == ["t", "f"]
+    assert column_to_copy_text(pd.Series([datetime.date(2026, 1, 2)])).tolist() == ["2026-01-02"]
+    timestamps = pd.Series(pd.to_datetime(["2026-01-02T03:04:05Z", None], utc=True))
+    assert column_to_copy_text(timestamps).tolist() == ["2026-01-02T03:04:05+00:00", COPY_NULL]
+
+
+def test_buffers_are_chunked_rows_of_tab_separated_fields():
+    df = pd.DataFrame({"id": [1, 2, 3], "name": ["a", "b\tc", None]})
+    buffers = [buffer.getvalue() for buffer in iter_copy_buffers(df, chunk_rows=2)]
+    assert buffers == ["1\ta\n2\tb\\tc\n", f"3\t{COPY_NULL}\n"]
@@ -0,0 +1,40 @@
+import datetime
+
+import pytest
+
+from src.extract import quota
+from src.extract.quota import QUOTA_RESET_TZ, QuotaExceededError, QuotaTracker, next_reset
+
+# 23:00 Pacific (UTC-8), an hour before the daily reset
+LATE = datetime.datetime(2026, 3, 10, 23, 0, tzinfo=QUOTA_RESET_TZ).timestamp()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [LATE]
+    monkeypatch.setattr(quota.time, "time", lambda: now[0])
+    return now
+
+
+def test_low_priority_calls_leave_the_reserve(clock):
+    tracker = QuotaTracker(daily_limit=10, low_priority_reserve=4)
+    for _ in range(6):
+        tracker.spend("commentThreads", low_priority=True)
+    assert not tracker.can_spend("commentThreads", low_priority=True)
+    with pytest.raises(QuotaExceededError):
+        tracker.spend("commentThreads", low_priority=True)
+    tracker.spend("videos")
+    assert tracker.remaining == 3
+
+
+def test_budget_renews_at_the_daily_reset(clock):
+    tracker = QuotaTracker(daily_limit=100, low_priority_reserve=0)
+    tracker.spend("search")
+    assert not tracker.can_spend("videos")
+
+    clock[0] = next_reset(LATE) + 1
+    assert tracker.remaining == 100
+    tracker.spend("search")
+    # Run totals keep counting across the reset
+    assert tracker.used == 200
+    assert tracker.summary() == {"search": 200}
@@ -0,0 +1,86 @@
+import pytest
+
+from src.extract import response_cache
+from src.extract.response_cache import ResponseCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(response_cache.time, "time", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    cache = ResponseCache(str(tmp_path / "cache.db"), fresh_ttl=60, max_age=600)
+    yield cache
+    cache.close()
+
+
+def test_key_ignores_api_key_and_param_order():
+    assert ResponseCache.make_key("videos", {"id": "a", "part": "x", "key": "k1"}) == \
+        ResponseCache.make_key("videos", {"part": "x", "id": "a", "key": "k2"})
+    assert ResponseCache.make_key("videos", {"id": "a"}) != ResponseCache.make_key("channels", {"id": "a"})
+
+
+def test_fresh_then_stale_then_expired(cache, clock):
+    cache.put("videos", {"id": "a"}, {"items": [1]}, '"etag-1"')
+
+    hit = cache.get("videos", {"id": "a"})
+    assert hit.fresh and hit.data == {"items": [1]} and hit.etag == '"etag-1"'
+
+    clock[0] += 61
+    stale = cache.get("videos", {"id": "a"})
+    assert not stale.fresh and stale.etag == '"etag-1"'
+
+    clock[0] += 600
+    assert cache.get("videos", {"id": "a"}) is None
+    assert cache.stats()["bytes_stored"] == 0
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_revalidation_makes_an_entry_fresh(cache, clock):
+    cache.put("videos", {"id": "a"}, {"items": [1]}, '"etag-1"')
+    clock[0] += 61
+    stale = cache.get("videos", {"id": "a"})
+    cache.mark_revalidated("videos", {"id": "a"}, stale)
+
+    assert cache.get("videos", {"id": "a"}).fresh
+    assert cache.stats()["revalidated"] == 1
+
+
+def put(cache, i):
+    cache.put("videos", {"id": str(i)}, {"items": [i]}, None)
+
+
+def test_evicts_least_recently_used(tmp_path, clock):
+    probe = ResponseCache(str(tmp_path / "probe.db"))
+    put(probe, 0)
+    entry_size = probe.stats()["bytes_stored"]
+    probe.close()
+
+    cache = ResponseCache(str(tmp_path / "cache.db"), max_bytes=3 * entry_size)
+    for i in range(3):
+        put(cache, i)
+        clock[0] += 1
+    cache.get("videos", {"id": "0"})  # 1 is now the least recently used
+    clock[0] += 1
+    put(cache, 3)
+
+    assert cache.get("videos", {"id": "1"}) is None
+    assert all(cache.get("videos", {"id": str(i)}) is not None for i in (0, 2, 3))
+    assert cache.stats()["bytes_stored"] <= 3 * entry_size
+    cache.close()
+
+
+def test_size_survives_reopening(tmp_path, clock):
+    path = str(tmp_path / "cache.db")
+    cache = ResponseCache(path)
+    cache.put("videos", {"id": "a"}, {"items": list(range(100))}, None)
+    stored = cache.stats()["bytes_stored"]
+    cache.close()
+
+    reopened = ResponseCache(path)
+    assert reopened.stats()["bytes_stored"] == stored > 0
+    reopened.close()
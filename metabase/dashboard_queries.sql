@@ -26,21 +26,21 @@ ORDER BY date_id ASC;
 
 
 -- 3. Views Trend
--- Total Views Per Day
+-- Views Gained Per Day (fact snapshots are cumulative, so read the daily deltas)
 SELECT 
     date_id,
-    SUM(views) as daily_views
-FROM fact_video_daily
+    SUM(views_gained) as daily_views
+FROM agg_channel_daily
 GROUP BY date_id
 ORDER BY date_id ASC;
 
 
 -- 4. Comments Trend
--- Total Comments Per Day
+-- Comments Gained Per Day
 SELECT 
     date_id,
-    SUM(comments) as daily_comments
-FROM fact_video_daily
+    SUM(comments_gained) as daily_comments
+FROM agg_channel_daily
 GROUP BY date_id
 ORDER BY date_id ASC;
 
@@ -71,21 +71,22 @@ LIMIT 20;
 
 
 -- 7. Engagement Rate
--- (Likes + Comments) / Views (Aggregate)
+-- (Likes + Comments) / Views (Latest snapshot)
 SELECT 
     SUM(likes + comments)::FLOAT / NULLIF(SUM(views), 0) * 100 as engagement_rate_percentage
-FROM fact_video_daily;
+FROM agg_channel_daily
+WHERE date_id = (SELECT MAX(date_id) FROM agg_channel_daily);
 
 
 -- 8. Channel Comparison
--- Average Views per Channel
+-- Average Views Gained per Day, per Channel
 SELECT 
     dc.channel_name,
-    AVG(fvd.views) as avg_daily_views
-FROM fact_video_daily fvd
-JOIN dim_channel dc ON fvd.channel_id = dc.channel_id
+    AVG(acd.views_gained) as avg_daily_views
+FROM agg_channel_daily acd
+JOIN dim_channel dc ON acd.channel_id = dc.channel_id
 GROUP BY dc.channel_name
-ORDER BY avg_daily_views DESC;
+ORDER BY avg_daily_views DESC NULLS LAST;
 
 
 -- 9. Best Upload Day